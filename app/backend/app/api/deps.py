@@ -1,9 +1,14 @@
-from typing import Annotated
+import inspect
+from collections.abc import Callable
+from typing import Annotated, Any
 
 from fastapi import Depends, HTTPException, Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.core.db import async_get_db
+from app.core.conditional import Conditional
+from app.core.db import PRIMARY_READ_COOKIE, async_get_db, async_get_read_db
 from app.core.exceptions import ForbiddenException, UnauthorizedException
 from app.core.logger import logging
 from app.core.security import TokenType, oauth2_scheme, verify_token
@@ -12,18 +17,80 @@ from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
-SessionDep = Annotated[AsyncSession, Depends(async_get_db)]
+
+def _track_writes(request: Request, db: AsyncSession) -> None:
+    def mark_write(session: Session) -> None:
+        request.state.db_wrote = True
+
+    event.listen(db.sync_session, "after_commit", mark_write)
+
+
+def _before_response(dependency: Callable[..., Any]) -> Any:
+    """``Depends()`` whose code after ``yield`` finishes before the response is sent.
+
+    FastAPI 0.118+ runs it after sending unless ``scope="function"``; older
+    versions (0.106+) always finish it before sending.
+    """
+    options: dict[str, Any] = {}
+    if "scope" in inspect.signature(Depends).parameters:
+        options["scope"] = "function"
+    return Depends(dependency, **options)
+
+
+async def get_db(request: Request, db: Annotated[AsyncSession, _before_response(async_get_db)]) -> AsyncSession:
+    """Primary database session, one unit of work per request.
+
+    Routes composing several writes pass ``commit=False`` to the CRUD calls:
+    `async_get_db` commits them once when the route returns (before the
+    response is sent) and rolls all of them back if any step raises.
+    Authentication shares this session, so a request checks out one connection.
+
+    A commit sets ``request.state.db_wrote``, which the read-your-writes
+    middleware turns into a cookie pinning the client's next reads to the primary.
+    """
+    _track_writes(request, db)
+    return db
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+async def get_read_db(
+    request: Request,
+    db: SessionDep,
+    read_db: Annotated[AsyncSession, Depends(async_get_read_db)],
+) -> AsyncSession:
+    """Session for read-only routes, served by the read replica when one is configured.
+
+    Clients that wrote recently carry the read-your-writes cookie and keep
+    reading from the primary, so they see their own changes despite replication lag.
+    Sessions connect lazily, so the unused one never checks out a connection.
+    """
+    if read_db.get_bind() is db.get_bind() or PRIMARY_READ_COOKIE in request.cookies:
+        return db
+    return read_db
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+# Shartli GET (ETag / Last-Modified -> 304), qarang: app.core.conditional.Conditional
+ConditionalDep = Annotated[Conditional, Depends()]
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: SessionDep) -> User:
+    """Resolve the authenticated user.
+
+    Routers in `api/routes/__init__.py` declare this as a router dependency and
+    handlers take `CurrentUser` as well; FastAPI caches a dependency's result
+    per request, so both share a single call. The lookup itself is served from
+    `crud_users`' user cache when possible.
+    """
     token_data = await verify_token(token, TokenType.ACCESS, db)
     if token_data is None:
         raise UnauthorizedException("User not authenticated.")
 
     # Try to find user by username or phone
-    user = await crud_users.get_by_username(db=db, username=token_data.username_or_email, is_deleted=False)
-    if not user:
-        user = await crud_users.get_by_phone(db=db, phone=token_data.username_or_email, is_deleted=False)
+    user = await crud_users.get_by_subject(db=db, subject=token_data.username_or_email)
 
     if not user:
         raise UnauthorizedException("User not found.")
@@ -0,0 +1,140 @@
+"""
+Printing - tekshiruv hujjatlarini tayyorlash va ommaviy chop etish vazifalari
+"""
+import asyncio
+import time
+import uuid as uuid_pkg
+
+import anyio
+
+from app.core.config import settings
+from app.core.db import local_session
+from app.core.jobs import JobQueue
+from app.core.render import PrintFormat, bundle_zip, document_cache, field_rows, merge_pdfs, render
+from app.core.templates import template_registry
+from app.crud import crud_examination, crud_print_job
+from app.models.examination import Examination
+from app.schemas.print_job import PrintJobCreate
+
+# Vazifa progressi bazaga ko'pi bilan shu oraliqda yoziladi (soniya)
+PROGRESS_INTERVAL = 1.0
+
+print_job_queue = JobQueue("print", workers=settings.PRINT_JOB_WORKERS, maxsize=settings.PRINT_JOB_MAX_QUEUE)
+
+
+def patient_full_name(examination: Examination) -> str:
+    patient = examination.patient
+    return " ".join(part for part in (patient.last_name, patient.first_name, patient.middle_name) if part)
+
+
+def doctor_full_name(examination: Examination) -> str | None:
+    doctor = examination.doctor
+    return f"{doctor.first_name} {doctor.last_name}" if doctor else None
+
+
+async def render_examination(examination: Examination, print_format: PrintFormat) -> bytes:
+    """
+    Tekshiruv hujjati - keshdan yoki worker pool da render qilib
+
+    examination bemor va shifokor bilan yuklangan bo'lishi kerak. Shablon
+    reyestrdan olinadi (baza ishlatilmaydi); kesh kalitida bemor va shifokor
+    updated_at i hamda shablonlar versiyasi ham bor, shuning uchun ulardan biri
+    o'zgarsa hujjat qayta tayyorlanadi.
+    """
+    key = (
+        examination.id,
+        examination.updated_at,
+        examination.patient.updated_at,
+        # Hujjatda shifokor ismi ham bor
+        examination.doctor.updated_at if examination.doctor else None,
+        template_registry.version,
+        print_format,
+    )
+    document = document_cache.get(key)
+    if document is not None:
+        return document
+
+    template = template_registry.get(examination.template_type)
+    patient = examination.patient
+    data = examination.examination_data or {}
+    context = {
+        "patient_name": patient_full_name(examination),
+        "patient_birth_date": f"{patient.birth_date:%d.%m.%Y}" if patient.birth_date else "",
+        "patient_gender": patient.gender,
+        "patient_phone": patient.phone,
+        "examination_date": f"{examination.examination_date:%d.%m.%Y}",
+        "template_name": template_registry.name_ru(examination.template_type),
+        "doctor_name": doctor_full_name(examination),
+        "conclusion": examination.conclusion,
+        "recommendations": examination.recommendations,
+        "notes": examination.notes,
+        **{f"data_{name}": value for name, value in data.items()},
+    }
+    rows = field_rows(template.fields if template else {}, data)
+    document = await render(template.print_template if template else None, context, rows, print_format)
+    document_cache.set(key, document)
+    return document
+
+
+async def run_print_job(job_id: uuid_pkg.UUID, job_in: PrintJobCreate) -> None:
+    """
+    Ommaviy chop etish vazifasini bajarish
+
+    Tekshiruvlar bitta so'rovda yuklanadi, holatlar bitta UPDATE bilan
+    "printed" ga o'tkaziladi, hujjatlar render pool da bir vaqtda (ko'pi bilan
+    PRINT_RENDER_WORKERS ta) tayyorlanadi va zip yoki bitta pdf ga yig'iladi.
+
+    "printed" holati va kunlik yig'ma tayyor fayl bilan bitta commit da
+    saqlanadi: render yoki yig'ish xato bersa, rollback ularni ham bekor qiladi.
+    Shuning uchun progress alohida sessiyada yoziladi.
+    """
+    async with local_session() as db:
+        try:
+            examinations = await crud_examination.get_for_print(
+                db, job_in.examination_ids, limit=settings.PRINT_JOB_MAX_EXAMINATIONS, **job_in.filters()
+            )
+            await crud_print_job.set_state(db, job_id, status="running", total=len(examinations))
+            # Commit qilinmaydi; RETURNING sessiyadagi obyektlarni yangilaydi - kesh kaliti yangi updated_at bilan
+            await crud_examination.update_status_many(
+                db,
+                [examination.id for examination in examinations if examination.status != "printed"],
+                "printed",
+                commit=False,
+            )
+
+            print_format = PrintFormat(job_in.print_format)
+            slots = asyncio.Semaphore(settings.PRINT_RENDER_WORKERS)
+
+            async def render_one(examination: Examination) -> bytes:
+                async with slots:
+                    return await render_examination(examination, print_format)
+
+            reported_at = time.monotonic()
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(render_one(examination)) for examination in examinations]
+                for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                    await task
+                    if time.monotonic() - reported_at >= PROGRESS_INTERVAL:
+                        async with local_session() as progress:
+                            await crud_print_job.set_state(progress, job_id, done=done)
+                        reported_at = time.monotonic()
+            documents = [task.result() for task in tasks]
+
+            if job_in.output == "pdf":
+                content = await anyio.to_thread.run_sync(merge_pdfs, documents)
+            else:
+                names = [
+                    f"{examination.examination_date:%Y%m%d}-{examination.id}.{print_format}"
+                    for examination in examinations
+                ]
+                content = await anyio.to_thread.run_sync(bundle_zip, list(zip(names, documents, strict=True)))
+            await crud_print_job.set_state(db, job_id, status="completed", done=len(documents), content=content)
+        except Exception as e:
+            await db.rollback()
+            await crud_print_job.set_state(db, job_id, status="failed", error=str(e) or type(e).__name__)
+            raise
+
+
+def submit_print_job(job_id: uuid_pkg.UUID, job_in: PrintJobCreate) -> None:
+    """Vazifani shu worker jarayonidagi navbatga qo'shish"""
+    print_job_queue.submit(lambda: run_print_job(job_id, job_in))
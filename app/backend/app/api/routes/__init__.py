@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 
 from app.api.deps import get_current_user
 
+from .analytics import router as analytics_router
 from .examinations import router as examinations_router
 from .health import router as health_router
 from .login import router as login_router
@@ -26,3 +27,9 @@ router.include_router(
     tags=["examinations"],
     dependencies=[Depends(get_current_user)],
 )
+router.include_router(
+    analytics_router,
+    prefix="/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(get_current_user)],
+)
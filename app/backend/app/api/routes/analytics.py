@@ -0,0 +1,45 @@
+"""
+Analytics API routes - tekshiruv o'lchovlari bo'yicha analitika endpointlari
+"""
+from typing import Any
+
+from fastapi import APIRouter, Query
+
+from app.api.deps import CurrentUser, ReadSessionDep
+from app.crud.analytics import crud_analytics
+from app.schemas.analytics import AnalyticsMetric, AnalyticsQuery, AnalyticsResult
+
+router = APIRouter()
+
+
+@router.post("/query", response_model=AnalyticsResult)
+async def run_analytics_query(
+    db: ReadSessionDep,
+    current_user: CurrentUser,
+    query: AnalyticsQuery,
+) -> Any:
+    """
+    examination_data o'lchovi bo'yicha agregatsiya
+
+    Masalan:
+    - yosh guruhlari bo'yicha o'rtacha endometriy qalinligi:
+      {"metric": "endometrium_thickness", "aggregations": ["count", "avg"], "group_by": ["age_band"]}
+    - chorak davomida qalqonsimon bez hajmi taqsimoti:
+      {"metric": "total_volume", "template_types": ["thyroid"], "date_from": "2026-07-01",
+      "date_to": "2026-09-30", "aggregations": ["count"], "group_by": ["value"], "bucket_width": 2}
+
+    Faqat son qiymatlar hisobga olinadi; o'lchovi yo'q tekshiruvlar kirmaydi.
+    """
+    return await crud_analytics.run(db=db, query=query)
+
+
+@router.get("/metrics", response_model=list[AnalyticsMetric])
+async def get_analytics_metrics(
+    db: ReadSessionDep,
+    current_user: CurrentUser,
+    template_type: str = Query(..., description="Shablon turi"),
+) -> Any:
+    """
+    Shablon turi bo'yicha mavjud son o'lchovlar (tekshiruvlar soni bilan)
+    """
+    return await crud_analytics.get_metrics(db=db, template_type=template_type)
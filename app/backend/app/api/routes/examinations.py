@@ -1,28 +1,44 @@
 """
 Examination API routes - UZI tekshiruvlar uchun API endpointlar
 """
-from datetime import date
+import uuid as uuid_pkg
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
-
-from app.api.deps import CurrentUser, SessionDep
-from app.crud import crud_examination, crud_patient
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import ConditionalDep, CurrentUser, ReadSessionDep, SessionDep
+from app.api.printing import doctor_full_name, patient_full_name, render_examination, submit_print_job
+from app.core.conditional import entity_etag
+from app.core.config import settings
+from app.core.db import local_read_session
+from app.core.export import MEDIA_TYPES, ExportFormat, encode, ensure_available, export_filename
+from app.core.render import PRINT_MEDIA_TYPES, PrintFormat, ensure_merge_available, ensure_print_available
+from app.core.templates import template_registry
+from app.crud import crud_examination, crud_patient, crud_print_job
+from app.crud.pagination import CountMode
 from app.schemas.common import Message
 from app.schemas.examination import (
+    EXAMINATION_LIST_ADAPTER,
+    ExaminationBulkDelete,
+    ExaminationBulkResult,
+    ExaminationBulkStatus,
     ExaminationCreate,
     ExaminationList,
+    ExaminationPage,
     ExaminationRead,
     ExaminationUpdate,
 )
-from app.schemas.template import TEMPLATE_TYPES
+from app.schemas.print_job import PrintJobCreate, PrintJobRead
 
 router = APIRouter()
 
 
-@router.get("", response_model=dict[str, Any])
+@router.get("", response_model=ExaminationPage)
 async def get_examinations(
-    db: SessionDep,
+    db: ReadSessionDep,
     current_user: CurrentUser,
     patient_id: int | None = Query(None, description="Bemor ID"),
     template_type: str | None = Query(None, description="Shablon turi"),
@@ -31,7 +47,9 @@ async def get_examinations(
     status: str | None = Query(None, pattern="^(draft|completed|printed)$"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-) -> Any:
+    cursor: str | None = Query(None, description="Keyingi sahifa kursori (next_cursor)"),
+    count_mode: CountMode = Query(CountMode.EXACT, description="Umumiy sonni hisoblash usuli"),
+) -> Response:
     """
     Tekshiruvlar ro'yxatini olish
 
@@ -39,8 +57,10 @@ async def get_examinations(
     - **template_type**: Shablon turi bo'yicha filter
     - **date_from/date_to**: Sana oralig'i
     - **status**: Holat (draft, completed, printed)
+    - **cursor**: Oldingi javobdagi next_cursor (berilsa, page e'tiborga olinmaydi)
+    - **count_mode**: exact, estimated, capped, window yoki none (javobda ishlatilgan usul qaytadi)
     """
-    examinations, total = await crud_examination.search(
+    rows, total, next_cursor, used_count_mode = await crud_examination.search_list(
         db=db,
         patient_id=patient_id,
         template_type=template_type,
@@ -48,33 +68,22 @@ async def get_examinations(
         date_to=date_to,
         status=status,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor,
+        count_mode=count_mode
     )
 
-    items = []
-    for exam in examinations:
-        item = ExaminationList.model_validate(exam)
-        if exam.patient:
-            patient_name = f"{exam.patient.last_name} {exam.patient.first_name}"
-            if exam.patient.middle_name:
-                patient_name += f" {exam.patient.middle_name}"
-            item.patient_name = patient_name
-            item.patient_phone = exam.patient.phone
-            item.patient_birth_date = exam.patient.birth_date
-        else:
-            item.patient_name = None
-            item.patient_phone = None
-            item.patient_birth_date = None
-        item.template_name = TEMPLATE_TYPES.get(exam.template_type, {}).get("name_ru", exam.template_type)
-        items.append(item)
-
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page
-    }
+    # Qatorlar bir marta validatsiya qilinadi va to'g'ridan-to'g'ri JSON ga yoziladi
+    result = ExaminationPage(
+        items=EXAMINATION_LIST_ADAPTER.validate_python(rows, from_attributes=True),
+        total=total,
+        page=page,
+        per_page=per_page,
+        pages=(total + per_page - 1) // per_page if total is not None else None,
+        next_cursor=next_cursor,
+        count_mode=used_count_mode
+    )
+    return Response(content=result.model_dump_json(), media_type="application/json")
 
 
 @router.post("", response_model=ExaminationRead)
@@ -84,7 +93,7 @@ async def create_examination(
     examination_in: ExaminationCreate,
 ) -> Any:
     """
-    Yangi tekshiruv yaratish
+    Yangi tekshiruv yaratish (tekshiruv va kunlik yig'ma - bitta tranzaksiyada)
     """
     # Check if patient exists
     patient = await crud_patient.get_by_id(db, examination_in.patient_id)
@@ -92,13 +101,14 @@ async def create_examination(
         raise HTTPException(status_code=404, detail="Bemor topilmadi")
 
     # Validate template type
-    if examination_in.template_type not in TEMPLATE_TYPES:
+    if examination_in.template_type not in template_registry:
         raise HTTPException(status_code=400, detail="Noto'g'ri shablon turi")
 
     examination = await crud_examination.create(
         db=db,
         examination_in=examination_in,
-        doctor_id=current_user.id
+        doctor_id=current_user.id,
+        commit=False
     )
 
     result = ExaminationRead.model_validate(examination)
@@ -108,82 +118,251 @@ async def create_examination(
     result.patient_name = patient_name
     doctor_name = f"{current_user.first_name} {current_user.last_name}"
     result.doctor_name = doctor_name
-    result.template_name = TEMPLATE_TYPES.get(examination.template_type, {}).get("name_ru")
+    result.template_name = template_registry.name_ru(examination.template_type)
 
     return result
 
 
 @router.get("/recent", response_model=list[ExaminationList])
 async def get_recent_examinations(
-    db: SessionDep,
+    db: ReadSessionDep,
     current_user: CurrentUser,
     limit: int = Query(10, ge=1, le=50),
-) -> Any:
+) -> Response:
     """
     Oxirgi tekshiruvlar
     """
-    examinations = await crud_examination.get_recent(db=db, limit=limit)
+    rows = await crud_examination.get_recent_list(db=db, limit=limit)
+    items = EXAMINATION_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    return Response(content=EXAMINATION_LIST_ADAPTER.dump_json(items), media_type="application/json")
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_examinations(
+    current_user: CurrentUser,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv, ndjson yoki parquet"),
+    patient_id: int | None = Query(None, description="Bemor ID"),
+    template_type: str | None = Query(None, description="Shablon turi"),
+    date_from: date | None = Query(None, description="Boshlanish sanasi"),
+    date_to: date | None = Query(None, description="Tugash sanasi"),
+    status: str | None = Query(None, pattern="^(draft|completed|printed)$"),
+) -> StreamingResponse:
+    """
+    Tekshiruvlarni faylga eksport qilish
 
-    items = []
-    for exam in examinations:
-        item = ExaminationList.model_validate(exam)
-        if exam.patient:
-            item.patient_name = f"{exam.patient.last_name} {exam.patient.first_name}"
-            if exam.patient.middle_name:
-                item.patient_name += f" {exam.patient.middle_name}"
-        else:
-            item.patient_name = None
-        item.template_name = TEMPLATE_TYPES.get(exam.template_type, {}).get("name_ru", exam.template_type)
-        items.append(item)
+    Filtrlar GET /examinations bilan bir xil. Fayl qismlab yuboriladi,
+    sahifalash yo'q. Parquet da examination_data maydonlari alohida
+    ustunlarga (data_<kalit>) yoyiladi, shuning uchun template_type majburiy.
+    """
+    ensure_available(export_format)
+    flatten_data = export_format == ExportFormat.PARQUET
+    if flatten_data and not template_type:
+        raise HTTPException(status_code=400, detail="Parquet eksport uchun template_type ko'rsatilishi shart")
+    filters: dict[str, Any] = {
+        "patient_id": patient_id,
+        "template_type": template_type,
+        "date_from": date_from,
+        "date_to": date_to,
+        "status": status,
+    }
 
-    return items
+    async def content() -> AsyncIterator[bytes]:
+        # Dependency sessiyasi javob oqimidan oldin yopilishi mumkin - eksport o'z sessiyasini ochadi
+        async with local_read_session() as db:
+            columns = await crud_examination.get_export_columns(db, flatten_data=flatten_data, **filters)
+            batches = crud_examination.stream_export(db, columns, **filters)
+            async for chunk in encode(export_format, batches, columns):
+                yield chunk
+
+    filename = export_filename("examinations", export_format)
+    return StreamingResponse(
+        content(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/statistics", response_model=dict[str, Any])
 async def get_statistics(
-    db: SessionDep,
+    db: ReadSessionDep,
     current_user: CurrentUser,
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
 ) -> Any:
     """
-    Tekshiruvlar statistikasi
+    Tekshiruvlar statistikasi (bugungi son bilan birga)
     """
-    stats = await crud_examination.get_statistics(
+    return await crud_examination.get_statistics(
         db=db,
         date_from=date_from,
         date_to=date_to
     )
 
-    # Add today's count
-    today_count = await crud_examination.get_today_count(db=db)
-    stats["today"] = today_count
-
-    return stats
-
 
 @router.get("/templates", response_model=dict[str, Any])
 async def get_template_types(
     current_user: CurrentUser,
+    conditional: ConditionalDep,
 ) -> Any:
     """
     Mavjud shablon turlarini olish
+
+    Javob xotiradagi reyestrdan beriladi; ETag shablonlar versiyasidan olinadi,
+    If-None-Match mos kelsa 304 qaytadi.
     """
+    conditional.check(template_registry.etag)
     return {
-        "templates": TEMPLATE_TYPES
+        "templates": template_registry.types
     }
 
 
+@router.patch("/bulk/status", response_model=ExaminationBulkResult)
+async def update_examinations_status(
+    db: SessionDep,
+    current_user: CurrentUser,
+    bulk_in: ExaminationBulkStatus,
+) -> Any:
+    """
+    Bir nechta tekshiruv holatini o'zgartirish (masalan, qoralamalarni yakunlash)
+
+    Bitta UPDATE ... RETURNING va kunlik yig'ma uchun bitta upsert. Topilmagan,
+    o'chirilgan yoki holati allaqachon shu bo'lgan tekshiruvlar o'tkazib yuboriladi.
+    """
+    updated = await crud_examination.update_status_many(
+        db=db,
+        examination_ids=bulk_in.examination_ids,
+        status=bulk_in.status
+    )
+    return ExaminationBulkResult(requested=len(set(bulk_in.examination_ids)), affected=len(updated))
+
+
+@router.post("/bulk/delete", response_model=ExaminationBulkResult)
+async def delete_examinations(
+    db: SessionDep,
+    current_user: CurrentUser,
+    bulk_in: ExaminationBulkDelete,
+) -> Any:
+    """
+    Bir nechta tekshiruvni o'chirish (soft delete) - bitta UPDATE ... RETURNING
+    """
+    deleted = await crud_examination.delete_many(db=db, id=bulk_in.examination_ids)
+    return ExaminationBulkResult(requested=len(set(bulk_in.examination_ids)), affected=deleted)
+
+
+@router.post("/print-jobs", response_model=PrintJobRead, status_code=202)
+async def create_print_job(
+    db: SessionDep,
+    current_user: CurrentUser,
+    job_in: PrintJobCreate,
+) -> Any:
+    """
+    Ommaviy chop etish vazifasi
+
+    Tanlangan (examination_ids) yoki filtrga mos tekshiruvlar fonda tayyorlanadi;
+    holatni GET /print-jobs/{job_id} orqali kuzatib, tayyor faylni /download dan olish mumkin.
+    - **output=zip**: har bir tekshiruv alohida fayl
+    - **output=pdf**: bitta birlashtirilgan PDF (print_format=pdf bilan)
+    """
+    ensure_print_available(PrintFormat(job_in.print_format))
+    if job_in.output == "pdf":
+        ensure_merge_available()
+
+    total, over_limit = await crud_examination.count_for_print(
+        db=db,
+        limit=settings.PRINT_JOB_MAX_EXAMINATIONS,
+        examination_ids=job_in.examination_ids,
+        **job_in.filters()
+    )
+    if over_limit:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bitta vazifada {settings.PRINT_JOB_MAX_EXAMINATIONS} tadan ortiq tekshiruv bo'lishi mumkin emas"
+        )
+    if not total:
+        raise HTTPException(status_code=404, detail="Tekshiruvlar topilmadi")
+
+    # Tozalash va yangi vazifa - bitta tranzaksiya; vazifa navbatga commit dan keyin qo'shiladi
+    await crud_print_job.purge_expired(
+        db=db, retention=timedelta(hours=settings.PRINT_JOB_RETENTION_HOURS), commit=False
+    )
+    job = await crud_print_job.create(
+        db=db,
+        user_id=current_user.id,
+        print_format=job_in.print_format,
+        output=job_in.output,
+        total=total
+    )
+    try:
+        submit_print_job(job.id, job_in)
+    except Exception as e:
+        await crud_print_job.set_state(db=db, job_id=job.id, status="failed", error=str(e))
+        raise
+    return job
+
+
+@router.get("/print-jobs/{job_id}", response_model=PrintJobRead)
+async def get_print_job(
+    db: SessionDep,
+    current_user: CurrentUser,
+    job_id: uuid_pkg.UUID,
+) -> Any:
+    """
+    Chop etish vazifasi holati
+    """
+    job = await crud_print_job.get(
+        db=db, job_id=job_id, user_id=None if current_user.is_superuser else current_user.id
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Vazifa topilmadi")
+    return job
+
+
+@router.get("/print-jobs/{job_id}/download", response_class=Response)
+async def download_print_job(
+    db: SessionDep,
+    current_user: CurrentUser,
+    job_id: uuid_pkg.UUID,
+) -> Any:
+    """
+    Tayyor faylni yuklab olish (zip yoki pdf)
+    """
+    job = await crud_print_job.get(
+        db=db, job_id=job_id, user_id=None if current_user.is_superuser else current_user.id
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Vazifa topilmadi")
+    if job.status != "completed":
+        raise HTTPException(status_code=400, detail="Vazifa hali tayyor emas")
+
+    content = await crud_print_job.get_content(db=db, job_id=job.id)
+    return Response(
+        content=content,
+        media_type="application/pdf" if job.output == "pdf" else "application/zip",
+        headers={"Content-Disposition": f'attachment; filename="print-job-{job.id}.{job.output}"'},
+    )
+
+
 @router.get("/{examination_id}", response_model=ExaminationRead)
 async def get_examination(
     db: SessionDep,
     current_user: CurrentUser,
     examination_id: int,
+    conditional: ConditionalDep,
 ) -> Any:
     """
     ID bo'yicha tekshiruv olish
+
+    ETag / Last-Modified bilan: tekshiruv, bemor, shifokor va shablonlar (template_name)
+    o'zgarmagan bo'lsa 304.
     """
-    examination = await crud_examination.get_by_id(db=db, examination_id=examination_id)
+    changed_at = await crud_examination.get_changed_at(db, examination_id)
+    if not changed_at:
+        raise HTTPException(status_code=404, detail="Tekshiruv topilmadi")
+    conditional.check(
+        entity_etag("examination", examination_id, changed_at, template_registry.version), changed_at
+    )
+
+    examination = await crud_examination.get_by_id(db=db, examination_id=examination_id, joined=True)
     if not examination:
         raise HTTPException(status_code=404, detail="Tekshiruv topilmadi")
 
@@ -199,7 +378,7 @@ async def get_examination(
         result.doctor_name = f"{examination.doctor.first_name} {examination.doctor.last_name}"
     else:
         result.doctor_name = None
-    result.template_name = TEMPLATE_TYPES.get(examination.template_type, {}).get("name_ru")
+    result.template_name = template_registry.name_ru(examination.template_type)
 
     return result
 
@@ -214,7 +393,9 @@ async def update_examination(
     """
     Tekshiruv ma'lumotlarini yangilash
     """
-    examination = await crud_examination.get_by_id(db=db, examination_id=examination_id)
+    examination = await crud_examination.get_by_id(
+        db=db, examination_id=examination_id, joined=True, for_update=True
+    )
     if not examination:
         raise HTTPException(status_code=404, detail="Tekshiruv topilmadi")
 
@@ -236,7 +417,7 @@ async def update_examination(
         result.doctor_name = f"{examination.doctor.first_name} {examination.doctor.last_name}"
     else:
         result.doctor_name = None
-    result.template_name = TEMPLATE_TYPES.get(examination.template_type, {}).get("name_ru")
+    result.template_name = template_registry.name_ru(examination.template_type)
 
     return result
 
@@ -271,11 +452,8 @@ async def delete_examination(
     """
     Tekshiruvni o'chirish (soft delete)
     """
-    examination = await crud_examination.get_by_id(db=db, examination_id=examination_id)
-    if not examination:
+    if not await crud_examination.delete(db=db, id=examination_id):
         raise HTTPException(status_code=404, detail="Tekshiruv topilmadi")
-
-    await crud_examination.delete(db=db, id=examination.id)
     return Message(message="Tekshiruv muvaffaqiyatli o'chirildi")
 
 
@@ -284,21 +462,38 @@ async def get_examination_for_print(
     db: SessionDep,
     current_user: CurrentUser,
     examination_id: int,
+    print_format: PrintFormat = Query(PrintFormat.JSON, alias="format", description="json, html yoki pdf"),
 ) -> Any:
     """
-    Chop etish uchun tekshiruv ma'lumotlarini olish
+    Chop etish uchun tekshiruv
+
+    - **format=json**: brauzerda chizish uchun ma'lumotlar (standart)
+    - **format=html/pdf**: Template.print_template asosida serverda tayyorlangan hujjat;
+      tekshiruv va bemor ma'lumotlari o'zgarmaguncha keshdan qaytadi
+
+    "printed" holati hujjat tayyor bo'lgandagina saqlanadi - render xatosida qaytariladi.
     """
-    examination = await crud_examination.get_by_id(db=db, examination_id=examination_id)
+    ensure_print_available(print_format)
+    examination = await crud_examination.get_by_id(db=db, examination_id=examination_id, joined=True)
     if not examination:
         raise HTTPException(status_code=404, detail="Tekshiruv topilmadi")
 
-    # Update status to printed
-    await crud_examination.update_status(db=db, examination_id=examination_id, status="printed")
+    # Update status to printed (qayta chop etishda yozuv yo'q)
+    if examination.status != "printed":
+        await crud_examination.update_status(db=db, examination_id=examination_id, status="printed", commit=False)
 
     patient = examination.patient
-    patient_name = f"{patient.last_name} {patient.first_name}"
-    if patient.middle_name:
-        patient_name += f" {patient.middle_name}"
+    patient_name = patient_full_name(examination)
+    doctor_name = doctor_full_name(examination)
+
+    if print_format != PrintFormat.JSON:
+        document = await render_examination(examination, print_format)
+        filename = f"examination-{examination.id}.{print_format}"
+        return Response(
+            content=document,
+            media_type=PRINT_MEDIA_TYPES[print_format],
+            headers={"Content-Disposition": f'inline; filename="{filename}"'},
+        )
 
     return {
         "examination": ExaminationRead.model_validate(examination),
@@ -312,11 +507,8 @@ async def get_examination_for_print(
             "phone": patient.phone,
         },
         "doctor": {
-            "name": (
-                f"{examination.doctor.first_name} {examination.doctor.last_name}"
-                if examination.doctor
-                else None
-            ),
+            "name": doctor_name,
         },
-        "template": TEMPLATE_TYPES.get(examination.template_type, {}),
+        "template": template_registry.types.get(examination.template_type, {}),
     }
+
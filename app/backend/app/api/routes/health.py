@@ -6,8 +6,10 @@ from fastapi.responses import JSONResponse
 
 from app.api.deps import SessionDep
 from app.core.config import settings
+from app.core.db import async_engine, replica_engine
 from app.core.health import check_database_health
-from app.schemas.health import HealthCheck, ReadyCheck
+from app.core.metrics import pool_status
+from app.schemas.health import HealthCheck, MetricsCheck, ReadyCheck
 
 router = APIRouter(tags=["health"])
 
@@ -47,3 +49,14 @@ async def ready(db: SessionDep) -> JSONResponse:
     }
 
     return JSONResponse(status_code=http_status, content=response)
+
+
+@router.get("/metrics", response_model=MetricsCheck)
+async def metrics() -> JSONResponse:
+    """Live connection pool statistics of this worker process."""
+    response = {
+        "database": pool_status(async_engine),
+        "replica": pool_status(replica_engine),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+    return JSONResponse(status_code=status.HTTP_200_OK, content=response)
@@ -1,17 +1,27 @@
 """
 Patient API routes - Bemorlar uchun API endpointlar
 """
+from collections.abc import AsyncIterator
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import ConditionalDep, CurrentUser, ReadSessionDep, SessionDep
+from app.core.conditional import entity_etag
+from app.core.db import local_read_session
+from app.core.export import MEDIA_TYPES, ExportFormat, column_types, encode, ensure_available, export_filename
+from app.core.tabular import iter_rows
 from app.crud import crud_patient
+from app.crud.pagination import CountMode
+from app.crud.patient import EXPORT_COLUMNS
 from app.schemas.common import Message
 from app.schemas.patient import (
     PatientCreate,
+    PatientImportResult,
     PatientList,
     PatientRead,
+    PatientSuggestion,
     PatientUpdate,
 )
 
@@ -20,27 +30,33 @@ router = APIRouter()
 
 @router.get("", response_model=dict[str, Any])
 async def get_patients(
-    db: SessionDep,
+    db: ReadSessionDep,
     current_user: CurrentUser,
     query: str | None = Query(None, description="Qidiruv so'zi"),
     gender: str | None = Query(None, pattern="^(male|female)$"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyingi sahifa kursori (next_cursor)"),
+    count_mode: CountMode = Query(CountMode.EXACT, description="Umumiy sonni hisoblash usuli"),
 ) -> Any:
     """
     Bemorlar ro'yxatini olish
 
-    - **query**: Ism yoki telefon bo'yicha qidirish
+    - **query**: Ism (lotin yoki kirill) yoki telefon bo'yicha qidirish, natijalar moslik bo'yicha tartiblanadi
     - **gender**: Jins bo'yicha filter (male/female)
     - **page**: Sahifa raqami
     - **per_page**: Har sahifada nechta
+    - **cursor**: Oldingi javobdagi next_cursor (berilsa, page e'tiborga olinmaydi)
+    - **count_mode**: exact, estimated, capped, window yoki none (javobda ishlatilgan usul qaytadi)
     """
-    patients, total = await crud_patient.search(
+    patients, total, next_cursor, used_count_mode = await crud_patient.search(
         db=db,
         query=query,
         gender=gender,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor,
+        count_mode=count_mode
     )
 
     return {
@@ -48,7 +64,9 @@ async def get_patients(
         "total": total,
         "page": page,
         "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page
+        "pages": (total + per_page - 1) // per_page if total is not None else None,
+        "next_cursor": next_cursor,
+        "count_mode": used_count_mode
     }
 
 
@@ -74,9 +92,72 @@ async def create_patient(
     return PatientRead.model_validate(patient)
 
 
+@router.post("/import", response_model=PatientImportResult)
+async def import_patients(
+    db: SessionDep,
+    current_user: CurrentUser,
+    file: UploadFile,
+) -> Any:
+    """
+    Bemorlarni CSV yoki XLSX fayldan ommaviy import qilish
+
+    Birinchi qator - sarlavha (PatientCreate maydonlari: last_name, first_name,
+    middle_name, birth_date, gender, phone, address, notes).
+    Xato va dublikat (telefon raqami mavjud) qatorlar o'tkazib yuboriladi va
+    qator raqami bilan qaytariladi; qolganlari import qilinadi.
+    """
+    rows = iter_rows(file.file, file.filename or "")
+    return await crud_patient.bulk_import(db=db, rows=rows)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_patients(
+    current_user: CurrentUser,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv, ndjson yoki parquet"),
+    query: str | None = Query(None, description="Qidiruv so'zi"),
+    gender: str | None = Query(None, pattern="^(male|female)$"),
+) -> StreamingResponse:
+    """
+    Bemorlarni faylga eksport qilish
+
+    Filtrlar GET /patients bilan bir xil; fayl qismlab yuboriladi, sahifalash yo'q.
+    """
+    ensure_available(export_format)
+    columns = column_types(EXPORT_COLUMNS)
+
+    async def content() -> AsyncIterator[bytes]:
+        # Dependency sessiyasi javob oqimidan oldin yopilishi mumkin - eksport o'z sessiyasini ochadi
+        async with local_read_session() as db:
+            batches = crud_patient.stream_export(db, query=query, gender=gender)
+            async for chunk in encode(export_format, batches, columns):
+                yield chunk
+
+    filename = export_filename("patients", export_format)
+    return StreamingResponse(
+        content(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/suggest", response_model=list[PatientSuggestion])
+async def suggest_patients(
+    db: ReadSessionDep,
+    current_user: CurrentUser,
+    query: str = Query(..., min_length=1, description="Familiya (F.I.O.) yoki telefon raqamining boshi"),
+    limit: int = Query(10, ge=1, le=20),
+) -> Any:
+    """
+    Bemor qidiruvi uchun tezkor takliflar (typeahead)
+
+    Umumiy son qaytarilmaydi; natijalar qisqa muddat keshlanadi.
+    """
+    return await crud_patient.suggest(db=db, query=query, limit=limit)
+
+
 @router.get("/recent", response_model=list[PatientList])
 async def get_recent_patients(
-    db: SessionDep,
+    db: ReadSessionDep,
     current_user: CurrentUser,
     limit: int = Query(10, ge=1, le=50),
 ) -> Any:
@@ -92,19 +173,25 @@ async def get_patient(
     db: SessionDep,
     current_user: CurrentUser,
     patient_id: int,
+    conditional: ConditionalDep,
 ) -> Any:
     """
     ID bo'yicha bemor olish
+
+    ETag / Last-Modified bilan: o'zgarmagan bo'lsa 304 (faqat versiya so'rovi bajariladi).
     """
+    version = await crud_patient.get_version(db, patient_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Bemor topilmadi")
+    changed_at, examination_count = version
+    conditional.check(entity_etag("patient", patient_id, changed_at, examination_count), changed_at)
+
     patient = await crud_patient.get_by_id(db=db, patient_id=patient_id)
     if not patient:
         raise HTTPException(status_code=404, detail="Bemor topilmadi")
 
-    # Get examination count
-    result = await crud_patient.get_with_examination_count(db, patient_id)
     patient_data = PatientRead.model_validate(patient)
-    if result:
-        patient_data.examination_count = result["examination_count"]
+    patient_data.examination_count = examination_count
 
     return patient_data
 
@@ -119,20 +206,18 @@ async def update_patient(
     """
     Bemor ma'lumotlarini yangilash
     """
-    patient = await crud_patient.get_by_id(db=db, patient_id=patient_id)
-    if not patient:
-        raise HTTPException(status_code=404, detail="Bemor topilmadi")
-
     # Check phone uniqueness
-    if patient_in.phone and patient_in.phone != patient.phone:
+    if patient_in.phone:
         existing = await crud_patient.get_by_phone(db, patient_in.phone)
-        if existing:
+        if existing and existing.id != patient_id:
             raise HTTPException(
                 status_code=400,
                 detail="Bu telefon raqami bilan boshqa bemor mavjud"
             )
 
-    patient = await crud_patient.update(db=db, patient=patient, patient_in=patient_in)
+    patient = await crud_patient.update(db=db, patient_id=patient_id, patient_in=patient_in)
+    if not patient:
+        raise HTTPException(status_code=404, detail="Bemor topilmadi")
     return PatientRead.model_validate(patient)
 
 
@@ -145,9 +230,6 @@ async def delete_patient(
     """
     Bemorni o'chirish (soft delete)
     """
-    patient = await crud_patient.get_by_id(db=db, patient_id=patient_id)
-    if not patient:
+    if not await crud_patient.delete(db=db, id=patient_id):
         raise HTTPException(status_code=404, detail="Bemor topilmadi")
-
-    await crud_patient.delete(db=db, id=patient.id)
     return Message(message="Bemor muvaffaqiyatli o'chirildi")
@@ -59,6 +59,7 @@ async def read_users(
         db=db,
         offset=skip,
         limit=limit,
+        columns=list(UserRead.model_fields),
         is_deleted=False,
     )
 
@@ -114,7 +115,7 @@ async def update_password_me(
     if body.current_password == body.new_password:
         raise DuplicateValueException("New password cannot be the same as the current password")
 
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await get_password_hash(body.new_password)
     await crud_users.update(db=db, db_user=current_user, user_update={"hashed_password": hashed_password})
     return {"message": "Password updated successfully"}
 
@@ -182,14 +183,11 @@ async def erase_user(
     db: SessionDep,
 ) -> dict[str, str]:
     """Delete a user profile (Self or Superuser)."""
-    db_user = await crud_users.get(db=db, id=user_id)
-    if not db_user:
-        raise NotFoundException("User not found")
-
     if not current_user.is_superuser and user_id != current_user.id:
         raise ForbiddenException()
 
-    await crud_users.delete(db=db, id=user_id)
+    if not await crud_users.delete(db=db, id=user_id):
+        raise NotFoundException("User not found")
     return {"message": "User deleted"}
 
 
@@ -200,9 +198,6 @@ async def erase_db_user(
     db: SessionDep,
 ) -> dict[str, str]:
     """Permanently delete a user from the database (Superuser only)."""
-    user_exists = await crud_users.exists(db=db, username=username)
-    if not user_exists:
+    if not await crud_users.db_delete(db=db, username=username):
         raise NotFoundException("User not found")
-
-    await crud_users.db_delete(db=db, username=username)
     return {"message": "User deleted from the database"}
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.db import AsyncSession, local_session
+from app.crud.analytics import build_query, crud_analytics
+from app.models.examination import Examination
+from app.models.patient import Patient
+from app.models.user import User
+from app.schemas.analytics import AnalyticsQuery
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sintetik ma'lumotlar belgisi - benchmark shifokori va bemorlari shu bo'yicha topiladi va o'chiriladi
+BENCH_USERNAME = "bench_analytics"
+BENCH_PATIENT_NOTES = "analytics-benchmark"
+PATIENTS_PER_EXAMINATION = 0.1
+SEED_BATCH_SIZE = 200_000
+
+# Har 4-tekshiruv bir xil turda: (template_type, examination_data ifodasi); g - generate_series qiymati
+SYNTHETIC_TEMPLATES = (
+    ("thyroid", """jsonb_build_object(
+        'total_volume', round((4 + random() * 22)::numeric, 1),
+        'right_volume', round((2 + random() * 11)::numeric, 1),
+        'left_volume', round((2 + random() * 11)::numeric, 1))"""),
+    ("gynecology_uterus", """jsonb_build_object(
+        'endometrium_thickness', round((2 + random() * 16)::numeric, 1),
+        'uterus_length', round((40 + random() * 40)::numeric, 1),
+        'cervix_length', round((25 + random() * 15)::numeric, 1))"""),
+    ("obstetrics_2", """jsonb_build_object(
+        'cervix_length', round((25 + random() * 20)::numeric, 1),
+        'fetal_weight', (300 + random() * 1700)::int,
+        'fhr', (120 + random() * 45)::int,
+        'bpd', round((35 + random() * 40)::numeric, 1))"""),
+    ("abdominal", """jsonb_build_object(
+        'liver_kvr_right', round((110 + random() * 60)::numeric, 1),
+        'portal_vein', round((8 + random() * 8)::numeric, 1),
+        'liver_contour', 'ровные')"""),
+)
+
+BENCHMARK_QUERIES = {
+    "thyroid volume distribution, quarter": AnalyticsQuery(
+        metric="total_volume", template_types=["thyroid"], date_from=date(2025, 10, 1), date_to=date(2025, 12, 31),
+        aggregations=["count"], group_by=["value"], bucket_width=2,
+    ),
+    "endometrium by age band": AnalyticsQuery(
+        metric="endometrium_thickness", template_types=["gynecology_uterus"],
+        aggregations=["count", "avg", "median"], group_by=["age_band"],
+    ),
+    "fetal weight percentiles by month": AnalyticsQuery(
+        metric="fetal_weight", template_types=["obstetrics_2"], date_from=date(2025, 1, 1),
+        aggregations=["count", "p10", "median", "p90"], group_by=["month"],
+    ),
+    "liver size by month (not indexed)": AnalyticsQuery(
+        metric="liver_kvr_right", template_types=["abdominal"], date_from=date(2025, 1, 1),
+        aggregations=["count", "avg"], group_by=["month"],
+    ),
+    "examinations by type and quarter": AnalyticsQuery(aggregations=["count"], group_by=["quarter", "template_type"]),
+}
+
+
+async def seed(session: AsyncSession, count: int) -> int:
+    """Sintetik shifokor, bemorlar va tekshiruvlar; shifokor id sini qaytaradi"""
+    doctor_id = await session.scalar(select(User.id).where(User.username == BENCH_USERNAME))
+    if doctor_id is not None:
+        logger.info("Synthetic data from a previous run found, reusing it")
+        return doctor_id
+
+    doctor_id = await session.scalar(
+        text(
+            "INSERT INTO \"user\" (first_name, last_name, username, phone, hashed_password, profile_image_url, "
+            "is_active, is_superuser, is_deleted, created_at) "
+            "VALUES ('Bench', 'Analytics', :username, '+000000000000', '!', '', false, false, false, now()) "
+            "RETURNING id"
+        ),
+        {"username": BENCH_USERNAME},
+    )
+    patient_ids = list(await session.scalars(
+        text(
+            "INSERT INTO patient (last_name, first_name, gender, birth_date, notes, is_deleted, created_at) "
+            "SELECT 'Bench', 'Patient ' || g, CASE WHEN g % 5 = 0 THEN 'male' ELSE 'female' END, "
+            "date '1950-01-01' + (random() * 21000)::int, :notes, false, now() "
+            "FROM generate_series(1, CAST(:patients AS INTEGER)) AS g RETURNING id"
+        ),
+        {"notes": BENCH_PATIENT_NOTES, "patients": max(1, int(count * PATIENTS_PER_EXAMINATION))},
+    ))
+
+    template_case = " ".join(
+        f"WHEN {index} THEN '{template_type}'" for index, (template_type, _) in enumerate(SYNTHETIC_TEMPLATES)
+    )
+    data_case = " ".join(f"WHEN {index} THEN {data}" for index, (_, data) in enumerate(SYNTHETIC_TEMPLATES))
+    insert_examinations = text(
+        "INSERT INTO examination (patient_id, doctor_id, examination_date, template_type, examination_data, "
+        "abnormal_fields, status, is_deleted, created_at) "
+        f"SELECT CAST(:patient_ids AS INTEGER[])[1 + g % :patients], :doctor_id, date '2025-12-31' - (g % 730), "
+        f"CASE g % {len(SYNTHETIC_TEMPLATES)} {template_case} END, "
+        f"CASE g % {len(SYNTHETIC_TEMPLATES)} {data_case} END, "
+        "'{}', 'completed', false, now() "
+        "FROM generate_series(CAST(:start AS INTEGER), CAST(:stop AS INTEGER)) AS g"
+    )
+    for start in range(1, count + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE - 1, count)
+        await session.execute(
+            insert_examinations,
+            {
+                "patient_ids": patient_ids,
+                "patients": len(patient_ids),
+                "doctor_id": doctor_id,
+                "start": start,
+                "stop": stop,
+            },
+        )
+        await session.commit()
+        logger.info(f"Inserted {stop} / {count} examinations")
+
+    await session.execute(text("ANALYZE examination"))
+    await session.execute(text("ANALYZE patient"))
+    await session.commit()
+    return int(doctor_id)
+
+
+async def uses_measurement_index(session: AsyncSession, query: AnalyticsQuery) -> bool:
+    sql = build_query(query).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    return "ix_examination_measure_" in json.dumps(plan)
+
+
+async def run_benchmark(session: AsyncSession, repeat: int, doctor_id: int) -> None:
+    logger.info(f"{'query':<40} {'median ms':>10} {'min ms':>10} {'groups':>7}  index")
+    for name, query in BENCHMARK_QUERIES.items():
+        query = query.model_copy(update={"doctor_id": doctor_id})
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await crud_analytics.run(session, query)
+            timings.append((time.perf_counter() - started) * 1000)
+        indexed = await uses_measurement_index(session, query)
+        logger.info(
+            f"{name:<40} {statistics.median(timings):>10.1f} {min(timings):>10.1f} {len(result.rows):>7}  "
+            f"{'yes' if indexed else 'no'}"
+        )
+
+
+async def cleanup(session: AsyncSession, doctor_id: int) -> None:
+    await session.execute(delete(Examination).where(Examination.doctor_id == doctor_id))
+    await session.execute(delete(Patient).where(Patient.notes == BENCH_PATIENT_NOTES))
+    await session.execute(delete(User).where(User.id == doctor_id))
+    await session.commit()
+    logger.info("Synthetic data removed")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark /v1/analytics queries over synthetic examinations. Use a scratch database: "
+            "the synthetic rows are not counted in the daily statistics rollup."
+        )
+    )
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of synthetic examinations")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic data for the next run")
+    args = parser.parse_args()
+
+    async with local_session() as session:
+        doctor_id = await seed(session, args.count)
+        try:
+            await run_benchmark(session, args.repeat, doctor_id)
+        finally:
+            if not args.keep:
+                await cleanup(session, doctor_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+import argparse
+import json
+import logging
+import time
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.crud.pagination import CountMode
+from app.models.examination import Examination
+from app.models.patient import Patient
+from app.schemas.examination import EXAMINATION_LIST_ADAPTER, ExaminationList, ExaminationPage
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Eski javob modeli (response_model=dict[str, Any]) - FastAPI uni qayta validatsiya qilardi
+_DICT_RESPONSE = TypeAdapter(dict[str, Any])
+
+
+def _examinations(count: int) -> list[Examination]:
+    examinations = []
+    for i in range(count):
+        examination = Examination(
+            patient_id=i,
+            doctor_id=1,
+            examination_date=date(2026, 1, 1) + timedelta(days=i % 30),
+            template_type=("abdominal", "thyroid", "obstetrics_2")[i % 3],
+            examination_data={},
+            conclusion=None,
+            recommendations=None,
+            notes=None,
+            status="completed",
+        )
+        examination.id = i
+        examination.created_at = datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=i)
+        examination.patient = Patient(
+            last_name=f"Karimova{i}",
+            first_name="Dilnoza",
+            middle_name="Aliyevna" if i % 2 else None,
+            birth_date=date(1990, 1, 1),
+            gender="female",
+            phone="+998901234567",
+            address=None,
+            notes=None,
+        )
+        examinations.append(examination)
+    return examinations
+
+
+def _rows(examinations: list[Examination]) -> list[SimpleNamespace]:
+    # search_list() qatorlari: faqat ExaminationList ustunlari, F.I.Sh. SQL da birlashtirilgan
+    return [
+        SimpleNamespace(
+            id=e.id,
+            patient_id=e.patient_id,
+            examination_date=e.examination_date,
+            template_type=e.template_type,
+            status=e.status,
+            created_at=e.created_at,
+            patient_name=" ".join(filter(None, (e.patient.last_name, e.patient.first_name, e.patient.middle_name))),
+            patient_phone=e.patient.phone,
+            patient_birth_date=e.patient.birth_date,
+        )
+        for e in examinations
+    ]
+
+
+def serialize_before(examinations: list[Examination]) -> bytes:
+    # Oldingi get_examinations: har bir qator alohida (template_name ni validator to'ldiradi),
+    # keyin dict javob va jsonable_encoder
+    items = []
+    for exam in examinations:
+        item = ExaminationList.model_validate(exam)
+        patient_name = f"{exam.patient.last_name} {exam.patient.first_name}"
+        if exam.patient.middle_name:
+            patient_name += f" {exam.patient.middle_name}"
+        item.patient_name = patient_name
+        item.patient_phone = exam.patient.phone
+        item.patient_birth_date = exam.patient.birth_date
+        items.append(item)
+    content = {
+        "items": items,
+        "total": len(items),
+        "page": 1,
+        "per_page": len(items),
+        "pages": 1,
+        "next_cursor": None,
+        "count_mode": CountMode.EXACT,
+    }
+    return json.dumps(jsonable_encoder(_DICT_RESPONSE.validate_python(content))).encode()
+
+
+def serialize_after(rows: list[SimpleNamespace]) -> bytes:
+    result = ExaminationPage(
+        items=EXAMINATION_LIST_ADAPTER.validate_python(rows, from_attributes=True),
+        total=len(rows),
+        page=1,
+        per_page=len(rows),
+        pages=1,
+        next_cursor=None,
+        count_mode=CountMode.EXACT,
+    )
+    return result.model_dump_json().encode()
+
+
+def measure(mode: str, serialize: Callable[[Any], bytes], page: Any, iterations: int) -> float:
+    serialize(page)
+    started = time.process_time()
+    for _ in range(iterations):
+        serialize(page)
+    per_page = (time.process_time() - started) / iterations * 1000
+    logger.info(f"{mode:<8} {per_page:>10.2f}")
+    return per_page
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="CPU time to serialize one GET /v1/examinations page, before and after the typed projection"
+    )
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument("--iterations", type=int, default=300, help="Pages serialized per mode")
+    args = parser.parse_args()
+
+    examinations = _examinations(args.rows)
+    logger.info(f"{args.rows}-row page, {args.iterations} iterations")
+    logger.info(f"{'mode':<8} {'CPU ms':>10}")
+    before = measure("before", serialize_before, examinations, args.iterations)
+    after = measure("after", serialize_after, _rows(examinations), args.iterations)
+    logger.info(f"saved per request: {before - after:.2f} ms CPU ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
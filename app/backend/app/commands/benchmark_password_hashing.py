@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import bcrypt
+
+from app.core.exceptions import ServiceUnavailableException
+from app.core.security import BCRYPT_ROUNDS, shutdown_hash_executor, verify_password
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PASSWORD = "benchmark-password"
+# Boshqa so'rovlar o'rnida: har PROBE_INTERVAL da uyg'onadigan vazifa, kechikishi - event loop bandligi
+PROBE_INTERVAL = 0.005
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+    # Eski yo'l: bcrypt to'g'ridan-to'g'ri event loop ichida
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+
+async def _probe(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+
+
+async def run_logins(
+    mode: str,
+    verify: Callable[[str, str], Awaitable[bool]],
+    hashed_password: str,
+    logins: int,
+    concurrency: int,
+) -> None:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    rejected = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await verify(PASSWORD, hashed_password)
+            except ServiceUnavailableException:
+                rejected += 1
+
+    probe = asyncio.create_task(_probe(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    p95 = statistics.quantiles(lags, n=20, method="inclusive")[-1] if len(lags) > 1 else max(lags, default=0.0)
+    logger.info(
+        f"{mode:<16} {logins / elapsed:>9.1f} {rejected:>9} {len(lags):>7} "
+        f"{statistics.median(lags) if lags else 0.0:>9.1f} {p95:>9.1f} {max(lags, default=0.0):>9.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Load test: latency of other work on the event loop while logins verify bcrypt hashes, "
+            "inline on the loop versus in the hashing pool"
+        )
+    )
+    parser.add_argument("--logins", type=int, default=50, help="Number of simulated logins")
+    parser.add_argument("--concurrency", type=int, default=10, help="Logins in flight at once")
+    args = parser.parse_args()
+
+    hashed_password = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+    logger.info(f"bcrypt rounds={BCRYPT_ROUNDS}, {args.logins} logins, {args.concurrency} in flight")
+    logger.info(
+        f"{'mode':<16} {'logins/s':>9} {'rejected':>9} {'probes':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}  (probe lag)"
+    )
+    try:
+        for mode, verify in (("inline", _inline_verify), ("hashing pool", verify_password)):
+            await run_logins(mode, verify, hashed_password, args.logins, args.concurrency)
+    finally:
+        shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from sqlalchemy import delete, func, select, text
+
+from app.core.db import AsyncSession, local_session
+from app.crud.pagination import CountMode
+from app.crud.patient import crud_patient
+from app.models.patient import Patient
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sintetik bemorlar belgisi - shu bo'yicha topiladi va o'chiriladi
+BENCH_PATIENT_NOTES = "search-benchmark"
+SEED_BATCH_SIZE = 200_000
+
+LAST_NAMES = (
+    "Karimov", "Rahimov", "Toshmatov", "Abdullayev", "Yusupov", "Ismoilov", "Qodirov", "Xolmatov",
+    "Nazarov", "Sobirov", "G'ulomov", "Mirzayev", "Ergashev", "Saidov", "Tursunov", "O'rinov",
+    "Каримов", "Рахимов", "Юсупов", "Исмоилов", "Назаров", "Ғуломов", "Мирзаев", "Турсунов",
+)  # fmt: skip
+FIRST_NAMES = (
+    "Dilnoza", "Gulnora", "Malika", "Nodira", "Shahnoza", "Zarina", "Aziza", "Feruza",
+    "Sardor", "Bekzod", "Jasur", "Otabek", "Sherzod", "Aziz", "Ulug'bek", "Javlon",
+    "Дилноза", "Малика", "Нодира", "Зарина", "Сардор", "Бекзод", "Отабек", "Азиз",
+)  # fmt: skip
+
+# Qabulxona qidiruvi kabi so'rovlar: lotin / kirill, to'liq ism, telefon qismi, topilmaydigan
+SEARCH_QUERIES = (
+    "karimov",
+    "Каримов",
+    "karimova dilnoza",
+    "g'ulomov aziz",
+    "sardor",
+    "90 123",
+    "998935",
+    "zzqxw",
+)
+
+
+def _array(values: tuple[str, ...]) -> str:
+    items = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+    return f"(ARRAY[{items}])[1 + floor(random() * {len(values)})::int]"
+
+
+async def seed(session: AsyncSession, count: int) -> None:
+    existing = await session.scalar(select(func.count()).where(Patient.notes == BENCH_PATIENT_NOTES))
+    if existing:
+        logger.info(f"{existing} synthetic patients from a previous run found, reusing them")
+        return
+
+    insert_patients = text(
+        "INSERT INTO patient (last_name, first_name, middle_name, gender, birth_date, phone, notes, "
+        "is_deleted, created_at) "
+        f"SELECT {_array(LAST_NAMES)}, {_array(FIRST_NAMES)}, NULL, "
+        "CASE WHEN g % 5 = 0 THEN 'male' ELSE 'female' END, "
+        "date '1950-01-01' + (random() * 21000)::int, "
+        "'+998 (9' || (g % 10) || ') ' || lpad((g % 10000000)::text, 7, '0'), "
+        ":notes, false, now() - (g || ' seconds')::interval "
+        "FROM generate_series(CAST(:start AS INTEGER), CAST(:stop AS INTEGER)) AS g"
+    )
+    for start in range(1, count + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE - 1, count)
+        await session.execute(insert_patients, {"notes": BENCH_PATIENT_NOTES, "start": start, "stop": stop})
+        await session.commit()
+        logger.info(f"Inserted {stop} / {count} patients")
+
+    await session.execute(text("ANALYZE patient"))
+    await session.commit()
+
+
+async def run_benchmark(session: AsyncSession, repeat: int, count_mode: CountMode) -> None:
+    logger.info(f"{'query':<20} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'total':>9}")
+    all_timings: list[float] = []
+    for query in SEARCH_QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            page = await crud_patient.search(session, query=query, per_page=20, count_mode=count_mode)
+            timings.append((time.perf_counter() - started) * 1000)
+        all_timings.extend(timings)
+        logger.info(
+            f"{query:<20} {statistics.median(timings):>9.1f} {_p95(timings):>9.1f} {max(timings):>9.1f} "
+            f"{page.total if page.total is not None else '-':>9}"
+        )
+    logger.info(f"{'all queries':<20} {statistics.median(all_timings):>9.1f} {_p95(all_timings):>9.1f}")
+
+
+def _p95(timings: list[float]) -> float:
+    return statistics.quantiles(timings, n=20, method="inclusive")[-1] if len(timings) > 1 else timings[0]
+
+
+async def cleanup(session: AsyncSession) -> None:
+    await session.execute(delete(Patient).where(Patient.notes == BENCH_PATIENT_NOTES))
+    await session.commit()
+    logger.info("Synthetic patients removed")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark patient search (GET /v1/patients?query=) latency over synthetic patients"
+    )
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of synthetic patients")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    parser.add_argument(
+        "--count-mode", type=CountMode, default=CountMode.EXACT, choices=list(CountMode), help="Total count strategy"
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic patients for the next run")
+    args = parser.parse_args()
+
+    async with local_session() as session:
+        await seed(session, args.count)
+        try:
+            await run_benchmark(session, args.repeat, args.count_mode)
+        finally:
+            if not args.keep:
+                await cleanup(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
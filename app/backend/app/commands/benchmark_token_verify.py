@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import jwt
+
+from app.core.config import settings
+from app.core.security import (
+    ALGORITHM,
+    SECRET_KEY,
+    TokenType,
+    create_access_token,
+    token_cache,
+    verify_token,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def _verify_uncached(token: str) -> None:
+    # Eski yo'l: har so'rovda kalit (PEM ham) qayta o'qiladi va imzo tekshiriladi
+    key = SECRET_KEY.get_secret_value() if ALGORITHM.startswith("HS") else settings.JWT_PUBLIC_KEY or ""
+    jwt.decode(token, key, algorithms=[ALGORITHM])
+
+
+async def _verify_cached(token: str) -> None:
+    await verify_token(token, TokenType.ACCESS, None)  # type: ignore[arg-type]
+
+
+async def measure(mode: str, verify: Callable[[str], Awaitable[None]], token: str, iterations: int) -> float:
+    token_cache.clear()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await verify(token)
+    elapsed = time.perf_counter() - started
+    logger.info(f"{mode:<24} {iterations / elapsed:>12,.0f} {elapsed / iterations * 1e6:>10.1f}")
+    return iterations / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark of access token verification: jwt.decode per request versus the token cache"
+    )
+    parser.add_argument("--iterations", type=int, default=50_000, help="Verifications per mode")
+    args = parser.parse_args()
+
+    token = await create_access_token(data={"sub": "benchmark"})
+    logger.info(f"algorithm={ALGORITHM}")
+    logger.info(f"{'mode':<24} {'verifies/s':>12} {'us/verify':>10}")
+    before = await measure("jwt.decode every call", _verify_uncached, token, args.iterations)
+    after = await measure("verify_token (cached)", _verify_cached, token, args.iterations)
+    logger.info(f"speed-up: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -19,7 +19,7 @@ async def create_first_user(session: AsyncSession) -> None:
         middle_name = settings.ADMIN_MIDDLE_NAME
         username = settings.ADMIN_USERNAME
         phone = settings.ADMIN_PHONE
-        hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
+        hashed_password = await get_password_hash(settings.ADMIN_PASSWORD)
 
         query = select(User).filter_by(username=username)
         result = await session.execute(query)
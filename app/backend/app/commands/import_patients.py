@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from app.core.db import AsyncSession, local_session
+from app.core.tabular import iter_rows
+from app.crud.patient import crud_patient
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def import_patients(session: AsyncSession, path: Path) -> None:
+    with path.open("rb") as file:
+        result = await crud_patient.bulk_import(session, iter_rows(file, path.name))
+
+    logger.info(
+        f"{path.name}: {result.total_rows} rows, {result.imported} imported, "
+        f"{result.duplicates} duplicates, {result.error_count} invalid."
+    )
+    for error in result.errors:
+        field = f" [{error.field}]" if error.field else ""
+        logger.warning(f"Row {error.row}{field}: {error.message}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Import patients from a CSV or XLSX file")
+    parser.add_argument("path", type=Path, help="CSV or XLSX file; the first row is the header")
+    args = parser.parse_args()
+
+    async with local_session() as session:
+        await import_patients(session, args.path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
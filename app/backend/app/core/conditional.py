@@ -0,0 +1,92 @@
+"""
+Conditional - shartli GET so'rovlari (ETag / If-None-Match / Last-Modified)
+"""
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+
+from .exceptions import NotModifiedException
+
+
+def entity_etag(*parts: Any) -> str:
+    """Weak ETag identifying one version of a representation.
+
+    Pass whatever changes whenever the response body changes, e.g. the entity
+    name, its id and ``updated_at``; the values are hashed, not exposed.
+
+    Examples
+    --------
+    >>> entity_etag("patient", 5, datetime(2025, 1, 1, tzinfo=UTC))
+    'W/"..."'
+    """
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def _opaque(etag: str) -> str:
+    # If-None-Match zaif taqqoslash bilan tekshiriladi (RFC 9110, 13.1.2)
+    return etag.strip().removeprefix("W/")
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=UTC) if moment.tzinfo is None else moment.astimezone(UTC)
+
+
+class Conditional:
+    """Per-request helper answering conditional GETs with 304 Not Modified.
+
+    Used as a dependency (`app.api.deps.ConditionalDep`). A route computes the
+    version of its response from a cheap probe, before loading and
+    serialising the body, and calls `check`:
+
+    >>> changed_at = await crud_patient.get_changed_at(db, patient_id)
+    >>> conditional.check(entity_etag("patient", patient_id, changed_at), changed_at)
+    >>> patient = await crud_patient.get_by_id(db, patient_id)  # only when modified
+
+    `check` also adds ``ETag``, ``Last-Modified`` and
+    ``Cache-Control: private, no-cache`` to the response, so browsers keep the
+    body but revalidate it on every use.
+    """
+
+    def __init__(self, request: Request, response: Response) -> None:
+        self.request = request
+        self.response = response
+
+    def is_fresh(self, etag: str, last_modified: datetime | None = None) -> bool:
+        """Whether the client's cached copy matches the current version.
+
+        ``If-None-Match`` takes precedence; ``If-Modified-Since`` is used only
+        without it and compared with second precision.
+        """
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is not None:
+            candidates = {_opaque(tag) for tag in if_none_match.split(",")}
+            return "*" in candidates or _opaque(etag) in candidates
+
+        if_modified_since = self.request.headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    def check(self, etag: str, last_modified: datetime | None = None) -> None:
+        """Set the validators on the response; stop with 304 if the client is up to date.
+
+        Raises
+        ------
+        NotModifiedException
+            If the client's cached copy is current. The 304 response carries
+            the validators and no body.
+        """
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+        if self.is_fresh(etag, last_modified):
+            raise NotModifiedException(headers=headers)
+        self.response.headers.update(headers)
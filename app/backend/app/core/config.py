@@ -21,8 +21,14 @@ class CryptSettings(BaseSettings):
 
     SECRET_KEY: SecretStr = SecretStr("secret-key-change-in-production")
     ALGORITHM: str = "HS256"
+    # Asimmetrik algoritmlar (EdDSA, ES256, RS256, ...) uchun PEM kalitlar
+    JWT_PRIVATE_KEY: SecretStr | None = None
+    JWT_PUBLIC_KEY: str | None = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
 
 
 class DatabaseSettings(BaseSettings):
@@ -36,6 +42,23 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_ASYNC_PREFIX: str = "postgresql+asyncpg://"
     POSTGRES_URL: str | None = None
 
+    # Har bir gunicorn worker o'z pool'iga ega: jami ulanishlar = workers * (POOL_SIZE + MAX_OVERFLOW)
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 5
+    POSTGRES_POOL_TIMEOUT: float = 10
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement keshi; PgBouncer transaction rejimida 0 bo'lishi kerak
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    # PgBouncer ishlatilganda ulanishlarni ilovada saqlamaslik uchun
+    POSTGRES_USE_NULLPOOL: bool = False
+
+    # Ixtiyoriy o'qish replikasi (hot standby) - asosiy baza bilan bir xil foydalanuvchi va baza nomi
+    POSTGRES_REPLICA_SERVER: str | None = None
+    POSTGRES_REPLICA_PORT: int = 5432
+    # Yozuvdan keyin foydalanuvchi o'qishlari shu vaqt davomida asosiy bazadan bajariladi
+    POSTGRES_READ_YOUR_WRITES_SECONDS: int = 5
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def POSTGRES_URI(self) -> str:
@@ -44,6 +67,43 @@ class DatabaseSettings(BaseSettings):
         location = f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         return f"{credentials}@{location}"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def POSTGRES_REPLICA_URI(self) -> str | None:
+        """Construct the read replica connection URI, or None if no replica is configured."""
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        credentials = f"{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+        location = f"{self.POSTGRES_REPLICA_SERVER}:{self.POSTGRES_REPLICA_PORT}/{self.POSTGRES_DB}"
+        return f"{credentials}@{location}"
+
+
+class CacheSettings(BaseSettings):
+    """In-process cache configuration (per worker)."""
+
+    PATIENT_SUGGEST_CACHE_SIZE: int = 1024
+    PATIENT_SUGGEST_CACHE_TTL_SECONDS: float = 30
+    USER_CACHE_SIZE: int = 1024
+    # Boshqa workerlarda o'chirilgan / faolsizlantirilgan foydalanuvchi shu vaqtgacha qabul qilinadi
+    USER_CACHE_TTL_SECONDS: float = 5
+    TOKEN_CACHE_SIZE: int = 4096
+    PRINT_CACHE_SIZE: int = 256
+    PRINT_CACHE_TTL_SECONDS: float = 3600
+    # Shablonlar jadvali o'zgarganini tekshirish oralig'i; 0 - faqat ishga tushishda yuklash
+    TEMPLATE_REFRESH_SECONDS: float = 30
+
+
+class PrintSettings(BaseSettings):
+    """Server-side document rendering."""
+
+    PRINT_RENDER_WORKERS: int = 2
+    PRINT_RENDER_MAX_QUEUE: int = 16
+    # Ommaviy chop etish vazifalari (har bir gunicorn worker da alohida navbat)
+    PRINT_JOB_WORKERS: int = 1
+    PRINT_JOB_MAX_QUEUE: int = 20
+    PRINT_JOB_MAX_EXAMINATIONS: int = 500
+    PRINT_JOB_RETENTION_HOURS: int = 24
+
 
 class FirstUserSettings(BaseSettings):
     """First admin user credentials."""
@@ -82,6 +142,8 @@ class Settings(
     AppSettings,
     DatabaseSettings,
     CryptSettings,
+    CacheSettings,
+    PrintSettings,
     FirstUserSettings,
     EnvironmentSettings,
     CORSSettings,
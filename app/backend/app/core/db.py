@@ -1,10 +1,15 @@
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
+from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool
 
 from .config import settings
+from .metrics import POOL_WAIT_BUCKETS, Histogram
 
 
 class Base(DeclarativeBase, MappedAsDataclass):
@@ -14,13 +19,117 @@ class Base(DeclarativeBase, MappedAsDataclass):
 DATABASE_URI = settings.POSTGRES_URI
 DATABASE_PREFIX = settings.POSTGRES_ASYNC_PREFIX
 DATABASE_URL = f"{DATABASE_PREFIX}{DATABASE_URI}"
+REPLICA_URI = settings.POSTGRES_REPLICA_URI
+REPLICA_URL = f"{DATABASE_PREFIX}{REPLICA_URI}" if REPLICA_URI else None
 
+# Yozuvdan keyingi o'qishlarni asosiy bazaga yo'naltiruvchi cookie
+PRIMARY_READ_COOKIE = "db_primary"
 
-async_engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+# Session.info kaliti - joriy tranzaksiyada commit qilinmagan yozuv bor
+UNCOMMITTED_WRITES = "uncommitted_writes"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits for a connection.
+
+    The measured time includes opening a new connection when the pool is below
+    its limit, and waiting in the queue when all connections are checked out.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram(POOL_WAIT_BUCKETS)
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """Build `create_async_engine` keyword arguments from the pool settings."""
+    options: dict[str, Any] = {}
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE}
+
+    if settings.POSTGRES_USE_NULLPOOL:
+        # Ulanishlarni PgBouncer boshqaradi
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+    )
+    return options
+
+
+async_engine = create_async_engine(DATABASE_URL, echo=False, future=True, **engine_options(DATABASE_URL))
 
 local_session = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_engine = (
+    create_async_engine(REPLICA_URL, echo=False, future=True, **engine_options(REPLICA_URL)) if REPLICA_URL else None
+)
+
+# Replika sozlanmagan bo'lsa o'qishlar ham asosiy bazadan
+local_read_session = async_sessionmaker(
+    bind=replica_engine or async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    session.info[UNCOMMITTED_WRITES] = True
+
+
+def _mark_write_statement(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[UNCOMMITTED_WRITES] = True
+
+
+def _clear_writes(session: Session) -> None:
+    session.info.pop(UNCOMMITTED_WRITES, None)
+
+
+def _track_uncommitted_writes(db: AsyncSession) -> None:
+    """Keep ``db.info[UNCOMMITTED_WRITES]`` set while the transaction has unsaved writes.
+
+    ORM flushes and INSERT / UPDATE / DELETE statements set it; commit and
+    rollback clear it.
+    """
+    session = db.sync_session
+    event.listen(session, "after_flush", _mark_flush)
+    event.listen(session, "do_orm_execute", _mark_write_statement)
+    event.listen(session, "after_commit", _clear_writes)
+    event.listen(session, "after_rollback", _clear_writes)
+
 
 async def async_get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Primary session, one unit of work per request.
+
+    CRUD calls that take ``commit=False`` only flush; whatever the route left
+    uncommitted is committed once after it returns, and rolled back if it
+    raised. Read-only requests end without a commit.
+    """
     async with local_session() as db:
+        _track_uncommitted_writes(db)
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+        if db.new or db.dirty or db.deleted:
+            await db.flush()
+        if db.info.get(UNCOMMITTED_WRITES):
+            await db.commit()
+
+
+async def async_get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with local_read_session() as db:
         yield db
@@ -38,3 +38,18 @@ class UnprocessableEntityException(CustomException):
 class DuplicateValueException(CustomException):
     def __init__(self, detail: str = "Duplicate Value") -> None:
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class ServiceUnavailableException(CustomException):
+    def __init__(self, detail: str = "Service Unavailable", retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class NotModifiedException(CustomException):
+    def __init__(self, headers: dict[str, str] | None = None) -> None:
+        # 304 javobi tanasiz yuboriladi (FastAPI/Starlette HTTPException handler)
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, detail="Not Modified", headers=headers)
@@ -0,0 +1,192 @@
+"""
+Export - katta ro'yxatlarni CSV, NDJSON yoki Parquet ko'rinishida qismlab (stream) yuborish
+"""
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable, Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from enum import StrEnum
+from typing import Any
+
+import anyio
+from pydantic_core import to_json
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from .exceptions import BadRequestException
+
+# Server-side cursor dan bir marta olinadigan qatorlar soni (Parquet da - bitta row group)
+EXPORT_BATCH_SIZE = 2000
+
+# Eksport qatorlari partiyalari: har bir partiya - ustun nomi -> qiymat lug'atlari
+Batches = AsyncIterator[list[dict[str, Any]]]
+
+
+class ExportFormat(StrEnum):
+    """Export file format.
+
+    - csv: UTF-8 with BOM (opens correctly in Excel); JSON values are encoded as text
+    - ndjson: one JSON object per line
+    - parquet: columnar file, requires the optional ``pyarrow`` package
+    """
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def column_types(columns: Iterable[ColumnElement[Any] | QueryableAttribute[Any]]) -> dict[str, type]:
+    """Map the keys of selected columns to their Python types (``str`` when unknown).
+
+    Raises
+    ------
+    ValueError
+        If a column expression has no key (it must be labeled).
+    """
+    types: dict[str, type] = {}
+    for column in columns:
+        if column.key is None:
+            raise ValueError(f"Export column {column} needs a label")
+        expression = column.expression if isinstance(column, QueryableAttribute) else column
+        try:
+            python_type = expression.type.python_type
+        except NotImplementedError:
+            python_type = str
+        types[column.key] = python_type
+    return types
+
+
+def export_filename(name: str, export_format: ExportFormat) -> str:
+    """Attachment file name, e.g. ``examinations-20260118.csv``."""
+    return f"{name}-{date.today():%Y%m%d}.{export_format}"
+
+
+def ensure_available(export_format: ExportFormat) -> None:
+    """Fail before streaming starts if the format's optional dependency is missing.
+
+    Raises
+    ------
+    BadRequestException
+        If Parquet is requested and ``pyarrow`` is not installed.
+    """
+    if export_format == ExportFormat.PARQUET:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise BadRequestException("Parquet export requires the 'pyarrow' package; use csv or ndjson") from e
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, dict | list):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+async def csv_stream(batches: Batches, columns: Mapping[str, type]) -> AsyncIterator[bytes]:
+    """Encode batches as CSV, one chunk per batch, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    names = list(columns)
+    # BOM - Excel faylni UTF-8 deb tanishi uchun
+    buffer.write("\ufeff")
+    writer.writerow(names)
+    yield buffer.getvalue().encode()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_text(row.get(name)) for name in names] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+async def ndjson_stream(batches: Batches, columns: Mapping[str, type]) -> AsyncIterator[bytes]:
+    """Encode batches as newline-delimited JSON, one chunk per batch."""
+    names = list(columns)
+    async for batch in batches:
+        yield b"".join(to_json({name: row.get(name) for name in names}) + b"\n" for row in batch)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that keeps written bytes until they are drained."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def parquet_stream(batches: Batches, columns: Mapping[str, type]) -> AsyncIterator[bytes]:
+    """Encode batches as a Parquet file, one row group per batch.
+
+    Column types follow `columns`: ``int``, ``float``, ``bool``, ``date``,
+    ``datetime`` and ``str`` map to the matching Arrow types; anything else
+    (e.g. JSON objects) is written as JSON text.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        Decimal: pa.float64(),
+        bool: pa.bool_(),
+        date: pa.date32(),
+        datetime: pa.timestamp("us", tz="UTC"),
+    }
+    schema = pa.schema([(name, arrow_types.get(python_type, pa.string())) for name, python_type in columns.items()])
+    text_columns = [name for name, python_type in columns.items() if python_type not in arrow_types]
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+
+    def write(batch: list[dict[str, Any]]) -> bytes:
+        for row in batch:
+            for name in text_columns:
+                value = row.get(name)
+                if value is not None and not isinstance(value, str):
+                    row[name] = _text(value) if isinstance(value, dict | list) else str(value)
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        return sink.drain()
+
+    try:
+        async for batch in batches:
+            yield await anyio.to_thread.run_sync(write, batch)
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def encode(export_format: ExportFormat, batches: Batches, columns: Mapping[str, type]) -> AsyncIterator[bytes]:
+    """Encode `batches` in the requested format."""
+    encoders = {
+        ExportFormat.CSV: csv_stream,
+        ExportFormat.NDJSON: ndjson_stream,
+        ExportFormat.PARQUET: parquet_stream,
+    }
+    async for chunk in encoders[export_format](batches, columns):
+        yield chunk
@@ -0,0 +1,93 @@
+"""
+Jobs - fon vazifalari uchun jarayon ichidagi navbat (tashqi broker kerak emas)
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from .exceptions import ServiceUnavailableException
+
+LOGGER = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+_queues: list["JobQueue"] = []
+
+
+class JobQueue:
+    """FIFO queue of background jobs run by a fixed number of worker tasks.
+
+    Workers start with the first submitted job, inside the running event loop.
+    Jobs exist only in this process and are lost on restart, so a job must
+    record its own state (e.g. in the database) if clients poll for it.
+
+    Parameters
+    ----------
+    name : str
+        Used in log messages.
+    workers : int
+        Number of jobs executed at the same time.
+    maxsize : int
+        Maximum number of waiting jobs; further submissions are rejected.
+
+    Examples
+    --------
+    >>> queue = JobQueue("reports", workers=1, maxsize=10)
+    >>> queue.submit(lambda: build_report(report_id))
+    """
+
+    def __init__(self, name: str, workers: int, maxsize: int) -> None:
+        self.name = name
+        self.workers = workers
+        self._queue: asyncio.Queue[Job] | None = None
+        self._maxsize = maxsize
+        self._tasks: list[asyncio.Task[None]] = []
+        _queues.append(self)
+
+    def submit(self, job: Job) -> None:
+        """Enqueue a job.
+
+        Raises
+        ------
+        ServiceUnavailableException
+            If `maxsize` jobs are already waiting.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._maxsize)
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._work(), name=f"{self.name}-worker-{i}") for i in range(self.workers)
+            ]
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            raise ServiceUnavailableException("Server is busy, please try again.") from e
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception:
+                LOGGER.exception(f"Job in queue {self.name} failed")
+            finally:
+                self._queue.task_done()
+
+    async def stop(self) -> None:
+        """Cancel the workers; running and waiting jobs are dropped."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+
+
+async def stop_job_queues() -> None:
+    """Stop the workers of every queue (called on application shutdown)."""
+    for queue in _queues:
+        await queue.stop()
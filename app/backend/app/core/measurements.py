@@ -0,0 +1,105 @@
+"""
+Measurements - examination_data ni shablon bo'yicha tekshirish, normallashtirish va normaga solishtirish
+"""
+from collections.abc import Mapping
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from app.schemas.examination import EXAMINATION_DATA_MODELS, ExaminationDataBase
+
+from .exceptions import UnprocessableEntityException
+from .render import iter_field_specs
+from .templates import template_registry
+
+# Template.fields dagi maydon turi -> qiymat turi; boshqa turlar (text, select, ...) o'zgarishsiz saqlanadi
+FIELD_TYPES: dict[str, type] = {"number": float, "date": date}
+
+# Maydon -> (normal_min, normal_max)
+NormalRanges = dict[str, tuple[float | None, float | None]]
+
+
+def _as_float(value: Any) -> float | None:
+    try:
+        return None if value is None or isinstance(value, bool) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=128)
+def _compile(template_type: str, version: str) -> tuple[type[ExaminationDataBase], NormalRanges]:
+    # version faqat kesh kaliti: shablonlar qayta yuklansa validator ham qayta quriladi
+    base = EXAMINATION_DATA_MODELS.get(template_type, ExaminationDataBase)
+    fields: dict[str, Any] = {}
+    ranges: NormalRanges = {}
+    for spec in iter_field_specs(template_registry.types.get(template_type, {}).get("fields")):
+        name = spec["name"]
+        low, high = _as_float(spec.get("normal_min")), _as_float(spec.get("normal_max"))
+        if low is not None or high is not None:
+            ranges[name] = (low, high)
+        field_type = FIELD_TYPES.get(spec.get("type", ""))
+        if (
+            field_type is not None
+            and name not in base.model_fields
+            and name.isidentifier()
+            and not name.startswith("_")
+            and not hasattr(BaseModel, name)
+        ):
+            fields[name] = (field_type | None, None)
+    if fields:
+        base = create_model(f"{base.__name__}_{template_type}", __base__=base, **fields)
+    return base, ranges
+
+
+def _error_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"examination_data.{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in error.errors()
+    )
+
+
+def abnormal_fields(data: Mapping[str, Any], ranges: NormalRanges) -> dict[str, str]:
+    """Numeric values outside their normal range: ``field -> "low" | "high"``."""
+    flags: dict[str, str] = {}
+    for name, (low, high) in ranges.items():
+        value = data.get(name)
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            continue
+        if low is not None and value < low:
+            flags[name] = "low"
+        elif high is not None and value > high:
+            flags[name] = "high"
+    return flags
+
+
+def validate_examination_data(
+    template_type: str, data: Mapping[str, Any]
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """Validate and normalise ``examination_data`` once, at write time.
+
+    The model is picked by `template_type`: the typed model of the template
+    (`EXAMINATION_DATA_MODELS`) extended with the ``number`` and ``date``
+    fields of its ``Template.fields`` config. Models are built once per
+    template and registry version. Numeric strings are coerced (``"12,5"``
+    becomes ``12.5``), empty values dropped, and fields the template does not
+    describe kept as they are.
+
+    Returns
+    -------
+    tuple[dict[str, Any], dict[str, str]]
+        The normalised JSON to store and the values outside
+        ``normal_min``/``normal_max`` of the template (``field -> "low" | "high"``).
+
+    Raises
+    ------
+    UnprocessableEntityException
+        If a value does not fit its field, e.g. text in a numeric field.
+    """
+    model, ranges = _compile(template_type, template_registry.version)
+    try:
+        validated = model.model_validate(data)
+    except ValidationError as e:
+        raise UnprocessableEntityException(_error_message(e)) from e
+    normalized = validated.model_dump(mode="json", exclude_unset=True, exclude_none=True)
+    return normalized, abnormal_fields(normalized, ranges)
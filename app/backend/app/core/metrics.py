@@ -0,0 +1,79 @@
+"""
+Metrics - ilova ichidagi oddiy metrikalar (gistogrammalar) va DB pool holati
+"""
+import math
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+# Pool'dan ulanish olish kutish vaqti uchun chegaralar (sekund)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus style.
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        Increasing upper bounds; an implicit ``+Inf`` bucket is appended.
+
+    Examples
+    --------
+    >>> histogram = Histogram((0.1, 1.0))
+    >>> histogram.observe(0.05)
+    >>> histogram.snapshot()["buckets"]
+    {'0.1': 1, '1.0': 1, '+Inf': 1}
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.bounds = (*buckets, math.inf)
+        self.counts = [0] * len(self.bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return cumulative bucket counts together with the sum and count."""
+        buckets: dict[str, int] = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts, strict=True):
+            cumulative += count
+            buckets["+Inf" if bound == math.inf else str(bound)] = cumulative
+        return {"buckets": buckets, "sum": round(self.sum, 6), "count": self.count}
+
+
+def pool_status(engine: AsyncEngine | None) -> dict[str, Any] | None:
+    """Return live statistics of the engine's connection pool.
+
+    Only queue pools keep connections; for NullPool just the pool class is reported.
+    Returns None when `engine` is None (e.g. no read replica is configured).
+    """
+    if engine is None:
+        return None
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+
+    wait_time: Histogram | None = getattr(pool, "wait_time", None)
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # overflow() pool_size dan kam ulanish ochilganda manfiy bo'ladi
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "wait_time_seconds": wait_time.snapshot() if wait_time is not None else None,
+    }
+
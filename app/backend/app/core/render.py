@@ -0,0 +1,246 @@
+"""
+Render - chop etish hujjatlarini (HTML / PDF) alohida worker jarayonlarda tayyorlash
+"""
+import asyncio
+import html
+import io
+import multiprocessing
+import string
+import zipfile
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from .cache import TTLCache
+from .config import settings
+from .exceptions import BadRequestException, ServiceUnavailableException
+
+
+class PrintFormat(StrEnum):
+    """Output of the print endpoint.
+
+    - json: examination data only, rendered by the browser
+    - html: document rendered from ``Template.print_template``
+    - pdf: the HTML document converted to PDF, requires the optional ``weasyprint`` package
+    """
+
+    JSON = "json"
+    HTML = "html"
+    PDF = "pdf"
+
+
+PRINT_MEDIA_TYPES = {
+    PrintFormat.HTML: "text/html; charset=utf-8",
+    PrintFormat.PDF: "application/pdf",
+}
+
+# Shablonda print_template bo'lmasa ishlatiladi; $o'zgaruvchilar - render_document() konteksti
+DEFAULT_PRINT_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>$template_name - $patient_name</title>
+<style>
+body { font-family: "DejaVu Sans", Arial, sans-serif; font-size: 12pt; margin: 2cm; }
+h1 { font-size: 16pt; text-align: center; }
+table.fields { width: 100%; border-collapse: collapse; margin: 1em 0; }
+table.fields td { border-bottom: 1px solid #ccc; padding: 4px; }
+.label { color: #555; }
+</style>
+</head>
+<body>
+<h1>УЗИ: $template_name</h1>
+<p><span class="label">Пациент:</span> $patient_name</p>
+<p><span class="label">Дата рождения:</span> $patient_birth_date</p>
+<p><span class="label">Дата исследования:</span> $examination_date</p>
+$fields_table
+<p><span class="label">Заключение:</span> $conclusion</p>
+<p><span class="label">Рекомендации:</span> $recommendations</p>
+<p><span class="label">Врач:</span> $doctor_name</p>
+</body>
+</html>
+"""
+
+# (tekshiruv id, tekshiruv updated_at, bemor updated_at, shifokor updated_at, shablonlar versiyasi, format)
+# -> tayyor hujjat
+DocumentKey = tuple[int, datetime | None, datetime | None, datetime | None, str, str]
+
+document_cache: TTLCache[DocumentKey, bytes] = TTLCache(
+    maxsize=settings.PRINT_CACHE_SIZE,
+    ttl=settings.PRINT_CACHE_TTL_SECONDS,
+)
+
+
+def iter_field_specs(fields: Any) -> Iterator[Mapping[str, Any]]:
+    """Yield the field specs of a ``Template.fields`` config.
+
+    The config may be a list or a dict of groups: every mapping with a
+    ``name`` key and no nested ``fields`` is a field.
+    """
+    if isinstance(fields, Mapping):
+        if isinstance(fields.get("name"), str) and "fields" not in fields:
+            yield fields
+            return
+        for value in fields.values():
+            yield from iter_field_specs(value)
+    elif isinstance(fields, list):
+        for value in fields:
+            yield from iter_field_specs(value)
+
+
+def field_rows(fields: Any, data: Mapping[str, Any]) -> list[tuple[str, str, str]]:
+    """Build ``(label, value, unit)`` rows for the filled-in examination fields.
+
+    Fields described in the template come first, in template order, with
+    their ``label_ru``/``label`` and unit; any other keys follow under their raw name.
+    """
+    rows: list[tuple[str, str, str]] = []
+    seen: set[str] = set()
+    for spec in iter_field_specs(fields):
+        name = spec["name"]
+        value = data.get(name)
+        if name in seen or value is None or value == "":
+            continue
+        seen.add(name)
+        label = spec.get("label_ru") or spec.get("label") or name
+        rows.append((str(label), str(value), str(spec.get("unit") or "")))
+    for name, value in data.items():
+        if name not in seen and value is not None and value != "":
+            rows.append((name, str(value), ""))
+    return rows
+
+
+def render_html(print_template: str | None, context: Mapping[str, Any], rows: Sequence[tuple[str, str, str]]) -> str:
+    """Fill ``$placeholders`` of the print template with HTML-escaped values.
+
+    Besides the keys of `context`, templates may use ``$fields_table`` (all
+    rows as an HTML table). Unknown placeholders are left as they are.
+    """
+    values = {key: html.escape("" if value is None else str(value)) for key, value in context.items()}
+    values["fields_table"] = (
+        '<table class="fields">'
+        + "".join(
+            f"<tr><td>{html.escape(label)}</td><td>{html.escape(value)} {html.escape(unit)}</td></tr>"
+            for label, value, unit in rows
+        )
+        + "</table>"
+    )
+    return string.Template(print_template or DEFAULT_PRINT_TEMPLATE).safe_substitute(values)
+
+
+def render_document(
+    print_template: str | None,
+    context: Mapping[str, Any],
+    rows: Sequence[tuple[str, str, str]],
+    print_format: PrintFormat,
+) -> bytes:
+    """Render one document; runs in a worker process."""
+    document = render_html(print_template, context, rows)
+    if print_format == PrintFormat.PDF:
+        from weasyprint import HTML
+
+        # weasyprint tip annotatsiyasiz; target berilmasa write_pdf() baytlarni qaytaradi
+        pdf: bytes = HTML(string=document).write_pdf()
+        return pdf
+    return document.encode()
+
+
+def ensure_print_available(print_format: PrintFormat) -> None:
+    """Fail early if the format's optional dependency is missing.
+
+    Raises
+    ------
+    BadRequestException
+        If PDF is requested and ``weasyprint`` is not installed.
+    """
+    if print_format == PrintFormat.PDF:
+        try:
+            import weasyprint  # noqa: F401
+        except ImportError as e:
+            raise BadRequestException("PDF rendering requires the 'weasyprint' package; use html") from e
+
+
+def ensure_merge_available() -> None:
+    """Fail early if merging PDF documents is not possible.
+
+    Raises
+    ------
+    BadRequestException
+        If ``weasyprint`` or ``pypdf`` is not installed.
+    """
+    ensure_print_available(PrintFormat.PDF)
+    try:
+        import pypdf  # noqa: F401
+    except ImportError as e:
+        raise BadRequestException("Merging PDF documents requires the 'pypdf' package; use zip output") from e
+
+
+def bundle_zip(documents: Sequence[tuple[str, bytes]]) -> bytes:
+    """Pack ``(file name, content)`` pairs into a ZIP archive."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in documents:
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def merge_pdfs(documents: Sequence[bytes]) -> bytes:
+    """Concatenate PDF documents into one file."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for document in documents:
+        writer.append(io.BytesIO(document))
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+# HTML -> PDF (weasyprint) sof Python va GIL ni ushlab turadi, shuning uchun thread emas, process pool
+_render_executor: ProcessPoolExecutor | None = None
+_render_jobs_in_flight = 0
+
+
+def _get_render_executor() -> ProcessPoolExecutor:
+    global _render_executor
+    if _render_executor is None:
+        # spawn - fork event loop va thread'lari bor jarayondan xavfli
+        _render_executor = ProcessPoolExecutor(
+            max_workers=settings.PRINT_RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _render_executor
+
+
+def shutdown_render_executor() -> None:
+    """Stop the rendering processes (called on application shutdown)."""
+    global _render_executor
+    if _render_executor is not None:
+        _render_executor.shutdown(wait=False, cancel_futures=True)
+        _render_executor = None
+
+
+async def render(
+    print_template: str | None,
+    context: Mapping[str, Any],
+    rows: Sequence[tuple[str, str, str]],
+    print_format: PrintFormat,
+) -> bytes:
+    """Render a document in the worker pool instead of on the event loop.
+
+    At most `PRINT_RENDER_WORKERS + PRINT_RENDER_MAX_QUEUE` documents may be
+    rendering or queued; beyond that the request is rejected with 503.
+    """
+    global _render_jobs_in_flight
+    if _render_jobs_in_flight >= settings.PRINT_RENDER_WORKERS + settings.PRINT_RENDER_MAX_QUEUE:
+        raise ServiceUnavailableException("Server is busy, please try again.")
+
+    _render_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_render_executor(), render_document, print_template, dict(context), list(rows), print_format
+        )
+    finally:
+        _render_jobs_in_flight -= 1
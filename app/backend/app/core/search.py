@@ -0,0 +1,85 @@
+"""
+Search helpers - bemor qidiruvi uchun matnni normallashtirish va transliteratsiya
+
+Uzbek names are written in both Cyrillic and Latin script, so a search query is
+expanded into one variant per script and each variant is matched against the
+stored names.
+"""
+import re
+
+# Telefon bo'yicha qidirish uchun minimal raqamlar soni
+MIN_PHONE_DIGITS = 3
+
+# Apostrof variantlari - hammasi "'" ga keltiriladi (app.models.patient.patient_search_name da ham)
+APOSTROPHE_VARIANTS = "ʻʼ‘’`´"
+
+_APOSTROPHES = str.maketrans(APOSTROPHE_VARIANTS, "'" * len(APOSTROPHE_VARIANTS))
+_WHITESPACE = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D")
+_CYRILLIC = re.compile(r"[а-яёўқғҳ]")
+
+_CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "x", "ц": "ts",
+    "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "'", "ь": "", "ы": "i", "э": "e", "ю": "yu",
+    "я": "ya", "ў": "o'", "қ": "q", "ғ": "g'", "ҳ": "h",
+}  # fmt: skip
+
+# Ikki harfli birikmalar birinchi tekshiriladi
+_LATIN_TO_CYRILLIC = {
+    "o'": "ў", "g'": "ғ", "sh": "ш", "ch": "ч", "yo": "ё", "yu": "ю", "ya": "я", "ye": "е",
+    "ts": "ц", "a": "а", "b": "б", "d": "д", "e": "е", "f": "ф", "g": "г", "h": "ҳ",
+    "i": "и", "j": "ж", "k": "к", "l": "л", "m": "м", "n": "н", "o": "о", "p": "п",
+    "q": "қ", "r": "р", "s": "с", "t": "т", "u": "у", "v": "в", "x": "х", "y": "й",
+    "z": "з", "'": "ъ",
+}  # fmt: skip
+
+
+def normalize_text(value: str) -> str:
+    """Lower-case, unify apostrophe variants and collapse whitespace."""
+    return _WHITESPACE.sub(" ", value.translate(_APOSTROPHES).lower()).strip()
+
+
+def to_latin(value: str) -> str:
+    """Transliterate Uzbek Cyrillic to Uzbek Latin (expects normalized text)."""
+    return "".join(_CYRILLIC_TO_LATIN.get(char, char) for char in value)
+
+
+def to_cyrillic(value: str) -> str:
+    """Transliterate Uzbek Latin to Uzbek Cyrillic (expects normalized text)."""
+    result = []
+    i = 0
+    while i < len(value):
+        pair = value[i : i + 2]
+        if pair in _LATIN_TO_CYRILLIC:
+            result.append(_LATIN_TO_CYRILLIC[pair])
+            i += 2
+        else:
+            result.append(_LATIN_TO_CYRILLIC.get(value[i], value[i]))
+            i += 1
+    return "".join(result)
+
+
+def query_variants(query: str) -> list[str]:
+    """Return the normalized query together with its other-script spelling.
+
+    Examples
+    --------
+    >>> query_variants("Karimov")
+    ['karimov', 'каримов']
+    >>> query_variants("Ғуломов")
+    ['ғуломов', "g'ulomov"]
+    """
+    normalized = normalize_text(query)
+    if not normalized:
+        return []
+    other = to_latin(normalized) if _CYRILLIC.search(normalized) else to_cyrillic(normalized)
+    return [normalized] if other == normalized else [normalized, other]
+
+
+def phone_digits(value: str | None) -> str:
+    """Strip everything except digits, so '+998 (90) 123-45-67' becomes '998901234567'."""
+    if not value:
+        return ""
+    return _NON_DIGITS.sub("", value)
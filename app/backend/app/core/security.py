@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from enum import Enum
-from typing import Any
+from typing import Any, TypeVar
 
 import bcrypt
 import jwt
@@ -10,31 +15,121 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import TokenData
 
+from .cache import TTLCache
 from .config import settings
+from .exceptions import ServiceUnavailableException
 
 SECRET_KEY: SecretStr = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login/access-token")
 
 
+def _load_jwt_keys() -> tuple[Any, Any]:
+    """Prepare the signing and verification keys once, at import time.
+
+    HS* algorithms use `SECRET_KEY` for both; asymmetric algorithms (EdDSA,
+    ES256, RS256, ...) need `JWT_PRIVATE_KEY` and `JWT_PUBLIC_KEY` in PEM format.
+    """
+    algorithm = jwt.algorithms.get_default_algorithms()[ALGORITHM]
+    if ALGORITHM.startswith("HS"):
+        key = algorithm.prepare_key(SECRET_KEY.get_secret_value())
+        return key, key
+
+    if settings.JWT_PRIVATE_KEY is None or settings.JWT_PUBLIC_KEY is None:
+        raise ValueError(f"JWT_PRIVATE_KEY and JWT_PUBLIC_KEY must be set to use {ALGORITHM}")
+    signing_key = algorithm.prepare_key(settings.JWT_PRIVATE_KEY.get_secret_value())
+    verifying_key = algorithm.prepare_key(settings.JWT_PUBLIC_KEY)
+    return signing_key, verifying_key
+
+
+SIGNING_KEY, VERIFYING_KEY = _load_jwt_keys()
+
+# sha256(token) -> (sub, token_type); har bir yozuv token muddati (exp) tugaguncha yashaydi
+token_cache: TTLCache[bytes, tuple[str | None, str | None]] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=0,
+)
+
+
 class TokenType(str, Enum):
     ACCESS = "access"
     REFRESH = "refresh"
 
 
+T = TypeVar("T")
+
+# bcrypt GIL'ni bo'shatadi, shuning uchun thread pool yetarli (process pool shart emas)
+_hash_executor: ThreadPoolExecutor | None = None
+_hash_jobs_in_flight = 0
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the password hashing threads (called on application shutdown)."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def _run_hashing(func: Callable[..., T], *args: Any) -> T:
+    """Run a bcrypt call in the hashing pool instead of on the event loop.
+
+    At most `PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE` jobs may be running
+    or queued; beyond that the request is rejected with 503 so a burst of logins
+    cannot build an unbounded backlog.
+    """
+    global _hash_jobs_in_flight
+    if _hash_jobs_in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise ServiceUnavailableException("Server is busy, please try again.")
+
+    _hash_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_jobs_in_flight -= 1
+
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+
+
+def _hashpw(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    correct_password: bool = bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    correct_password: bool = await _run_hashing(_checkpw, plain_password, hashed_password)
     return correct_password
 
 
-def get_password_hash(password: str) -> str:
-    hashed_password: str = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+async def get_password_hash(password: str) -> str:
+    hashed_password: str = await _run_hashing(_hashpw, password)
     return hashed_password
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if the hash was made with a cost factor other than `BCRYPT_ROUNDS`."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != BCRYPT_ROUNDS
+
+
 async def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -42,7 +137,7 @@ async def create_access_token(data: dict[str, Any], expires_delta: timedelta | N
     else:
         expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire, "token_type": TokenType.ACCESS})
-    encoded_jwt: str = jwt.encode(to_encode, SECRET_KEY.get_secret_value(), algorithm=ALGORITHM)
+    encoded_jwt: str = jwt.encode(to_encode, SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -53,13 +148,39 @@ async def create_refresh_token(data: dict[str, Any], expires_delta: timedelta |
     else:
         expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "token_type": TokenType.REFRESH})
-    encoded_jwt: str = jwt.encode(to_encode, SECRET_KEY.get_secret_value(), algorithm=ALGORITHM)
+    encoded_jwt: str = jwt.encode(to_encode, SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def _decode_token(token: str) -> tuple[str | None, str | None]:
+    """Decode and verify `token`, reusing earlier verifications of the same token.
+
+    Raises
+    ------
+    jwt.PyJWTError
+        If the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = jwt.decode(token, VERIFYING_KEY, algorithms=[ALGORITHM])
+    claims = (payload.get("sub"), payload.get("token_type"))
+    exp = payload.get("exp")
+    if isinstance(exp, int | float):
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(key, claims, ttl=remaining)
+    return claims
+
+
 async def verify_token(token: str, expected_token_type: TokenType, db: AsyncSession) -> TokenData | None:
     """Verify a JWT token and return TokenData if valid.
 
+    Verified tokens are remembered in `token_cache` until they expire, so
+    repeated requests with the same token skip signature verification.
+
     Parameters
     ----------
     token: str
@@ -75,9 +196,7 @@ async def verify_token(token: str, expected_token_type: TokenType, db: AsyncSess
         TokenData instance if the token is valid, None otherwise.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY.get_secret_value(), algorithms=[ALGORITHM])
-        username_or_email: str | None = payload.get("sub")
-        token_type: str | None = payload.get("token_type")
+        username_or_email, token_type = _decode_token(token)
 
         if username_or_email is None or token_type != expected_token_type:
             return None
@@ -1,15 +1,19 @@
 import asyncio
 import logging
+import math
 from collections.abc import AsyncGenerator, Callable
 from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
 from typing import Any
 
 import anyio
 import fastapi
-from fastapi import APIRouter, Depends, FastAPI
+from fastapi import APIRouter, Depends, FastAPI, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from app.api.deps import get_current_superuser
@@ -23,7 +27,12 @@ from .config import (
     EnvironmentSettings,
     settings,
 )
+from .db import PRIMARY_READ_COOKIE, REPLICA_URL, local_read_session
 from .db import async_engine as engine
+from .jobs import stop_job_queues
+from .render import shutdown_render_executor
+from .security import shutdown_hash_executor
+from .templates import start_template_registry, stop_template_registry
 
 
 async def check_database_connection() -> None:
@@ -67,6 +76,18 @@ async def set_threadpool_tokens(number_of_tokens: int = 100) -> None:
     limiter.total_tokens = number_of_tokens
 
 
+async def request_validation_handler(request: Request, exc: Exception) -> JSONResponse:
+    """FastAPI's 422 response that also survives non-finite input values.
+
+    ``json.loads`` accepts ``Infinity`` and ``NaN`` (and ``1e999`` overflows to
+    infinity); the rejected value is echoed back in the error, where strict
+    JSON cannot hold it, so such values are returned as strings.
+    """
+    assert isinstance(exc, RequestValidationError)
+    detail = jsonable_encoder(exc.errors(), custom_encoder={float: lambda x: x if math.isfinite(x) else str(x)})
+    return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"detail": detail})
+
+
 def lifespan_factory(
     settings: DatabaseSettings | AppSettings | CORSSettings | EnvironmentSettings,
 ) -> Callable[[FastAPI], _AsyncGeneratorContextManager[Any]]:
@@ -83,11 +104,17 @@ def lifespan_factory(
 
         if isinstance(settings, DatabaseSettings):
             await check_database_connection()
+            await start_template_registry(local_read_session)
 
         initialization_complete.set()
 
         yield
 
+        await stop_template_registry()
+        await stop_job_queues()
+        shutdown_hash_executor()
+        shutdown_render_executor()
+
     return lifespan
 
 
@@ -115,6 +142,7 @@ def create_application(
 
     application = FastAPI(lifespan=lifespan, **kwargs)
     application.include_router(router)
+    application.add_exception_handler(RequestValidationError, request_validation_handler)
 
     if isinstance(settings, CORSSettings):
         application.add_middleware(
@@ -125,6 +153,22 @@ def create_application(
             allow_headers=settings.CORS_HEADERS,
         )
 
+    if isinstance(settings, DatabaseSettings) and REPLICA_URL:
+
+        @application.middleware("http")
+        async def read_your_writes(request: Request, call_next: Callable[[Request], Any]) -> Response:
+            # Yozgan mijozning keyingi o'qishlari replikaga emas, asosiy bazaga boradi
+            response: Response = await call_next(request)
+            if getattr(request.state, "db_wrote", False):
+                response.set_cookie(
+                    PRIMARY_READ_COOKIE,
+                    "1",
+                    max_age=settings.POSTGRES_READ_YOUR_WRITES_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                )
+            return response
+
     if isinstance(settings, EnvironmentSettings):
         if settings.ENVIRONMENT != EnvironmentOption.PRODUCTION:
             docs_router = APIRouter()
@@ -0,0 +1,102 @@
+"""
+Tabular files - CSV va XLSX fayllarni qatorma-qator (butun faylni xotiraga yuklamasdan) o'qish
+"""
+import codecs
+import csv
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Any, BinaryIO
+
+from .exceptions import BadRequestException
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+def _clean(value: Any) -> Any:
+    """Normalize a cell: blanks become None, integral numbers become digit strings."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.date() if value.time() == datetime.min.time() else value
+    if isinstance(value, date):
+        return value
+    return str(value)
+
+
+def _header(values: list[Any]) -> list[str]:
+    return [str(value).strip().lower() if value is not None else "" for value in values]
+
+
+Row = tuple[int, dict[str, Any]]
+
+
+def iter_csv_rows(file: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[Row]:
+    """Yield ``(line number, row)`` pairs of a CSV file, rows keyed by the lower-cased header.
+
+    The delimiter (comma or semicolon, as Excel writes it for some locales)
+    is detected from the header line.
+    """
+    lines = codecs.iterdecode(file, encoding)
+    first = next(lines, None)
+    if first is None:
+        return
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+
+    def all_lines() -> Iterator[str]:
+        yield first
+        yield from lines
+
+    reader = csv.reader(all_lines(), delimiter=delimiter)
+    header = _header(next(reader))
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        yield reader.line_num, {key: _clean(value) for key, value in zip(header, values, strict=False) if key}
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[Row]:
+    """Yield the rows of the first worksheet of an XLSX file.
+
+    Requires the optional ``openpyxl`` package; the workbook is opened in
+    read-only mode so rows are streamed from the archive.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise BadRequestException("XLSX import requires the 'openpyxl' package; upload a CSV file instead") from e
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = _header(list(next(rows, ())))
+        for row_number, values in enumerate(rows, start=2):
+            if all(value is None or value == "" for value in values):
+                continue
+            yield row_number, {key: _clean(value) for key, value in zip(header, values, strict=False) if key}
+    finally:
+        workbook.close()
+
+
+def iter_rows(file: BinaryIO, filename: str) -> Iterator[Row]:
+    """Pick the reader by file extension.
+
+    Raises
+    ------
+    BadRequestException
+        If the extension is not one of `SUPPORTED_EXTENSIONS`.
+    """
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return iter_csv_rows(file)
+    if name.endswith(".xlsx"):
+        return iter_xlsx_rows(file)
+    raise BadRequestException(f"Unsupported file type, expected one of: {', '.join(SUPPORTED_EXTENSIONS)}")
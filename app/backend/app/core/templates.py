@@ -0,0 +1,154 @@
+"""
+Templates - faol UZI shablonlari reyestri (har bir worker xotirasida)
+"""
+import asyncio
+import hashlib
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import Text, cast, false, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.template import Template
+from app.schemas.template import TEMPLATE_TYPES
+
+from .config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TemplateRegistry:
+    """Active examination templates kept in memory.
+
+    Starts with the built-in `defaults` (so code running without the
+    application lifespan, e.g. management commands, still works); `refresh`
+    overlays the rows of the ``template`` table: active rows add or replace
+    a type, inactive ones hide it.
+
+    Every gunicorn worker keeps its own copy. `poll` compares a version
+    query (a hash of the whole table's rows) with the loaded one and reloads
+    only when the table changed, so edits reach all workers within one poll
+    interval. The hash is computed from the row contents rather than
+    ``updated_at``, which only the ORM sets: templates are also edited with
+    plain SQL.
+
+    Parameters
+    ----------
+    defaults : Mapping[str, Mapping[str, Any]]
+        Built-in template types, ``code -> {"name", "name_ru", "category"}``.
+
+    Examples
+    --------
+    >>> registry = TemplateRegistry(TEMPLATE_TYPES)
+    >>> "thyroid" in registry
+    True
+    >>> registry.name_ru("thyroid")
+    'Щитовидная железа'
+    """
+
+    def __init__(self, defaults: Mapping[str, Mapping[str, Any]]) -> None:
+        self._defaults = {code: dict(info) for code, info in defaults.items()}
+        self.types: dict[str, dict[str, Any]] = dict(self._defaults)
+        self._templates: dict[str, Template] = {}
+        self.version = "defaults"
+        self.etag = self._etag(self.version)
+
+    @staticmethod
+    def _etag(version: str) -> str:
+        return f'"{hashlib.sha1(version.encode()).hexdigest()[:16]}"'
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.types
+
+    def get(self, code: str) -> Template | None:
+        """Database row of an active template, if the type has one."""
+        return self._templates.get(code)
+
+    def name_ru(self, code: str) -> str:
+        """Display name of a template type, falling back to the code itself."""
+        name: str = self.types.get(code, {}).get("name_ru", code)
+        return name
+
+    async def _current_version(self, db: AsyncSession) -> str:
+        # md5(string_agg(template::text ORDER BY id)) - har qanday ustundagi o'zgarish versiyani
+        # o'zgartiradi. O'chirilgan / nofaol qatorlar ham hisobga olinadi - ular ham turlar
+        # ro'yxatini o'zgartiradi
+        row_text = cast(literal_column(Template.__tablename__), Text)
+        digest = await db.scalar(
+            select(func.md5(func.string_agg(row_text, aggregate_order_by(literal(","), Template.id))))
+            .select_from(Template)
+        )
+        return digest or "empty"
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Reload all templates from the database."""
+        version = await self._current_version(db)
+        result = await db.execute(
+            select(Template)
+            .where(Template.is_deleted == false())
+            .order_by(Template.sort_order, Template.code)
+        )
+        rows = result.scalars().all()
+
+        types = dict(self._defaults)
+        templates: dict[str, Template] = {}
+        for template in rows:
+            if template.is_active is not True:
+                types.pop(template.code, None)
+                continue
+            templates[template.code] = template
+            types[template.code] = {
+                "name": template.name,
+                "name_ru": template.name_ru,
+                "category": template.category,
+                "sort_order": template.sort_order,
+                "fields": template.fields,
+                "conclusion_templates": template.conclusion_templates,
+                "recommendation_templates": template.recommendation_templates,
+            }
+        # Almashtirish bir vaqtda - o'quvchilar hech qachon yarim yangilangan holatni ko'rmaydi
+        self.types, self._templates = types, templates
+        self.version, self.etag = version, self._etag(version)
+
+    async def poll(self, db: AsyncSession) -> bool:
+        """Reload if the table changed since the last refresh; return whether it did."""
+        if await self._current_version(db) == self.version:
+            return False
+        await self.refresh(db)
+        return True
+
+
+template_registry = TemplateRegistry(TEMPLATE_TYPES)
+
+_poll_task: asyncio.Task[None] | None = None
+
+
+async def _poll_templates(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    while True:
+        await asyncio.sleep(settings.TEMPLATE_REFRESH_SECONDS)
+        try:
+            async with session_factory() as db:
+                if await template_registry.poll(db):
+                    LOGGER.info(f"Templates reloaded, version {template_registry.version}")
+        except Exception:
+            LOGGER.exception("Template registry refresh failed")
+
+
+async def start_template_registry(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Load the templates and start polling for changes (called on application startup)."""
+    global _poll_task
+    async with session_factory() as db:
+        await template_registry.refresh(db)
+    if settings.TEMPLATE_REFRESH_SECONDS > 0 and _poll_task is None:
+        _poll_task = asyncio.create_task(_poll_templates(session_factory), name="template-registry-poll")
+
+
+async def stop_template_registry() -> None:
+    """Stop polling for template changes (called on application shutdown)."""
+    global _poll_task
+    if _poll_task is not None:
+        _poll_task.cancel()
+        await asyncio.gather(_poll_task, return_exceptions=True)
+        _poll_task = None
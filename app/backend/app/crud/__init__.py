@@ -1,5 +1,7 @@
+from .analytics import crud_analytics
 from .examination import crud_examination
 from .patient import crud_patient
+from .print_job import crud_print_job
 from .users import crud_users
 
-__all__ = ["crud_users", "crud_patient", "crud_examination"]
+__all__ = ["crud_users", "crud_patient", "crud_examination", "crud_print_job", "crud_analytics"]
@@ -0,0 +1,178 @@
+"""
+Analytics CRUD operations - examination_data o'lchovlari bo'yicha analitik so'rovlar
+
+AnalyticsQuery (o'lchov, agregatsiyalar, guruhlash, filtrlar) bitta
+GROUP BY so'roviga aylantiriladi. O'lchov JSONB yo'l ifodasi bilan o'qiladi
+(app.models.examination.examination_measurement); HOT_MEASUREMENTS dagi
+o'lchovlar uchun shu ifoda bo'yicha qisman indekslar bor.
+
+Guruhlash ifodalaridagi konstantalar literal bo'lib yoziladi: bind parametr
+bo'lsa SELECT va GROUP BY dagi ifodalar PostgreSQL uchun har xil bo'lib qoladi.
+Foydalanuvchi bergan bucket_width esa bind parametr - bitta BindParameter
+obyekti ikkala joyda ham bir xil parametr ($1) bo'lib yoziladi.
+"""
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Date, Float, Integer, Select, bindparam, cast, extract, false, func, literal_column, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.examination import HOT_MEASUREMENTS, Examination, examination_measurement
+from app.models.patient import Patient
+from app.schemas.analytics import PATIENT_DIMENSIONS, AnalyticsMetric, AnalyticsQuery, AnalyticsResult
+
+PERCENTILES = {"p10": 0.1, "p25": 0.25, "median": 0.5, "p75": 0.75, "p90": 0.9}
+
+SIMPLE_AGGREGATES: dict[str, Callable[[ColumnElement[float]], ColumnElement[Any]]] = {
+    "avg": func.avg, "min": func.min, "max": func.max, "sum": func.sum, "stddev": func.stddev_samp,
+}
+
+PERIODS = ("day", "week", "month", "quarter", "year")
+
+
+def _age() -> ColumnElement[Any]:
+    # Tekshiruv kunidagi to'liq yillar
+    return extract("year", func.age(Examination.examination_date, Patient.birth_date))
+
+
+def _dimension(name: str, query: AnalyticsQuery, value: ColumnElement[float] | None) -> ColumnElement[Any]:
+    if name == "template_type":
+        return Examination.template_type.expression
+    if name == "status":
+        return Examination.status.expression
+    if name == "doctor":
+        return Examination.doctor_id.expression
+    if name == "gender":
+        return Patient.gender.expression
+    if name == "age_band":
+        band = literal_column(str(query.age_band_years), Integer)
+        return cast(func.floor(_age() / band) * band, Integer)
+    if name in PERIODS:
+        return cast(func.date_trunc(literal_column(f"'{name}'"), Examination.examination_date), Date)
+    if name == "value" and value is not None and query.bucket_width is not None:
+        width = bindparam("bucket_width", query.bucket_width, type_=Float)
+        return func.floor(value / width) * width
+    if name == "abnormal" and query.metric is not None:
+        return Examination.abnormal_fields.op("->>")(literal_column(f"'{query.metric}'"))
+    raise ValueError(f"Unsupported dimension: {name}")
+
+
+def _aggregate(name: str, value: ColumnElement[float] | None) -> ColumnElement[Any]:
+    if name == "count":
+        return func.count(value) if value is not None else func.count()
+    if value is None:
+        raise ValueError(f"Aggregation {name} needs a metric")
+    if name in PERCENTILES:
+        return func.percentile_cont(PERCENTILES[name]).within_group(value)
+    return SIMPLE_AGGREGATES[name](value)
+
+
+def _filters(query: AnalyticsQuery, value: ColumnElement[float] | None) -> list[ColumnElement[bool]]:
+    filters: list[ColumnElement[bool]] = [Examination.is_deleted == false()]
+    if value is not None:
+        # Ifoda indekslarining sharti (WHERE ... IS NOT NULL) bilan bir xil
+        filters.append(value.is_not(None))
+    if query.template_types:
+        filters.append(Examination.template_type.in_(query.template_types))
+    if query.date_from:
+        filters.append(Examination.examination_date >= query.date_from)
+    if query.date_to:
+        filters.append(Examination.examination_date <= query.date_to)
+    if query.status:
+        filters.append(Examination.status == query.status)
+    if query.doctor_id:
+        filters.append(Examination.doctor_id == query.doctor_id)
+    if query.gender:
+        filters.append(Patient.gender == query.gender)
+    if query.age_min is not None:
+        filters.append(_age() >= query.age_min)
+    if query.age_max is not None:
+        filters.append(_age() <= query.age_max)
+    if query.abnormal_only and query.metric:
+        filters.append(Examination.abnormal_fields.has_key(query.metric))
+    return filters
+
+
+def build_query(query: AnalyticsQuery) -> Select[Any]:
+    """AnalyticsQuery -> SELECT ... GROUP BY (limit + 1 qator, kesilganini aniqlash uchun)"""
+    value = examination_measurement(query.metric) if query.metric else None
+    dimensions = [_dimension(name, query, value) for name in query.group_by]
+    stmt = (
+        select(
+            *(dimension.label(name) for name, dimension in zip(query.group_by, dimensions, strict=True)),
+            *(_aggregate(name, value).label(name) for name in query.aggregations),
+        )
+        .select_from(Examination)
+        .where(*_filters(query, value))
+        .limit(query.limit + 1)
+    )
+    if PATIENT_DIMENSIONS.intersection(query.group_by) or query.gender or (
+        query.age_min is not None or query.age_max is not None
+    ):
+        stmt = stmt.join(Patient, Examination.patient_id == Patient.id)
+    if dimensions:
+        stmt = stmt.group_by(*dimensions).order_by(*dimensions)
+    return stmt
+
+
+class CRUDAnalytics:
+    """
+    Analitik so'rovlar - tekshiruvlar o'lchovlari bo'yicha
+
+    Model bilan bog'liq CRUD emas, shuning uchun BaseCRUD ishlatilmaydi.
+    """
+
+    async def run(
+        self,
+        db: AsyncSession,
+        query: AnalyticsQuery
+    ) -> AnalyticsResult:
+        """Analitik so'rovni bajarish - bitta SELECT ... GROUP BY"""
+        result = await db.execute(build_query(query))
+        rows = [dict(row._mapping) for row in result.all()]
+        return AnalyticsResult(
+            metric=query.metric,
+            group_by=list(query.group_by),
+            aggregations=list(query.aggregations),
+            indexed=query.metric in HOT_MEASUREMENTS,
+            rows=rows[:query.limit],
+            truncated=len(rows) > query.limit,
+        )
+
+    async def get_metrics(
+        self,
+        db: AsyncSession,
+        template_type: str,
+        limit: int = 200
+    ) -> list[AnalyticsMetric]:
+        """
+        Shablon turi tekshiruvlaridagi son o'lchovlar (yuqori darajadagi kalitlar)
+
+        Shu turdagi barcha tekshiruvlarni ko'rib chiqadi (jsonb_each), shuning
+        uchun natijani UI keshlashi kerak.
+        """
+        entry = func.jsonb_each(Examination.examination_data).table_valued("key", "value")
+        examination_count = func.count().label("examination_count")
+        stmt = (
+            select(entry.c.key, examination_count)
+            .select_from(Examination)
+            .join(entry, true())
+            .where(
+                Examination.is_deleted == false(),
+                Examination.template_type == template_type,
+                func.jsonb_typeof(entry.c.value) == "number",
+            )
+            .group_by(entry.c.key)
+            .order_by(examination_count.desc(), entry.c.key)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return [
+            AnalyticsMetric(metric=key, examination_count=count, indexed=key in HOT_MEASUREMENTS)
+            for key, count in result.all()
+        ]
+
+
+# Singleton instance
+crud_analytics = CRUDAnalytics()
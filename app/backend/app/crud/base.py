@@ -1,15 +1,57 @@
-from collections.abc import Sequence
+import dataclasses
+from collections.abc import Callable, Collection, Mapping, Sequence
 from datetime import UTC, datetime
+from functools import cache
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, delete, false, func, insert, inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import Select
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import ColumnElement, Select
 
 from app.models.base import BaseModel
 
+from .pagination import CountMode, paginate
+
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# Rows per statement in the batch methods (get_many, create_many); keeps
+# every statement well below PostgreSQL's 32767 bind parameter limit.
+BULK_CHUNK_SIZE = 1000
+
+
+def _chunks(items: Sequence[Any], size: int) -> list[Sequence[Any]]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+@cache
+def _default_factories(model: type[BaseModel]) -> dict[str, Callable[[], Any]]:
+    """Dataclass ``default_factory`` of a model's columns, keyed by attribute name.
+
+    The model constructor would call these; column ``default=`` values are
+    applied by the INSERT itself.
+    """
+    columns = {attribute.key for attribute in inspect(model).column_attrs}
+    return {
+        field.name: field.default_factory
+        for field in dataclasses.fields(model)
+        if field.name in columns and field.default_factory is not dataclasses.MISSING
+    }
+
+
+async def commit_or_flush(db: AsyncSession, commit: bool) -> None:
+    """Finish a CRUD write.
+
+    With ``commit=False`` the caller owns the transaction (e.g. a route's
+    `app.api.deps.SessionDep`, committed once per request): changes are only
+    flushed, so generated ids and constraint errors surface immediately, and
+    are committed or rolled back together with the rest of the request.
+    """
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+
 
 class BaseCRUD(Generic[ModelType]):
     """Base class for CRUD operations on SQLAlchemy models.
@@ -76,9 +118,25 @@ class BaseCRUD(Generic[ModelType]):
         query = select(self.model)
         if options:
             query = query.options(*options)
-        for field, value in kwargs.items():
-            query = query.where(getattr(self.model, field) == value)
-        return query
+        return query.where(*self._where(**kwargs))
+
+    def _where(self, **kwargs: Any) -> list[ColumnElement[bool]]:
+        """Turn field-value pairs into WHERE criteria.
+
+        A list, tuple or set value matches any of its items (``IN``).
+        """
+        return [
+            getattr(self.model, field).in_(value)
+            if isinstance(value, list | tuple | set | frozenset)
+            else getattr(self.model, field) == value
+            for field, value in kwargs.items()
+        ]
+
+    def _bulk_filter(self, kwargs: Mapping[str, Any]) -> list[ColumnElement[bool]]:
+        """WHERE criteria of a set-based write; refuses an empty filter."""
+        if not kwargs:
+            raise ValueError(f"{type(self).__name__}: a bulk write needs at least one filter")
+        return self._where(**kwargs)
 
     async def get(
         self,
@@ -112,16 +170,63 @@ class BaseCRUD(Generic[ModelType]):
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_many(
+        self,
+        db: AsyncSession,
+        ids: Collection[int],
+        options: Sequence[Any] | None = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> list[ModelType]:
+        """Fetch the records with the given IDs, one ``SELECT ... WHERE id IN`` per chunk.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        ids : Collection[int]
+            Record IDs; duplicates are ignored.
+        options : Sequence[Any] | None, default=None
+            SQLAlchemy loading options (e.g., selectinload).
+        chunk_size : int, default=BULK_CHUNK_SIZE
+            Maximum number of IDs per statement.
+        **kwargs : Any
+            Additional field-value pairs to filter by.
+
+        Returns
+        -------
+        list[ModelType]
+            The matching records ordered by ID. Missing IDs are simply absent.
+
+        Examples
+        --------
+        >>> users = await crud.get_many(db, [1, 2, 3], is_deleted=False)
+        """
+        records: list[ModelType] = []
+        for chunk in _chunks(sorted(set(ids)), chunk_size):
+            query = select(self.model).where(*self._where(id=list(chunk), **kwargs)).order_by(self.model.id)
+            if options:
+                query = query.options(*options)
+            records.extend(await db.scalars(query))
+        return records
+
     async def get_multi(
         self,
         db: AsyncSession,
         offset: int = 0,
         limit: int = 100,
         options: Sequence[Any] | None = None,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT,
+        columns: Sequence[str] | None = None,
         **kwargs: Any,
     ) -> dict[str, Any]:
         """Fetch multiple records with pagination.
 
+        Records are ordered by `id`. Passing a `cursor` switches to keyset
+        pagination: `offset` is ignored and the page starts right after the
+        record the cursor was issued for, so deep pages cost the same as the first.
+
         Parameters
         ----------
         db : AsyncSession
@@ -132,13 +237,24 @@ class BaseCRUD(Generic[ModelType]):
             Maximum number of records to return.
         options : Sequence[Any] | None, default=None
             SQLAlchemy loading options (e.g., selectinload).
+        cursor : str | None, default=None
+            Opaque cursor taken from a previous result's 'next_cursor'.
+        count_mode : CountMode, default=CountMode.EXACT
+            How 'total_count' is computed (see `app.crud.pagination.CountMode`).
+            `estimated` only applies when no filters are given.
+        columns : Sequence[str] | None, default=None
+            Names of the model attributes to load. Other columns are not
+            selected, and accessing them on the returned records raises
+            instead of issuing a query per record. The primary key is always loaded.
         **kwargs : Any
             Field-value pairs to filter by.
 
         Returns
         -------
         dict[str, Any]
-            Dictionary containing 'data' (list of records) and 'total_count'.
+            Dictionary containing 'data' (list of records), 'total_count',
+            'next_cursor' (None on the last page) and 'count_mode' (the
+            count strategy actually used).
 
         Examples
         --------
@@ -146,23 +262,33 @@ class BaseCRUD(Generic[ModelType]):
         >>> result = await crud.get_multi(db, offset=0, limit=10, options=[selectinload(User.items)])
         >>> users = result['data']
         >>> total = result['total_count']
+        >>> next_page = await crud.get_multi(db, limit=10, cursor=result['next_cursor'])
+        >>> result = await crud.get_multi(db, limit=10, columns=["username", "phone"])
         """
-        # Build the filtered query (without options for count)
-        query = self._build_query(**kwargs)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total_count = total_result.scalar_one()
-
-        # Get paginated data with options
-        data_query = query.offset(offset).limit(limit)
-        if options:
-            data_query = data_query.options(*options)
-        result = await db.execute(data_query)
-        data = result.scalars().all()
+        if columns:
+            only = load_only(*(getattr(self.model, name) for name in columns), raiseload=True)
+            options = [*(options or ()), only]
 
-        return {"data": data, "total_count": total_count}
+        query = self._build_query(**kwargs)
+        page = await paginate(
+            db,
+            query,
+            keyset=(self.model.id,),
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            descending=False,
+            count_mode=count_mode,
+            estimate_table=None if kwargs else self.model.__tablename__,
+            options=options,
+        )
+
+        return {
+            "data": page.items,
+            "total_count": page.total,
+            "next_cursor": page.next_cursor,
+            "count_mode": page.count_mode,
+        }
 
     async def exists(
         self,
@@ -219,27 +345,195 @@ class BaseCRUD(Generic[ModelType]):
         result = await db.execute(count_query)
         return result.scalar_one()
 
+    async def get_changed_at(
+        self,
+        db: AsyncSession,
+        id: int,
+    ) -> datetime | None:
+        """Fetch when a record last changed, without loading the record.
+
+        A cheap probe for conditional GETs (see `app.core.conditional`):
+        one indexed single-column lookup instead of the full row and relations.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        id : int
+            The record ID.
+
+        Returns
+        -------
+        datetime | None
+            ``updated_at``, or ``created_at`` for a record never updated;
+            None if the record does not exist or is soft-deleted.
+
+        Examples
+        --------
+        >>> changed_at = await crud.get_changed_at(db, id=5)
+        """
+        result = await db.execute(
+            select(func.coalesce(self.model.updated_at, self.model.created_at)).where(
+                self.model.id == id, self.model.is_deleted == false()
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        rows: Sequence[Mapping[str, Any]],
+        commit: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> list[ModelType]:
+        """Insert records in multi-row ``INSERT ... RETURNING`` statements.
+
+        Rows are plain column dicts: missing keys get the model's dataclass
+        ``default_factory`` values here and column ``default=`` values from
+        the INSERT, as for a single insert. Every chunk is sent as one ORM
+        bulk INSERT returning the new records.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        rows : Sequence[Mapping[str, Any]]
+            Constructor arguments of the new records. All rows should set the
+            same keys, otherwise a chunk is split into several statements.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work, see `commit_or_flush`).
+        chunk_size : int, default=BULK_CHUNK_SIZE
+            Maximum number of rows per statement.
+
+        Returns
+        -------
+        list[ModelType]
+            The new records, in the order of `rows`.
+
+        Examples
+        --------
+        >>> items = await crud.create_many(db, [{"name": "a"}, {"name": "b"}])
+        """
+        factories = _default_factories(self.model)
+        records: list[ModelType] = []
+        for chunk in _chunks(rows, chunk_size):
+            params = [
+                {**{key: make() for key, make in factories.items() if key not in row}, **row}
+                for row in chunk
+            ]
+            result = await db.scalars(insert(self.model).returning(self.model, sort_by_parameter_order=True), params)
+            records.extend(result.all())
+        await commit_or_flush(db, commit)
+        return records
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        values: Mapping[str, Any],
+        commit: bool = True,
+        **kwargs: Any,
+    ) -> int:
+        """Update all live matching records in one ``UPDATE`` statement.
+
+        The records are not loaded; ``updated_at`` is set by the model's
+        ``onupdate``. Soft-deleted records are left untouched.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        values : Mapping[str, Any]
+            Column values to set.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work, see `commit_or_flush`).
+        **kwargs : Any
+            Field-value pairs selecting the records; at least one is required.
+            Lists match any of their items, e.g. ``id=[1, 2, 3]``.
+
+        Returns
+        -------
+        int
+            Number of records updated.
+
+        Raises
+        ------
+        ValueError
+            If no filter is given.
+
+        Examples
+        --------
+        >>> updated = await crud.update_many(db, {"is_active": False}, id=[4, 8, 15])
+        """
+        result = await db.execute(
+            update(self.model)
+            .where(*self._bulk_filter(kwargs), self.model.is_deleted == false())
+            .values(**values)
+            .returning(self.model.id)
+        )
+        updated = len(result.all())
+        await commit_or_flush(db, commit)
+        return updated
+
+    async def _soft_delete(
+        self,
+        db: AsyncSession,
+        *returning: Any,
+        **kwargs: Any,
+    ) -> Sequence[Row[Any]]:
+        """Mark live matching records deleted in one ``UPDATE ... RETURNING``; does not commit.
+
+        Returns one row of `returning` columns (default: ``id``) per record
+        actually deleted, so subclasses can keep derived data in sync without
+        loading the records first.
+        """
+        result = await db.execute(
+            update(self.model)
+            .where(*self._bulk_filter(kwargs), self.model.is_deleted == false())
+            .values(is_deleted=True, deleted_at=datetime.now(UTC))
+            .returning(*(returning or (self.model.id,)))
+        )
+        return result.all()
+
+    async def _hard_delete(
+        self,
+        db: AsyncSession,
+        *returning: Any,
+        **kwargs: Any,
+    ) -> Sequence[Row[Any]]:
+        """Remove matching records in one ``DELETE ... RETURNING``; does not commit."""
+        result = await db.execute(
+            delete(self.model)
+            .where(*self._bulk_filter(kwargs))
+            .returning(*(returning or (self.model.id,)))
+        )
+        return result.all()
+
     async def delete(
         self,
         db: AsyncSession,
+        commit: bool = True,
         **kwargs: Any,
     ) -> bool:
         """Soft delete a record (sets is_deleted=True, deleted_at=now).
 
         This method requires the model to inherit from BaseModel,
-        which provides the soft-delete fields.
+        which provides the soft-delete fields. It is a single conditional
+        ``UPDATE ... WHERE ... AND is_deleted = false RETURNING id``;
+        the record is not loaded first.
 
         Parameters
         ----------
         db : AsyncSession
             The database session.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work, see `commit_or_flush`).
         **kwargs : Any
             Field-value pairs to identify the record to delete.
 
         Returns
         -------
         bool
-            True if a record was deleted, False if not found.
+            True if a record was deleted, False if not found or already deleted.
 
         Notes
         -----
@@ -251,28 +545,63 @@ class BaseCRUD(Generic[ModelType]):
         >>> deleted = await crud.delete(db, username="john")
         >>> # User still exists in DB but is_deleted=True
         """
-        record = await self.get(db, **kwargs)
-        if record is None:
-            return False
+        return await self.delete_many(db, commit=commit, **kwargs) > 0
 
-        record.is_deleted = True
-        record.deleted_at = datetime.now(UTC)
-        db.add(record)
-        await db.commit()
-        await db.refresh(record)
-        return True
+    async def delete_many(
+        self,
+        db: AsyncSession,
+        commit: bool = True,
+        **kwargs: Any,
+    ) -> int:
+        """Soft delete all live matching records in one ``UPDATE ... RETURNING``.
+
+        `delete()` delegates here, so subclasses that keep derived data in
+        sync (caches, aggregates) override this method only.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work, see `commit_or_flush`).
+        **kwargs : Any
+            Field-value pairs selecting the records; at least one is required.
+            Lists match any of their items, e.g. ``id=[1, 2, 3]``.
+
+        Returns
+        -------
+        int
+            Number of records deleted (already deleted ones are not counted).
+
+        Raises
+        ------
+        ValueError
+            If no filter is given.
+
+        Examples
+        --------
+        >>> deleted = await crud.delete_many(db, id=[4, 8, 15])
+        """
+        deleted = await self._soft_delete(db, **kwargs)
+        await commit_or_flush(db, commit)
+        return len(deleted)
 
     async def db_delete(
         self,
         db: AsyncSession,
+        commit: bool = True,
         **kwargs: Any,
     ) -> bool:
         """Hard delete a record (removes from database).
 
+        A single ``DELETE ... RETURNING id``; the record is not loaded first.
+
         Parameters
         ----------
         db : AsyncSession
             The database session.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work, see `commit_or_flush`).
         **kwargs : Any
             Field-value pairs to identify the record to delete.
 
@@ -285,10 +614,41 @@ class BaseCRUD(Generic[ModelType]):
         --------
         >>> deleted = await crud.db_delete(db, id=123)
         """
-        record = await self.get(db, **kwargs)
-        if record is None:
-            return False
+        return await self.db_delete_many(db, commit=commit, **kwargs) > 0
 
-        await db.delete(record)
-        await db.commit()
-        return True
+    async def db_delete_many(
+        self,
+        db: AsyncSession,
+        commit: bool = True,
+        **kwargs: Any,
+    ) -> int:
+        """Hard delete all matching records in one ``DELETE ... RETURNING``.
+
+        `db_delete()` delegates here, like `delete()` does to `delete_many()`.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work, see `commit_or_flush`).
+        **kwargs : Any
+            Field-value pairs selecting the records; at least one is required.
+
+        Returns
+        -------
+        int
+            Number of records deleted.
+
+        Raises
+        ------
+        ValueError
+            If no filter is given.
+
+        Examples
+        --------
+        >>> deleted = await crud.db_delete_many(db, is_deleted=True)
+        """
+        deleted = await self._hard_delete(db, **kwargs)
+        await commit_or_flush(db, commit)
+        return len(deleted)
@@ -1,18 +1,154 @@
 """
 Examination CRUD operations - UZI tekshiruv ma'lumotlari uchun CRUD operatsiyalari
 """
-from collections.abc import Sequence
-from datetime import date
+from collections import Counter
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import date, datetime
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, and_, false, func, or_, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.sql.elements import ColumnElement
 
+from app.core.export import EXPORT_BATCH_SIZE, column_types
+from app.core.measurements import validate_examination_data
 from app.models.examination import Examination
+from app.models.examination_stat import ExaminationDailyStat
+from app.models.patient import Patient
+from app.models.user import User
 from app.schemas.examination import ExaminationCreate, ExaminationUpdate
 
-from .base import BaseCRUD
+from .base import BULK_CHUNK_SIZE, BaseCRUD, commit_or_flush
+from .pagination import CountMode, Page, count_rows, paginate
+
+# Jurnal tartibi - search() va get_by_patient() uchun keyset ustunlari (hammasi DESC)
+SEARCH_KEYSET = (Examination.examination_date, Examination.created_at, Examination.id)
+
+# ExaminationList uchun kerakli ustunlar - examination_data (JSONB) va matn maydonlari kirmaydi
+LIST_MODEL_COLUMNS = (
+    Examination.id,
+    Examination.patient_id,
+    Examination.examination_date,
+    Examination.template_type,
+    Examination.status,
+    Examination.created_at,
+)
+
+# ORM ro'yxat so'rovlari uchun: yuklanmagan maydonga murojaat har bir qator uchun so'rov emas, xato beradi
+LIST_LOAD_ONLY = load_only(*LIST_MODEL_COLUMNS, raiseload=True)
+
+# ORM ro'yxat so'rovlarida bemor - alohida SELECT ... IN (...) o'rniga JOIN bilan, faqat kerakli ustunlar
+LIST_PATIENT_LOAD = joinedload(Examination.patient).load_only(
+    Patient.last_name, Patient.first_name, Patient.middle_name, Patient.phone, Patient.birth_date
+)
+
+# ExaminationList qatorlari - bemor F.I.Sh. SQL da birlashtiriladi (bo'sh otasining ismi tashlab ketiladi)
+LIST_COLUMNS = (
+    *LIST_MODEL_COLUMNS,
+    func.nullif(
+        func.concat_ws(" ", Patient.last_name, Patient.first_name, func.nullif(Patient.middle_name, "")), ""
+    ).label("patient_name"),
+    Patient.phone.label("patient_phone"),
+    Patient.birth_date.label("patient_birth_date"),
+)
+
+
+def _list_select() -> Select[Any]:
+    # LEFT JOIN - COUNT(*) da PostgreSQL uni olib tashlay oladi
+    return select(*LIST_COLUMNS).outerjoin(Patient, Examination.patient_id == Patient.id)
+
+
+# Eksport ustunlari - ro'yxat ustunlari + shifokor, matn maydonlari va examination_data
+EXPORT_COLUMNS = (
+    *LIST_COLUMNS,
+    Examination.doctor_id,
+    func.concat_ws(" ", User.last_name, User.first_name).label("doctor_name"),
+    Examination.conclusion,
+    Examination.recommendations,
+    Examination.notes,
+    Examination.updated_at,
+    Examination.examination_data,
+)
+
+# Yoyilgan examination_data ustunlari nomi: data_<kalit>
+EXPORT_DATA_PREFIX = "data_"
+
+# jsonb_typeof() -> ustun turi (boshqa yoki aralash turlar matn sifatida yoziladi)
+JSONB_TYPES: dict[str, type] = {"number": float, "boolean": bool, "string": str}
+
+
+def _export_select() -> Select[Any]:
+    return (
+        select(*EXPORT_COLUMNS)
+        .outerjoin(Patient, Examination.patient_id == Patient.id)
+        .outerjoin(User, Examination.doctor_id == User.id)
+    )
+
+
+# Kunlik yig'ma kaliti: (sana, shablon turi, holat, shifokor)
+StatKey = tuple[date, str, str, int]
+
+# _stat_key() bilan bir xil tartibda - RETURNING orqali yig'ma kalitini olish uchun
+STAT_COLUMNS = (Examination.examination_date, Examination.template_type, Examination.status, Examination.doctor_id)
+STAT_FIELDS = frozenset(column.key for column in STAT_COLUMNS)
+
+
+# Shablon bo'yicha tekshiriladigan maydonlar - biri o'zgarsa examination_data qayta tekshiriladi
+DATA_FIELDS = frozenset({"template_type", "examination_data"})
+
+
+def _assign(examination: Examination, values: Mapping[str, Any]) -> None:
+    """Qiymatlarni tekshiruvga yozish; examination_data amaldagi (yangi) shablon bo'yicha qayta tekshiriladi"""
+    values = dict(values)
+    if DATA_FIELDS.intersection(values):
+        template_type = values.get("template_type") or examination.template_type
+        data = values.get("examination_data")
+        values["examination_data"], values["abnormal_fields"] = validate_examination_data(
+            template_type, examination.examination_data if data is None else data
+        )
+    for field, value in values.items():
+        setattr(examination, field, value)
+
+
+def _stat_key(examination: Examination) -> StatKey:
+    return (examination.examination_date, examination.template_type, examination.status, examination.doctor_id)
+
+
+async def _apply_stat_deltas(db: AsyncSession, deltas: Mapping[StatKey, int]) -> None:
+    """Kunlik yig'madagi sonlarni bitta INSERT ... ON CONFLICT bilan o'zgartirish (commit qilinmaydi)"""
+    values = [
+        {
+            "stat_date": stat_date,
+            "template_type": template_type,
+            "status": status,
+            "doctor_id": doctor_id,
+            "examination_count": delta,
+        }
+        for (stat_date, template_type, status, doctor_id), delta in deltas.items()
+        if delta
+    ]
+    if not values:
+        return
+    stmt = insert(ExaminationDailyStat).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["stat_date", "template_type", "status", "doctor_id"],
+        set_={"examination_count": ExaminationDailyStat.examination_count + stmt.excluded.examination_count},
+    )
+    await db.execute(stmt)
+
+
+async def _shift_daily_stat(db: AsyncSession, old_key: StatKey | None, new_key: StatKey | None) -> None:
+    """Bitta tekshiruvni kunlik yig'mada old_key dan new_key ga ko'chirish (commit qilinmaydi)"""
+    if old_key == new_key:
+        return
+    deltas: Counter[StatKey] = Counter()
+    if old_key is not None:
+        deltas[old_key] -= 1
+    if new_key is not None:
+        deltas[new_key] += 1
+    await _apply_stat_deltas(db, deltas)
 
 
 class CRUDExamination(BaseCRUD[Examination]):
@@ -22,81 +158,238 @@ class CRUDExamination(BaseCRUD[Examination]):
         self,
         db: AsyncSession,
         examination_in: ExaminationCreate,
-        doctor_id: int
+        doctor_id: int,
+        commit: bool = True
     ) -> Examination:
-        """Yangi tekshiruv yaratish"""
+        """Yangi tekshiruv yaratish (examination_data shablon bo'yicha tekshiriladi va normallashtiriladi)"""
+        data, abnormal = validate_examination_data(examination_in.template_type, examination_in.examination_data)
         examination = Examination(
-            **examination_in.model_dump(),
+            **examination_in.model_dump(exclude={"examination_data"}),
+            examination_data=data,
+            abnormal_fields=abnormal,
             doctor_id=doctor_id
         )
         db.add(examination)
-        await db.commit()
-        await db.refresh(examination)
+        await _shift_daily_stat(db, None, _stat_key(examination))
+        # id INSERT ... RETURNING dan, qolgan qiymatlar Python tomonida - qayta o'qish shart emas
+        await commit_or_flush(db, commit)
         return examination
 
     async def update(
         self,
         db: AsyncSession,
         examination: Examination,
-        examination_in: ExaminationUpdate
+        examination_in: ExaminationUpdate,
+        commit: bool = True
     ) -> Examination:
-        """Tekshiruv ma'lumotlarini yangilash"""
-        update_data = examination_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(examination, field, value)
-        await db.commit()
-        await db.refresh(examination)
+        """
+        Tekshiruv ma'lumotlarini yangilash (examination_data shablon bo'yicha tekshiriladi)
+
+        examination get_by_id(for_update=True) bilan yuklangan bo'lishi kerak:
+        kunlik yig'madagi eski kalit shu qatordan olinadi, qulfsiz ikki parallel
+        o'zgarish bir xil eski guruhdan ikki marta ayirib yuboradi.
+        """
+        old_key = _stat_key(examination)
+        _assign(examination, examination_in.model_dump(exclude_unset=True))
+        await _shift_daily_stat(db, old_key, _stat_key(examination))
+        await commit_or_flush(db, commit)
         return examination
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        rows: Sequence[Mapping[str, Any]],
+        commit: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> list[Examination]:
+        """Bir nechta tekshiruv yaratish - har bir bo'lak bitta INSERT, kunlik yig'ma bitta upsert"""
+        checked = []
+        for row in rows:
+            data, abnormal = validate_examination_data(row["template_type"], row.get("examination_data") or {})
+            checked.append({**row, "examination_data": data, "abnormal_fields": abnormal})
+        examinations = await super().create_many(db, checked, commit=False, chunk_size=chunk_size)
+        await _apply_stat_deltas(db, Counter(_stat_key(examination) for examination in examinations))
+        await commit_or_flush(db, commit)
+        return examinations
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        values: Mapping[str, Any],
+        commit: bool = True,
+        **kwargs: Any
+    ) -> int:
+        """
+        Filtr bo'yicha tekshiruvlarni bitta UPDATE bilan yangilash
+
+        Kunlik yig'ma kalitidagi maydonlar (sana, tur, holat, shifokor)
+        o'zgarsa, eski qiymatlar update_status_many() dagi kabi shu so'rovning
+        o'zida qulflangan qatorlardan olinadi va yig'ma bitta upsert bilan tuzatiladi.
+
+        examination_data yoki shablon turi o'zgarsa ma'lumot amaldagi shablon
+        bo'yicha tekshiriladi: ikkalasi ham berilsa bir marta, faqat bittasi
+        berilsa - har bir qator uchun (qatorlar qulflanib yuklanadi).
+        """
+        if DATA_FIELDS.intersection(values):
+            if not DATA_FIELDS.issubset(values):
+                return await self._update_each(db, values, commit=commit, **kwargs)
+            data, abnormal = validate_examination_data(values["template_type"], values["examination_data"])
+            values = {**values, "examination_data": data, "abnormal_fields": abnormal}
+        if not STAT_FIELDS.intersection(values):
+            return await super().update_many(db, values, commit=commit, **kwargs)
+        current = (
+            select(Examination.id, *STAT_COLUMNS)
+            .where(*self._bulk_filter(kwargs), Examination.is_deleted == false())
+            .with_for_update()
+            .subquery()
+        )
+        result = await db.execute(
+            update(Examination)
+            .where(Examination.id == current.c.id)
+            .values(**values)
+            .returning(*STAT_COLUMNS, *(current.c[column.key] for column in STAT_COLUMNS))
+        )
+        rows = result.all()
+
+        deltas: Counter[StatKey] = Counter()
+        for row in rows:
+            deltas[tuple(row[:len(STAT_COLUMNS)])] += 1
+            deltas[tuple(row[len(STAT_COLUMNS):])] -= 1
+        await _apply_stat_deltas(db, deltas)
+        await commit_or_flush(db, commit)
+        return len(rows)
+
+    async def _update_each(
+        self,
+        db: AsyncSession,
+        values: Mapping[str, Any],
+        commit: bool = True,
+        **kwargs: Any
+    ) -> int:
+        """Qatorlarni yuklab, har birini update() dagi kabi yangilash - ma'lumot qator shabloni bo'yicha tekshiriladi"""
+        result = await db.scalars(
+            select(Examination)
+            .where(*self._bulk_filter(kwargs), Examination.is_deleted == false())
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        examinations: Sequence[Examination] = result.all()
+
+        deltas: Counter[StatKey] = Counter()
+        for examination in examinations:
+            deltas[_stat_key(examination)] -= 1
+            _assign(examination, values)
+            deltas[_stat_key(examination)] += 1
+        await _apply_stat_deltas(db, deltas)
+        await commit_or_flush(db, commit)
+        return len(examinations)
+
     async def get_by_id(
         self,
         db: AsyncSession,
         examination_id: int,
-        include_relations: bool = True
+        include_relations: bool = True,
+        joined: bool = False,
+        for_update: bool = False
     ) -> Examination | None:
-        """ID bo'yicha tekshiruv olish"""
+        """
+        ID bo'yicha tekshiruv olish
+
+        joined=True bo'lsa bemor va shifokor alohida SELECT lar o'rniga
+        shu so'rovning o'zida (LEFT OUTER JOIN) olinadi. for_update=True bo'lsa
+        tekshiruv qatori tranzaksiya oxirigacha qulflanadi (SELECT ... FOR UPDATE)
+        va sessiyadagi obyekt bazadagi qiymatlar bilan yangilanadi - update() uchun.
+        """
         query = select(Examination).where(
             Examination.id == examination_id,
-            Examination.is_deleted.is_(False)
+            Examination.is_deleted == false()
         )
+        if for_update:
+            # Faqat examination qatori: LEFT JOIN ning nullable tomonini qulflab bo'lmaydi
+            query = query.with_for_update(of=Examination).execution_options(populate_existing=True)
         if include_relations:
+            loader = joinedload if joined else selectinload
             query = query.options(
-                selectinload(Examination.patient),
-                selectinload(Examination.doctor)
+                loader(Examination.patient),
+                loader(Examination.doctor)
             )
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_changed_at(
+        self,
+        db: AsyncSession,
+        id: int
+    ) -> datetime | None:
+        """
+        Tekshiruv javobining oxirgi o'zgarish vaqti (shartli GET uchun)
+
+        Javobda bemor va shifokor ismlari ham bor, shuning uchun ularning
+        o'zgarishi ham hisobga olinadi; qatorlar yuklanmaydi.
+        """
+        result = await db.execute(
+            select(
+                func.coalesce(Examination.updated_at, Examination.created_at),
+                func.coalesce(Patient.updated_at, Patient.created_at),
+                func.coalesce(User.updated_at, User.created_at)
+            )
+            .outerjoin(Patient, Patient.id == Examination.patient_id)
+            .outerjoin(User, User.id == Examination.doctor_id)
+            .where(Examination.id == id, Examination.is_deleted == false())
+        )
+        row = result.first()
+        if row is None:
+            return None
+        changes: list[datetime] = [changed_at for changed_at in row if changed_at is not None]
+        return max(changes)
+
     async def get_by_patient(
         self,
         db: AsyncSession,
         patient_id: int,
         page: int = 1,
-        per_page: int = 20
-    ) -> tuple[Sequence[Examination], int]:
+        per_page: int = 20,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Page[Examination]:
         """Bemor bo'yicha tekshiruvlar"""
-        # Base query
         stmt = select(Examination).where(
             Examination.patient_id == patient_id,
-            Examination.is_deleted.is_(False)
-        )
-        count_stmt = select(func.count(Examination.id)).where(
-            Examination.patient_id == patient_id,
-            Examination.is_deleted.is_(False)
+            Examination.is_deleted == false()
         )
 
-        # Get total count
-        total_result = await db.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        # Pagination and ordering
-        stmt = stmt.order_by(Examination.examination_date.desc())
-        stmt = stmt.offset((page - 1) * per_page).limit(per_page)
-
-        result = await db.execute(stmt)
-        examinations = result.scalars().all()
+        return await paginate(
+            db,
+            stmt,
+            keyset=SEARCH_KEYSET,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            cursor=cursor,
+            count_mode=count_mode,
+            options=[LIST_LOAD_ONLY]
+        )
 
-        return examinations, total
+    @staticmethod
+    def _search_filters(
+        patient_id: int | None = None,
+        template_type: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None
+    ) -> list[ColumnElement[bool]]:
+        """Qidiruv filtrlari; birinchi element har doim is_deleted sharti"""
+        filters: list[ColumnElement[bool]] = [Examination.is_deleted == false()]
+        if patient_id:
+            filters.append(Examination.patient_id == patient_id)
+        if template_type:
+            filters.append(Examination.template_type == template_type)
+        if date_from:
+            filters.append(Examination.examination_date >= date_from)
+        if date_to:
+            filters.append(Examination.examination_date <= date_to)
+        if status:
+            filters.append(Examination.status == status)
+        return filters
 
     async def search(
         self,
@@ -107,52 +400,67 @@ class CRUDExamination(BaseCRUD[Examination]):
         date_to: date | None = None,
         status: str | None = None,
         page: int = 1,
-        per_page: int = 20
-    ) -> tuple[Sequence[Examination], int]:
+        per_page: int = 20,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Page[Examination]:
         """
         Tekshiruvlarni qidirish
 
+        cursor berilsa, OFFSET o'rniga keyset pagination ishlatiladi
+        (page e'tiborga olinmaydi). count_mode umumiy son qanday
+        hisoblanishini belgilaydi (estimated faqat filtrsiz so'rovda ishlaydi).
+
         Returns:
-            tuple: (tekshiruvlar ro'yxati, umumiy soni)
+            Page: (tekshiruvlar ro'yxati, umumiy soni, keyingi kursor, count_mode)
         """
-        # Base query
-        stmt = select(Examination).where(Examination.is_deleted.is_(False))
-        count_stmt = select(func.count(Examination.id)).where(Examination.is_deleted.is_(False))
-
-        # Filters
-        if patient_id:
-            stmt = stmt.where(Examination.patient_id == patient_id)
-            count_stmt = count_stmt.where(Examination.patient_id == patient_id)
-
-        if template_type:
-            stmt = stmt.where(Examination.template_type == template_type)
-            count_stmt = count_stmt.where(Examination.template_type == template_type)
-
-        if date_from:
-            stmt = stmt.where(Examination.examination_date >= date_from)
-            count_stmt = count_stmt.where(Examination.examination_date >= date_from)
-
-        if date_to:
-            stmt = stmt.where(Examination.examination_date <= date_to)
-            count_stmt = count_stmt.where(Examination.examination_date <= date_to)
-
-        if status:
-            stmt = stmt.where(Examination.status == status)
-            count_stmt = count_stmt.where(Examination.status == status)
-
-        # Get total count
-        total_result = await db.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        # Pagination and ordering
-        stmt = stmt.options(selectinload(Examination.patient))
-        stmt = stmt.order_by(Examination.examination_date.desc(), Examination.created_at.desc())
-        stmt = stmt.offset((page - 1) * per_page).limit(per_page)
+        filters = self._search_filters(patient_id, template_type, date_from, date_to, status)
+        stmt = select(Examination).where(*filters)
+
+        return await paginate(
+            db,
+            stmt,
+            keyset=SEARCH_KEYSET,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            cursor=cursor,
+            count_mode=count_mode,
+            estimate_table=None if len(filters) > 1 else Examination.__tablename__,
+            options=[LIST_LOAD_ONLY, LIST_PATIENT_LOAD]
+        )
 
-        result = await db.execute(stmt)
-        examinations = result.scalars().all()
+    async def search_list(
+        self,
+        db: AsyncSession,
+        patient_id: int | None = None,
+        template_type: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Page[Row[Any]]:
+        """
+        Tekshiruvlarni qidirish - faqat ExaminationList ustunlari
 
-        return examinations, total
+        search() bilan bir xil filtrlar va tartib, lekin ORM obyektlari o'rniga
+        LIST_COLUMNS qatorlari bitta JOIN so'rovida qaytadi.
+        """
+        filters = self._search_filters(patient_id, template_type, date_from, date_to, status)
+
+        return await paginate(
+            db,
+            _list_select().where(*filters),
+            keyset=SEARCH_KEYSET,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            cursor=cursor,
+            count_mode=count_mode,
+            estimate_table=None if len(filters) > 1 else Examination.__tablename__,
+            scalars=False
+        )
 
     async def get_recent(
         self,
@@ -162,28 +470,116 @@ class CRUDExamination(BaseCRUD[Examination]):
         """Oxirgi tekshiruvlar"""
         result = await db.execute(
             select(Examination)
-            .options(selectinload(Examination.patient))
-            .where(Examination.is_deleted.is_(False))
+            .options(LIST_LOAD_ONLY, LIST_PATIENT_LOAD)
+            .where(Examination.is_deleted == false())
             .order_by(Examination.created_at.desc())
             .limit(limit)
         )
         return result.scalars().all()
 
+    async def get_recent_list(
+        self,
+        db: AsyncSession,
+        limit: int = 10
+    ) -> Sequence[Row[Any]]:
+        """Oxirgi tekshiruvlar - faqat ExaminationList ustunlari"""
+        result = await db.execute(
+            _list_select()
+            .where(Examination.is_deleted == false())
+            .order_by(Examination.created_at.desc())
+            .limit(limit)
+        )
+        rows: Sequence[Row[Any]] = result.all()
+        return rows
+
+    async def get_export_columns(
+        self,
+        db: AsyncSession,
+        patient_id: int | None = None,
+        template_type: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+        flatten_data: bool = False
+    ) -> dict[str, type]:
+        """
+        Eksport ustunlari va ularning turlari
+
+        flatten_data=True bo'lsa examination_data o'rniga undagi har bir kalit
+        alohida ustun (data_<kalit>) bo'ladi. Kalitlar va ularning turlari
+        filtrlangan tekshiruvlardan bitta so'rov (jsonb_each) bilan aniqlanadi,
+        shuning uchun bir shablon turi bo'yicha eksport qilish kerak.
+        """
+        columns = column_types(EXPORT_COLUMNS)
+        if not flatten_data:
+            return columns
+
+        del columns["examination_data"]
+        entry = func.jsonb_each(Examination.examination_data).table_valued("key", "value")
+        stmt = (
+            select(entry.c.key, func.jsonb_typeof(entry.c.value))
+            .select_from(Examination)
+            .join(entry, true())
+            .where(*self._search_filters(patient_id, template_type, date_from, date_to, status))
+            .distinct()
+        )
+        kinds: dict[str, set[str]] = {}
+        for key, kind in (await db.execute(stmt)).all():
+            kinds.setdefault(key, set()).add(kind)
+        for key in sorted(kinds):
+            found = kinds[key] - {"null"}
+            columns[f"{EXPORT_DATA_PREFIX}{key}"] = JSONB_TYPES.get(found.pop(), str) if len(found) == 1 else str
+        return columns
+
+    async def stream_export(
+        self,
+        db: AsyncSession,
+        columns: Mapping[str, type],
+        patient_id: int | None = None,
+        template_type: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Eksport qatorlari - search() bilan bir xil filtrlar va jurnal tartibi
+
+        Qatorlar server-side cursor orqali batch_size tadan olinadi, shuning
+        uchun xotira sarfi eksport hajmiga bog'liq emas. columns da data_<kalit>
+        ustunlari bo'lsa (get_export_columns(flatten_data=True)), examination_data
+        shu ustunlarga yoyiladi.
+        """
+        data_keys = [
+            name.removeprefix(EXPORT_DATA_PREFIX) for name in columns if name.startswith(EXPORT_DATA_PREFIX)
+        ]
+        flatten = "examination_data" not in columns
+        stmt = (
+            _export_select()
+            .where(*self._search_filters(patient_id, template_type, date_from, date_to, status))
+            .order_by(*(column.desc() for column in SEARCH_KEYSET))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(stmt)
+        async for partition in result.mappings().partitions():
+            rows = [dict(row) for row in partition]
+            if flatten:
+                for row in rows:
+                    data = row.pop("examination_data") or {}
+                    row.update({f"{EXPORT_DATA_PREFIX}{key}": data.get(key) for key in data_keys})
+            yield rows
+
     async def get_today_count(
         self,
         db: AsyncSession,
         doctor_id: int | None = None
     ) -> int:
-        """Bugungi tekshiruvlar soni"""
-        from datetime import date as date_type
-        today = date_type.today()
-
-        stmt = select(func.count(Examination.id)).where(
-            Examination.examination_date == today,
-            Examination.is_deleted.is_(False)
+        """Bugungi tekshiruvlar soni (kunlik yig'madan)"""
+        stmt = select(func.coalesce(func.sum(ExaminationDailyStat.examination_count), 0)).where(
+            ExaminationDailyStat.stat_date == date.today()
         )
         if doctor_id:
-            stmt = stmt.where(Examination.doctor_id == doctor_id)
+            stmt = stmt.where(ExaminationDailyStat.doctor_id == doctor_id)
 
         result = await db.execute(stmt)
         return result.scalar() or 0
@@ -194,61 +590,188 @@ class CRUDExamination(BaseCRUD[Examination]):
         date_from: date | None = None,
         date_to: date | None = None
     ) -> dict[str, Any]:
-        """Statistika"""
-        # Base filter
-        base_filter = [Examination.is_deleted.is_(False)]
+        """
+        Statistika - kunlik yig'madan bitta GROUPING SETS so'rovi bilan
+
+        total, by_template_type va by_status sana oralig'i bo'yicha,
+        today esa oraliqdan qat'i nazar bugun uchun hisoblanadi.
+        """
+        stat = ExaminationDailyStat
+        today = date.today()
+        in_range = []
         if date_from:
-            base_filter.append(Examination.examination_date >= date_from) # type: ignore[arg-type]
+            in_range.append(stat.stat_date >= date_from)
         if date_to:
-            base_filter.append(Examination.examination_date <= date_to) # type: ignore[arg-type]
+            in_range.append(stat.stat_date <= date_to)
 
-        # Total examinations
-        total_result = await db.execute(
-            select(func.count(Examination.id)).where(*base_filter)
-        )
-        total = total_result.scalar() or 0
-
-        # By template type
-        by_type_result = await db.execute(
-            select(
-                Examination.template_type,
-                func.count(Examination.id).label("count")
-            )
-            .where(*base_filter)
-            .group_by(Examination.template_type)
-        )
-        by_type = {row[0]: row[1] for row in by_type_result.all()}
+        range_count: ColumnElement[int] = func.sum(stat.examination_count)
+        if in_range:
+            range_count = range_count.filter(and_(*in_range))
 
-        # By status
-        by_status_result = await db.execute(
+        stmt = (
             select(
-                Examination.status,
-                func.count(Examination.id).label("count")
+                stat.template_type,
+                stat.status,
+                # 3 - umumiy, 1 - shablon turi bo'yicha, 2 - holat bo'yicha
+                func.grouping(stat.template_type, stat.status).label("grouping_id"),
+                func.coalesce(range_count, 0).label("examination_count"),
+                func.coalesce(func.sum(stat.examination_count).filter(stat.stat_date == today), 0).label("today_count"),
             )
-            .where(*base_filter)
-            .group_by(Examination.status)
+            .group_by(func.grouping_sets(tuple_(), stat.template_type, stat.status))
         )
-        by_status = {row[0]: row[1] for row in by_status_result.all()}
+        if in_range:
+            stmt = stmt.where(or_(and_(*in_range), stat.stat_date == today))
+
+        total = today_count = 0
+        by_type: dict[str, int] = {}
+        by_status: dict[str, int] = {}
+        for row in (await db.execute(stmt)).all():
+            if row.grouping_id == 3:
+                total, today_count = row.examination_count, row.today_count
+            elif row.examination_count and row.grouping_id == 1:
+                by_type[row.template_type] = row.examination_count
+            elif row.examination_count and row.grouping_id == 2:
+                by_status[row.status] = row.examination_count
 
         return {
             "total": total,
             "by_template_type": by_type,
-            "by_status": by_status
+            "by_status": by_status,
+            "today": today_count
         }
 
     async def update_status(
         self,
         db: AsyncSession,
         examination_id: int,
-        status: str
+        status: str,
+        commit: bool = True
     ) -> Examination | None:
-        """Tekshiruv holatini yangilash"""
-        examination = await self.get_by_id(db, examination_id, include_relations=False)
-        if examination:
-            examination.status = status
-            await db.commit()
-            await db.refresh(examination)
-        return examination
+        """
+        Tekshiruv holatini yangilash - update_status_many() orqali bitta UPDATE
+
+        Holat allaqachon shu bo'lsa yozuv bo'lmaydi va tekshiruv o'zgarishsiz qaytadi.
+        """
+        updated = await self.update_status_many(db, [examination_id], status, commit=commit)
+        if updated:
+            return updated[0]
+        return await self.get_by_id(db, examination_id, include_relations=False)
+
+    async def update_status_many(
+        self,
+        db: AsyncSession,
+        examination_ids: Sequence[int],
+        status: str,
+        commit: bool = True
+    ) -> list[Examination]:
+        """
+        Bir nechta tekshiruv holatini bitta UPDATE ... RETURNING bilan yangilash
+
+        Eski holatlar (kunlik yig'ma uchun) shu so'rovning o'zida qulflangan
+        qatorlardan olinadi. Faqat holati haqiqatan o'zgargan tekshiruvlar
+        qaytadi (sessiyadagi obyektlar ham yangilanadi).
+        """
+        if not examination_ids:
+            return []
+        current = (
+            select(Examination.id, Examination.status)
+            .where(
+                Examination.id.in_(examination_ids),
+                Examination.is_deleted == false(),
+                Examination.status != status
+            )
+            .with_for_update()
+            .subquery()
+        )
+        result = await db.execute(
+            update(Examination)
+            .where(Examination.id == current.c.id)
+            .values(status=status)
+            .returning(Examination, current.c.status.label("old_status"))
+        )
+        rows = result.all()
+        if not rows:
+            return []
+
+        deltas: Counter[StatKey] = Counter()
+        for examination, old_status in rows:
+            new_key = _stat_key(examination)
+            deltas[new_key] += 1
+            deltas[(new_key[0], new_key[1], old_status, new_key[3])] -= 1
+        await _apply_stat_deltas(db, deltas)
+        await commit_or_flush(db, commit)
+        return [examination for examination, _ in rows]
+
+    def _print_select(
+        self,
+        examination_ids: Sequence[int] | None = None,
+        patient_id: int | None = None,
+        template_type: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None
+    ) -> Select[Any]:
+        filters = self._search_filters(patient_id, template_type, date_from, date_to, status)
+        if examination_ids is not None:
+            filters.append(Examination.id.in_(examination_ids))
+        return select(Examination).where(*filters)
+
+    async def count_for_print(
+        self,
+        db: AsyncSession,
+        limit: int,
+        examination_ids: Sequence[int] | None = None,
+        **filters: Any
+    ) -> tuple[int, bool]:
+        """Chop etiladigan tekshiruvlar soni, ko'pi bilan limit gacha; (son, limit dan oshdimi)"""
+        total, used_mode = await count_rows(
+            db, self._print_select(examination_ids, **filters), CountMode.CAPPED, cap=limit
+        )
+        return total or 0, used_mode == CountMode.CAPPED
+
+    async def get_for_print(
+        self,
+        db: AsyncSession,
+        examination_ids: Sequence[int] | None = None,
+        limit: int | None = None,
+        **filters: Any
+    ) -> Sequence[Examination]:
+        """
+        Ommaviy chop etish uchun tekshiruvlar - bemor va shifokor bilan bitta JOIN so'rovida
+
+        examination_ids va/yoki search() filtrlari bo'yicha, jurnal tartibida.
+        """
+        stmt = (
+            self._print_select(examination_ids, **filters)
+            .options(joinedload(Examination.patient), joinedload(Examination.doctor))
+            .order_by(*(column.desc() for column in SEARCH_KEYSET))
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        examinations: Sequence[Examination] = result.scalars().all()
+        return examinations
+
+    async def delete_many(self, db: AsyncSession, commit: bool = True, **kwargs: Any) -> int:
+        """Soft delete - bitta UPDATE ... RETURNING; kunlik yig'ma qaytgan qatorlar bo'yicha kamaytiriladi"""
+        deleted = await self._soft_delete(db, *STAT_COLUMNS, **kwargs)
+        deltas: Counter[StatKey] = Counter()
+        for row in deleted:
+            deltas[tuple(row)] -= 1
+        await _apply_stat_deltas(db, deltas)
+        await commit_or_flush(db, commit)
+        return len(deleted)
+
+    async def db_delete_many(self, db: AsyncSession, commit: bool = True, **kwargs: Any) -> int:
+        """Hard delete - bitta DELETE ... RETURNING; o'chirilmagan bo'lgan qatorlar yig'madan ayriladi"""
+        deleted = await self._hard_delete(db, *STAT_COLUMNS, Examination.is_deleted, **kwargs)
+        deltas: Counter[StatKey] = Counter()
+        for row in deleted:
+            *key, was_deleted = tuple(row)
+            if not was_deleted:
+                deltas[tuple(key)] -= 1
+        await _apply_stat_deltas(db, deltas)
+        await commit_or_flush(db, commit)
+        return len(deleted)
 
 
 # Singleton instance
@@ -0,0 +1,292 @@
+"""
+Pagination helpers - keyset (cursor) pagination va count strategiyalari uchun yordamchi funksiyalar
+"""
+import base64
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any, Generic, NamedTuple, TypeVar
+
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.exceptions import BadRequestException
+from app.schemas.common import CountMode
+
+T = TypeVar("T")
+
+# CAPPED rejimida sanaladigan maksimal yozuvlar soni
+COUNT_CAP = 1000
+
+
+class Page(NamedTuple, Generic[T]):
+    """A single page of a paginated listing.
+
+    Attributes
+    ----------
+    items : Sequence[T]
+        Records on this page.
+    total : int | None
+        Number of records matching the filters, see `count_mode` for its meaning.
+    next_cursor : str | None
+        Opaque cursor for the next page, or None when this is the last page.
+    count_mode : CountMode
+        The count strategy actually used. A requested strategy falls back to
+        `exact` when it cannot apply, and `capped` is only reported when the
+        cap was hit (i.e. there are more than `total` records).
+    """
+
+    items: Sequence[T]
+    total: int | None
+    next_cursor: str | None = None
+    count_mode: CountMode = CountMode.EXACT
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of a row into an opaque, URL-safe cursor.
+
+    Parameters
+    ----------
+    values : Sequence[Any]
+        Values of the keyset columns, in ordering order.
+
+    Returns
+    -------
+    str
+        Base64url-encoded cursor without padding.
+    """
+    payload = [value.isoformat() if isinstance(value, date) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _coerce(column: InstrumentedAttribute[Any], value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is int and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ValueError("Cursor value is not an integer")
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute[Any]]) -> list[Any]:
+    """Decode a cursor produced by `encode_cursor` back into typed column values.
+
+    Parameters
+    ----------
+    cursor : str
+        The opaque cursor received from the client.
+    columns : Sequence[InstrumentedAttribute]
+        The keyset columns the cursor was built from.
+
+    Returns
+    -------
+    list[Any]
+        Values coerced to each column's Python type.
+
+    Raises
+    ------
+    BadRequestException
+        If the cursor is malformed or does not match the keyset columns.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("Cursor does not match keyset columns")
+        return [_coerce(column, value) for column, value in zip(columns, payload, strict=True)]
+    except (ValueError, TypeError) as e:
+        raise BadRequestException("Invalid cursor") from e
+
+
+def keyset_condition(
+    columns: Sequence[InstrumentedAttribute[Any]],
+    cursor: str,
+    descending: bool = True,
+) -> ColumnElement[bool]:
+    """Build the row-value predicate selecting records after `cursor`.
+
+    All keyset columns must share the same sort direction and the last one
+    must be unique (normally the primary key) so that ties are broken.
+
+    Examples
+    --------
+    >>> stmt.where(keyset_condition((Patient.created_at, Patient.id), cursor))
+    """
+    values = decode_cursor(cursor, columns)
+    row = tuple_(*columns)
+    bound = tuple_(*values, types=[column.type for column in columns])
+    return row < bound if descending else row > bound
+
+
+def next_cursor(
+    rows: Sequence[Any],
+    columns: Sequence[InstrumentedAttribute[Any]],
+    limit: int,
+) -> str | None:
+    """Return the cursor pointing past the last row of the page, or None on the last page.
+
+    `rows` must be fetched with ``LIMIT limit + 1``: the extra row only tells
+    that more records follow and is not part of the page (see `paginate`).
+    """
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor([getattr(last, column.key) for column in columns])
+
+
+async def _estimate_rows(db: AsyncSession, table_name: str) -> int | None:
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    )
+    estimate = result.scalar_one_or_none()
+    # reltuples = -1 until the table has been vacuumed or analyzed
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def count_rows(
+    db: AsyncSession,
+    stmt: Select[Any],
+    count_mode: CountMode = CountMode.EXACT,
+    estimate_table: str | None = None,
+    cap: int = COUNT_CAP,
+) -> tuple[int | None, CountMode]:
+    """Count the rows of `stmt` using the requested strategy.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The database session.
+    stmt : Select
+        The filtered query, without ordering or pagination.
+    count_mode : CountMode, default=CountMode.EXACT
+        Requested strategy. `window` is resolved by `paginate` and counts exactly here.
+    estimate_table : str | None, default=None
+        Table whose statistics may stand in for the count. Pass it only when
+        `stmt` is not filtered beyond soft-deletion, otherwise the estimate is meaningless.
+    cap : int, default=COUNT_CAP
+        Upper bound for `capped` counting.
+
+    Returns
+    -------
+    tuple[int | None, CountMode]
+        The total and the strategy actually used.
+    """
+    if count_mode == CountMode.NONE:
+        return None, CountMode.NONE
+
+    if count_mode == CountMode.ESTIMATED and estimate_table is not None:
+        estimate = await _estimate_rows(db, estimate_table)
+        if estimate is not None:
+            return estimate, CountMode.ESTIMATED
+
+    if count_mode == CountMode.CAPPED:
+        result = await db.execute(select(func.count()).select_from(stmt.limit(cap + 1).subquery()))
+        total = result.scalar_one()
+        if total > cap:
+            return cap, CountMode.CAPPED
+        return total, CountMode.EXACT
+
+    result = await db.execute(select(func.count()).select_from(stmt.subquery()))
+    return result.scalar_one(), CountMode.EXACT
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select[Any],
+    keyset: Sequence[InstrumentedAttribute[Any]],
+    limit: int,
+    offset: int = 0,
+    cursor: str | None = None,
+    descending: bool = True,
+    count_mode: CountMode = CountMode.EXACT,
+    estimate_table: str | None = None,
+    options: Sequence[Any] | None = None,
+    order_by: Sequence[Any] | None = None,
+    scalars: bool = True,
+) -> Page[Any]:
+    """Fetch one page of `stmt` ordered by `keyset`, together with its total.
+
+    Parameters
+    ----------
+    db : AsyncSession
+        The database session.
+    stmt : Select
+        Filtered ``select(Model)`` query without ordering, pagination or loader
+        options, or a column projection when `scalars` is False.
+    keyset : Sequence[InstrumentedAttribute]
+        Ordering columns; the last one must be unique.
+    limit : int
+        Page size.
+    offset : int, default=0
+        Rows to skip; ignored when `cursor` is given.
+    cursor : str | None, default=None
+        Cursor from a previous page's `next_cursor`.
+    descending : bool, default=True
+        Sort direction shared by all keyset columns.
+    count_mode : CountMode, default=CountMode.EXACT
+        Count strategy, see `count_rows`. With `window` and a cursor, the total
+        is the number of records from the cursor onwards.
+    estimate_table : str | None, default=None
+        Passed to `count_rows` for `estimated` counts.
+    options : Sequence[Any] | None, default=None
+        SQLAlchemy loading options applied to the data query only.
+    order_by : Sequence[Any] | None, default=None
+        Ordering expressions placed before the keyset (e.g. a relevance rank).
+        Such pages cannot be continued with a cursor, so `next_cursor` is None.
+    scalars : bool, default=True
+        Return the first column of each row (the ORM entity). When False, rows
+        are returned as-is and must expose the keyset columns by name; with
+        `window` counting they carry an extra ``total_count`` column.
+
+    Returns
+    -------
+    Page
+        The page of records.
+
+    Raises
+    ------
+    BadRequestException
+        If `cursor` is combined with `order_by`.
+    """
+    if order_by and cursor:
+        raise BadRequestException("Cursor pagination is not available for ranked results")
+
+    keyset_order = [column.desc() if descending else column.asc() for column in keyset]
+    data_stmt = stmt.order_by(*(order_by or ()), *keyset_order)
+    if cursor:
+        data_stmt = data_stmt.where(keyset_condition(keyset, cursor, descending=descending))
+    else:
+        data_stmt = data_stmt.offset(offset)
+    # Bitta ortiqcha qator - keyingi sahifa borligini bilish uchun (sahifaga kirmaydi)
+    data_stmt = data_stmt.limit(limit + 1)
+    if options:
+        data_stmt = data_stmt.options(*options)
+
+    if count_mode == CountMode.WINDOW:
+        result = await db.execute(data_stmt.add_columns(func.count().over().label("total_count")))
+        rows = result.all()
+        items = [row[0] for row in rows] if scalars else rows
+        if rows or (offset == 0 and not cursor):
+            total = rows[0].total_count if rows else 0
+            cursor_out = None if order_by else next_cursor(items, keyset, limit)
+            return Page(items[:limit], total, cursor_out, CountMode.WINDOW)
+        # Oxiridan tashqaridagi sahifa - window hech narsa qaytarmaydi
+        total, used_mode = await count_rows(db, stmt)
+        return Page(items, total, None, used_mode)
+
+    total, used_mode = await count_rows(db, stmt, count_mode, estimate_table=estimate_table)
+    result = await db.execute(data_stmt)
+    data = result.scalars().all() if scalars else result.all()
+    cursor_out = None if order_by else next_cursor(data, keyset, limit)
+    return Page(data[:limit], total, cursor_out, used_mode)
@@ -1,17 +1,102 @@
 """
 Patient CRUD operations - Bemor ma'lumotlari uchun CRUD operatsiyalari
 """
-from collections.abc import Sequence
-from typing import Any
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
+from datetime import UTC, datetime
+from itertools import islice
+from typing import Any, Protocol
 
-from sqlalchemy import func, or_, select
+import anyio
+from pydantic import ValidationError
+from sqlalchemy import and_, false, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.models.patient import Patient
-from app.schemas.patient import PatientCreate, PatientUpdate
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.export import EXPORT_BATCH_SIZE
+from app.core.search import MIN_PHONE_DIGITS, normalize_text, phone_digits, query_variants
+from app.core.tabular import Row
+from app.models.patient import (
+    Patient,
+    patient_phone_digits,
+    patient_search_name,
+)
+from app.schemas.patient import (
+    PatientCreate,
+    PatientImportError,
+    PatientImportResult,
+    PatientSuggestion,
+    PatientUpdate,
+)
 
-from .base import BaseCRUD
+from .base import BaseCRUD, commit_or_flush
+from .examination import crud_examination
+from .pagination import CountMode, Page, paginate
+
+# search() uchun keyset ustunlari (hammasi DESC)
+SEARCH_KEYSET = (Patient.created_at, Patient.id)
+
+# Eksport ustunlari - PatientRead maydonlari (examination_count siz)
+EXPORT_COLUMNS = (
+    Patient.id,
+    *(getattr(Patient, column) for column in PatientCreate.model_fields),
+    Patient.created_at,
+    Patient.updated_at,
+)
+
+# suggest() natijalari keshi - (normallashtirilgan so'rov, limit) -> takliflar
+suggest_cache: TTLCache[tuple[str, int], list[PatientSuggestion]] = TTLCache(
+    maxsize=settings.PATIENT_SUGGEST_CACHE_SIZE,
+    ttl=settings.PATIENT_SUGGEST_CACHE_TTL_SECONDS,
+)
+
+# bulk_import() - bitta tranzaksiyada yoziladigan qatorlar soni
+IMPORT_BATCH_SIZE = 5000
+# Javobda qaytariladigan xatolar soni (error_count esa hammasini sanaydi)
+IMPORT_MAX_REPORTED_ERRORS = 1000
+IMPORT_COLUMNS = tuple(PatientCreate.model_fields)
+DUPLICATE_PHONE_MESSAGE = "Bu telefon raqami bilan bemor mavjud"
+
+
+class _CopyConnection(Protocol):
+    """asyncpg.Connection ning _insert_many ishlatadigan qismi (asyncpg tip annotatsiyasiz)"""
+
+    async def copy_records_to_table(
+        self,
+        table_name: str,
+        *,
+        records: Sequence[tuple[Any, ...]],
+        columns: Sequence[str] | None = None
+    ) -> str: ...
+
+
+def _report_error(result: PatientImportResult, row: int, field: str | None, message: str) -> None:
+    if len(result.errors) < IMPORT_MAX_REPORTED_ERRORS:
+        result.errors.append(PatientImportError(row=row, field=field, message=message))
+
+
+def _validate_batch(
+    rows: Iterator[Row],
+    size: int,
+    result: PatientImportResult
+) -> list[tuple[int, PatientCreate]] | None:
+    """Keyingi `size` ta qatorni o'qib tekshirish; fayl tugagan bo'lsa None"""
+    chunk = list(islice(rows, size))
+    if not chunk:
+        return None
+    valid: list[tuple[int, PatientCreate]] = []
+    for row_number, data in chunk:
+        result.total_rows += 1
+        try:
+            valid.append((row_number, PatientCreate.model_validate(data)))
+        except ValidationError as e:
+            result.error_count += 1
+            for error in e.errors():
+                field = ".".join(str(part) for part in error["loc"]) or None
+                _report_error(result, row_number, field, error["msg"])
+    return valid
 
 
 class CRUDPatient(BaseCRUD[Patient]):
@@ -20,29 +105,158 @@ class CRUDPatient(BaseCRUD[Patient]):
     async def create(
         self,
         db: AsyncSession,
-        patient_in: PatientCreate
+        patient_in: PatientCreate,
+        commit: bool = True
     ) -> Patient:
         """Yangi bemor yaratish"""
         patient = Patient(**patient_in.model_dump())
         db.add(patient)
-        await db.commit()
-        await db.refresh(patient)
+        # Barcha qiymatlar (vaqtlar ham) Python tomonida - INSERT dan keyin qayta o'qish shart emas
+        await commit_or_flush(db, commit)
+        suggest_cache.clear()
         return patient
 
     async def update(
         self,
         db: AsyncSession,
-        patient: Patient,
-        patient_in: PatientUpdate
-    ) -> Patient:
-        """Bemor ma'lumotlarini yangilash"""
+        patient_id: int,
+        patient_in: PatientUpdate,
+        commit: bool = True
+    ) -> Patient | None:
+        """
+        Bemor ma'lumotlarini yangilash - bitta UPDATE ... RETURNING
+
+        Bemor oldindan yuklanmaydi; topilmasa (yoki o'chirilgan bo'lsa) None.
+        """
         update_data = patient_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(patient, field, value)
-        await db.commit()
-        await db.refresh(patient)
+        if not update_data:
+            return await self.get_by_id(db, patient_id)
+        result = await db.execute(
+            update(Patient)
+            .where(Patient.id == patient_id, Patient.is_deleted == false())
+            .values(**update_data)
+            .returning(Patient)
+            .execution_options(populate_existing=True)
+        )
+        patient = result.scalar_one_or_none()
+        await commit_or_flush(db, commit)
+        if patient is not None:
+            suggest_cache.clear()
         return patient
 
+    async def update_many(
+        self,
+        db: AsyncSession,
+        values: Mapping[str, Any],
+        commit: bool = True,
+        **kwargs: Any
+    ) -> int:
+        """Filtr bo'yicha bemorlarni bitta UPDATE bilan yangilash va takliflar keshini tozalash"""
+        updated = await super().update_many(db, values, commit=commit, **kwargs)
+        suggest_cache.clear()
+        return updated
+
+    async def delete_many(self, db: AsyncSession, commit: bool = True, **kwargs: Any) -> int:
+        """Bemorlarni o'chirish (soft delete) va takliflar keshini tozalash; delete() ham shu orqali"""
+        deleted = await super().delete_many(db, commit=commit, **kwargs)
+        suggest_cache.clear()
+        return deleted
+
+    async def db_delete_many(self, db: AsyncSession, commit: bool = True, **kwargs: Any) -> int:
+        """
+        Bemorlarni butunlay o'chirish va takliflar keshini tozalash; db_delete() ham shu orqali
+
+        Tekshiruvlar FK ning ON DELETE CASCADE i ga qoldirilmaydi: avval
+        crud_examination.db_delete_many() bilan o'chiriladi, aks holda kunlik
+        yig'ma (examination_daily_stat) ulardan xabar topmaydi.
+        """
+        result = await db.scalars(select(Patient.id).where(*self._bulk_filter(kwargs)).with_for_update())
+        patient_ids = list(result)
+        if not patient_ids:
+            return 0
+        await crud_examination.db_delete_many(db, commit=False, patient_id=patient_ids)
+        deleted = await super().db_delete_many(db, commit=commit, id=patient_ids)
+        suggest_cache.clear()
+        return deleted
+
+    async def bulk_import(
+        self,
+        db: AsyncSession,
+        rows: Iterator[Row],
+        batch_size: int = IMPORT_BATCH_SIZE
+    ) -> PatientImportResult:
+        """
+        Bemorlarni fayldan ommaviy import qilish
+
+        Qatorlar `batch_size` tadan o'qiladi va PatientCreate bo'yicha
+        tekshiriladi (fayl o'qish va validatsiya alohida thread da). Xato
+        qatorlar o'tkazib yuboriladi va natijada qator raqami bilan qaytadi.
+        Telefon raqami bazada yoki faylning oldingi qatorlarida mavjud bo'lsa
+        qator dublikat hisoblanadi; bazadagi tekshiruv har bir batch uchun
+        bitta so'rov. Har bir batch alohida commit qilinadi.
+        """
+        result = PatientImportResult()
+        seen_phones: set[str] = set()
+
+        while (batch := await anyio.to_thread.run_sync(_validate_batch, rows, batch_size, result)) is not None:
+            phones = {patient.phone for _, patient in batch if patient.phone}
+            existing: set[str | None] = set()
+            if phones:
+                existing_result = await db.execute(
+                    select(Patient.phone).where(
+                        Patient.phone.in_(phones),
+                        Patient.is_deleted == false()
+                    )
+                )
+                existing = set(existing_result.scalars())
+
+            patients: list[PatientCreate] = []
+            for row_number, patient in batch:
+                if patient.phone:
+                    if patient.phone in existing or patient.phone in seen_phones:
+                        result.duplicates += 1
+                        _report_error(result, row_number, "phone", DUPLICATE_PHONE_MESSAGE)
+                        continue
+                    seen_phones.add(patient.phone)
+                patients.append(patient)
+
+            if patients:
+                await self._insert_many(db, patients)
+                await db.commit()
+                result.imported += len(patients)
+
+        result.errors.sort(key=lambda error: error.row)
+        if result.imported:
+            suggest_cache.clear()
+        return result
+
+    @staticmethod
+    async def _insert_many(db: AsyncSession, patients: Sequence[PatientCreate]) -> None:
+        """Bemorlarni yozish - PostgreSQL (asyncpg) da COPY, boshqa bazalarda executemany INSERT"""
+        now = datetime.now(UTC)
+        if db.get_bind().dialect.driver == "asyncpg":
+            connection = await db.connection()
+            raw = await connection.get_raw_connection()
+            copy_connection: _CopyConnection | None = raw.driver_connection
+            if copy_connection is None:
+                raise RuntimeError("asyncpg connection is closed")
+            await copy_connection.copy_records_to_table(
+                Patient.__tablename__,
+                columns=[*IMPORT_COLUMNS, "is_deleted", "created_at"],
+                records=[
+                    (*(getattr(patient, column) for column in IMPORT_COLUMNS), False, now)
+                    for patient in patients
+                ],
+            )
+            return
+        await db.execute(
+            insert(Patient),
+            [
+                {**patient.model_dump(), "is_deleted": False, "created_at": now}
+                for patient in patients
+            ]
+        )
+
     async def get_by_id(
         self,
         db: AsyncSession,
@@ -52,7 +266,7 @@ class CRUDPatient(BaseCRUD[Patient]):
         """ID bo'yicha bemor olish"""
         query = select(Patient).where(
             Patient.id == patient_id,
-            Patient.is_deleted.is_(False)
+            Patient.is_deleted == false()
         )
         if include_examinations:
             query = query.options(selectinload(Patient.examinations))
@@ -68,7 +282,7 @@ class CRUDPatient(BaseCRUD[Patient]):
         result = await db.execute(
             select(Patient).where(
                 Patient.phone == phone,
-                Patient.is_deleted.is_(False)
+                Patient.is_deleted == false()
             )
         )
         return result.scalar_one_or_none()
@@ -79,46 +293,144 @@ class CRUDPatient(BaseCRUD[Patient]):
         query: str | None = None,
         gender: str | None = None,
         page: int = 1,
-        per_page: int = 20
-    ) -> tuple[Sequence[Patient], int]:
+        per_page: int = 20,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Page[Patient]:
         """
         Bemorlarni qidirish
 
+        query ism (lotin yoki kirill yozuvida) yoki telefon raqamining bir qismi
+        bo'lishi mumkin. Qidiruv trigram GIN indekslari orqali bajariladi va
+        natijalar moslik darajasi bo'yicha tartiblanadi (bu holda cursor ishlamaydi).
+
+        cursor berilsa, OFFSET o'rniga keyset pagination ishlatiladi
+        (page e'tiborga olinmaydi). count_mode umumiy son qanday
+        hisoblanishini belgilaydi (estimated faqat filtrsiz so'rovda ishlaydi).
+
         Returns:
-            tuple: (bemorlar ro'yxati, umumiy soni)
+            Page: (bemorlar ro'yxati, umumiy soni, keyingi kursor, count_mode)
         """
         # Base query
-        stmt = select(Patient).where(Patient.is_deleted.is_(False))
-        count_stmt = select(func.count(Patient.id)).where(Patient.is_deleted.is_(False))
+        stmt = select(Patient).where(Patient.is_deleted == false())
 
         # Search filter
-        if query:
-            search_filter = or_(
-                Patient.last_name.ilike(f"%{query}%"),
-                Patient.first_name.ilike(f"%{query}%"),
-                Patient.middle_name.ilike(f"%{query}%"),
-                Patient.phone.ilike(f"%{query}%")
-            )
+        rank = None
+        if query and query.strip():
+            search_filter, rank = self._search_filter(query)
             stmt = stmt.where(search_filter)
-            count_stmt = count_stmt.where(search_filter)
 
         # Gender filter
         if gender:
             stmt = stmt.where(Patient.gender == gender)
-            count_stmt = count_stmt.where(Patient.gender == gender)
 
-        # Get total count
-        total_result = await db.execute(count_stmt)
-        total = total_result.scalar() or 0
+        return await paginate(
+            db,
+            stmt,
+            keyset=SEARCH_KEYSET,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            cursor=cursor,
+            count_mode=count_mode,
+            estimate_table=None if rank is not None or gender else Patient.__tablename__,
+            order_by=[rank.desc()] if rank is not None else None
+        )
+
+    async def stream_export(
+        self,
+        db: AsyncSession,
+        query: str | None = None,
+        gender: str | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Eksport qatorlari - search() bilan bir xil filtrlar
+
+        Moslik bo'yicha emas, qo'shilgan vaqti bo'yicha tartiblanadi; qatorlar
+        server-side cursor orqali batch_size tadan olinadi.
+        """
+        stmt = select(*EXPORT_COLUMNS).where(Patient.is_deleted == false())
+        if query and query.strip():
+            stmt = stmt.where(self._search_filter(query)[0])
+        if gender:
+            stmt = stmt.where(Patient.gender == gender)
+        stmt = stmt.order_by(*(column.desc() for column in SEARCH_KEYSET)).execution_options(yield_per=batch_size)
+
+        result = await db.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+    @staticmethod
+    def _search_filter(query: str) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+        """Qidiruv sharti va moslik darajasi (word_similarity) ifodasi"""
+        conditions: list[ColumnElement[bool]] = []
+        ranks: list[ColumnElement[float]] = []
 
-        # Pagination and ordering
-        stmt = stmt.order_by(Patient.created_at.desc())
-        stmt = stmt.offset((page - 1) * per_page).limit(per_page)
+        # Har bir so'z ismning istalgan joyida uchrashi mumkin ("Aziz Karimov" ham topiladi)
+        for variant in query_variants(query):
+            conditions.append(and_(*(patient_search_name.contains(word, autoescape=True) for word in variant.split())))
+            ranks.append(func.word_similarity(variant, patient_search_name))
 
-        result = await db.execute(stmt)
-        patients = result.scalars().all()
+        digits = phone_digits(query)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            conditions.append(patient_phone_digits.contains(digits))
+            ranks.append(func.word_similarity(digits, patient_phone_digits))
+
+        return or_(*conditions), func.greatest(*ranks)
+
+    async def suggest(
+        self,
+        db: AsyncSession,
+        query: str,
+        limit: int = 10
+    ) -> list[PatientSuggestion]:
+        """
+        Typeahead uchun bemor takliflari
+
+        F.I.O. boshi (lotin yoki kirill) yoki telefon raqami boshi bo'yicha
+        prefix qidiruv; umumiy son hisoblanmaydi. Natijalar qisqa muddat
+        keshlanadi va bemor yaratilganda/o'zgartirilganda/o'chirilganda tozalanadi.
+        """
+        key = (normalize_text(query), limit)
+        cached = suggest_cache.get(key)
+        if cached is not None:
+            return cached
 
-        return patients, total
+        conditions = [
+            patient_search_name.startswith(variant, autoescape=True)
+            for variant in query_variants(query)
+        ]
+        digits = phone_digits(query)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            conditions.append(patient_phone_digits.startswith(digits))
+            # Mahalliy format (90 123 ...) ham +998 bilan saqlangan raqamga mos kelsin
+            if not digits.startswith("998"):
+                conditions.append(patient_phone_digits.startswith(f"998{digits}"))
+        if not conditions:
+            return []
+
+        result = await db.execute(
+            select(
+                Patient.id,
+                Patient.last_name,
+                Patient.first_name,
+                Patient.middle_name,
+                Patient.phone
+            )
+            .where(Patient.is_deleted == false(), or_(*conditions))
+            .order_by(Patient.last_name, Patient.first_name, Patient.id)
+            .limit(limit)
+        )
+        suggestions = [
+            PatientSuggestion(
+                id=row.id,
+                name=" ".join(part for part in (row.last_name, row.first_name, row.middle_name) if part),
+                phone=row.phone
+            )
+            for row in result.all()
+        ]
+        suggest_cache.set(key, suggestions)
+        return suggestions
 
     async def get_recent(
         self,
@@ -128,7 +440,7 @@ class CRUDPatient(BaseCRUD[Patient]):
         """Oxirgi qo'shilgan bemorlar"""
         result = await db.execute(
             select(Patient)
-            .where(Patient.is_deleted.is_(False))
+            .where(Patient.is_deleted == false())
             .order_by(Patient.created_at.desc())
             .limit(limit)
         )
@@ -148,7 +460,7 @@ class CRUDPatient(BaseCRUD[Patient]):
                 func.count(Examination.id).label("examination_count")
             )
             .outerjoin(Examination, Examination.patient_id == Patient.id)
-            .where(Patient.id == patient_id, Patient.is_deleted.is_(False))
+            .where(Patient.id == patient_id, Patient.is_deleted == false())
             .group_by(Patient.id)
         )
         row = result.first()
@@ -160,6 +472,31 @@ class CRUDPatient(BaseCRUD[Patient]):
             }
         return None
 
+    async def get_version(
+        self,
+        db: AsyncSession,
+        patient_id: int
+    ) -> tuple[datetime, int] | None:
+        """
+        Bemor javobining versiyasi - (oxirgi o'zgarish vaqti, tekshiruvlar soni)
+
+        Shartli GET uchun yengil so'rov: bemor qatori yuklanmaydi. Tekshiruvlar
+        soni ham javobda bor, shuning uchun versiyaga kiradi.
+        """
+        from app.models.examination import Examination
+
+        result = await db.execute(
+            select(
+                func.coalesce(Patient.updated_at, Patient.created_at),
+                select(func.count(Examination.id))
+                .where(Examination.patient_id == Patient.id)
+                .scalar_subquery()
+            )
+            .where(Patient.id == patient_id, Patient.is_deleted == false())
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else None
+
 
 # Singleton instance
 crud_patient = CRUDPatient(Patient)
@@ -0,0 +1,84 @@
+"""
+Print job CRUD operations - ommaviy chop etish vazifalari uchun CRUD operatsiyalari
+"""
+import uuid as uuid_pkg
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.print_job import PrintJob
+
+from .base import commit_or_flush
+
+
+class CRUDPrintJob:
+    """
+    CRUD operatsiyalari - PrintJob model uchun
+
+    PrintJob BaseModel dan meros olmaydi (UUID kalit, soft delete yo'q),
+    shuning uchun BaseCRUD ishlatilmaydi.
+    """
+
+    async def create(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        print_format: str,
+        output: str,
+        total: int
+    ) -> PrintJob:
+        """Yangi vazifa (queued)"""
+        job = PrintJob(user_id=user_id, print_format=print_format, output=output, total=total)
+        db.add(job)
+        await db.commit()
+        return job
+
+    async def get(
+        self,
+        db: AsyncSession,
+        job_id: uuid_pkg.UUID,
+        user_id: int | None = None
+    ) -> PrintJob | None:
+        """Vazifa holati (faylsiz); user_id berilsa faqat shu foydalanuvchining vazifasi"""
+        query = select(PrintJob).where(PrintJob.id == job_id)
+        if user_id is not None:
+            query = query.where(PrintJob.user_id == user_id)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_content(
+        self,
+        db: AsyncSession,
+        job_id: uuid_pkg.UUID
+    ) -> bytes | None:
+        """Tayyor fayl"""
+        result = await db.execute(select(PrintJob.content).where(PrintJob.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def set_state(
+        self,
+        db: AsyncSession,
+        job_id: uuid_pkg.UUID,
+        **values: Any
+    ) -> None:
+        """Holat / progress / natijani yangilash (bitta UPDATE, commit bilan)"""
+        if values.get("status") in ("completed", "failed"):
+            values.setdefault("finished_at", datetime.now(UTC))
+        await db.execute(update(PrintJob).where(PrintJob.id == job_id).values(**values))
+        await db.commit()
+
+    async def purge_expired(
+        self,
+        db: AsyncSession,
+        retention: timedelta,
+        commit: bool = True
+    ) -> None:
+        """Muddati o'tgan vazifalarni (fayllari bilan) o'chirish"""
+        await db.execute(delete(PrintJob).where(PrintJob.created_at < datetime.now(UTC) - retention))
+        await commit_or_flush(db, commit)
+
+
+# Singleton instance
+crud_print_job = CRUDPrintJob()
@@ -1,12 +1,37 @@
+from collections.abc import Mapping
 from typing import Any
 
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import get_password_hash, password_needs_rehash, verify_password
 from app.models.user import User
 from app.schemas.users import UserCreate, UserUpdate
 
-from .base import BaseCRUD
+from .base import BaseCRUD, commit_or_flush
+
+# Token subject (username yoki telefon) -> sessiyaga bog'lanmagan User nusxasi.
+# Har bir worker o'z keshiga ega; boshqa workerlarda o'zgarish TTL ichida ko'rinadi.
+# TTL qisqa (USER_CACHE_TTL_SECONDS, standart 5 s): is_active / is_deleted o'zgarishi ham
+# shu vaqt ichida barcha workerlarga yetadi - akkauntni bekor qilish darhol emas.
+user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def _detached_copy(user: User) -> User:
+    """Build a detached copy of `user` that is not tied to any session."""
+    mapper = inspect(User)
+    clone: User = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(clone, attr.key, getattr(user, attr.key))
+    make_transient_to_detached(clone)
+    return clone
 
 
 class CRUDUser(BaseCRUD[User]):
@@ -60,10 +85,46 @@ class CRUDUser(BaseCRUD[User]):
         """
         return await self.get(db, username=username, is_deleted=is_deleted)
 
+    async def get_by_subject(
+        self,
+        db: AsyncSession,
+        subject: str,
+    ) -> User | None:
+        """Get the non-deleted user a token subject refers to.
+
+        The subject is tried as a username first and then as a phone number.
+        Results are served from `user_cache` when possible; a cached user is
+        merged into `db` without emitting any SQL.
+
+        Parameters
+        ----------
+        db : AsyncSession
+            The database session.
+        subject : str
+            The token's `sub` claim (username or phone).
+
+        Returns
+        -------
+        User | None
+            The user bound to `db`, or None if not found.
+        """
+        cached = user_cache.get(subject)
+        if cached is not None:
+            return await db.merge(cached, load=False)
+
+        user = await self.get_by_username(db=db, username=subject, is_deleted=False)
+        if not user:
+            user = await self.get_by_phone(db=db, phone=subject, is_deleted=False)
+
+        if user:
+            user_cache.set(subject, _detached_copy(user))
+        return user
+
     async def create(
         self,
         db: AsyncSession,
         user_create: UserCreate,
+        commit: bool = True,
     ) -> User:
         """Create a new user with hashed password.
 
@@ -73,6 +134,8 @@ class CRUDUser(BaseCRUD[User]):
             The database session.
         user_create : UserCreate
             User creation data including plain password.
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work).
 
         Returns
         -------
@@ -84,14 +147,13 @@ class CRUDUser(BaseCRUD[User]):
         Exception
             If phone or username already exists (handle in route layer).
         """
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await get_password_hash(user_create.password)
 
         user_data = user_create.model_dump(exclude={"password"})
         db_user = User(**user_data, hashed_password=hashed_password)
 
         db.add(db_user)
-        await db.commit()
-        await db.refresh(db_user)
+        await commit_or_flush(db, commit)
         return db_user
 
     async def update(
@@ -99,6 +161,7 @@ class CRUDUser(BaseCRUD[User]):
         db: AsyncSession,
         db_user: User,
         user_update: UserUpdate | dict[str, Any],
+        commit: bool = True,
     ) -> User:
         """Update user information.
 
@@ -110,6 +173,8 @@ class CRUDUser(BaseCRUD[User]):
             The existing user instance to update.
         user_update : UserUpdate | dict
             Fields to update (only provided fields will be updated).
+        commit : bool, default=True
+            Commit the transaction; False only flushes (unit of work).
 
         Returns
         -------
@@ -122,16 +187,40 @@ class CRUDUser(BaseCRUD[User]):
             update_data = user_update.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash(update_data.pop("password"))
 
         for field, value in update_data.items():
             setattr(db_user, field, value)
 
         db.add(db_user)
-        await db.commit()
-        await db.refresh(db_user)
+        await commit_or_flush(db, commit)
+        user_cache.clear()
         return db_user
 
+    async def update_many(
+        self,
+        db: AsyncSession,
+        values: Mapping[str, Any],
+        commit: bool = True,
+        **kwargs: Any,
+    ) -> int:
+        """Update matching users in one statement and drop all cached users."""
+        updated = await super().update_many(db, values, commit=commit, **kwargs)
+        user_cache.clear()
+        return updated
+
+    async def delete_many(self, db: AsyncSession, commit: bool = True, **kwargs: Any) -> int:
+        """Soft delete matching users and drop all cached users; `delete()` goes through here."""
+        deleted = await super().delete_many(db, commit=commit, **kwargs)
+        user_cache.clear()
+        return deleted
+
+    async def db_delete_many(self, db: AsyncSession, commit: bool = True, **kwargs: Any) -> int:
+        """Hard delete matching users and drop all cached users; `db_delete()` goes through here."""
+        deleted = await super().db_delete_many(db, commit=commit, **kwargs)
+        user_cache.clear()
+        return deleted
+
     async def authenticate(
         self,
         db: AsyncSession,
@@ -140,6 +229,9 @@ class CRUDUser(BaseCRUD[User]):
     ) -> User | None:
         """Authenticate a user by username/phone and password.
 
+        If the stored hash was made with a different bcrypt cost factor than
+        `BCRYPT_ROUNDS`, the password is transparently re-hashed and saved.
+
         Parameters
         ----------
         db : AsyncSession
@@ -166,6 +258,10 @@ class CRUDUser(BaseCRUD[User]):
         if not await verify_password(password, db_user.hashed_password):
             return None
 
+        # Cost factor o'zgargan bo'lsa, parolni yangi sozlama bilan qayta hash qilish
+        if password_needs_rehash(db_user.hashed_password):
+            db_user = await self.update(db, db_user=db_user, user_update={"password": password})
+
         return db_user
 
 
@@ -0,0 +1,35 @@
+"""add patient prefix indexes for typeahead
+
+Revision ID: 2a9c4e71d05b
+Revises: 73ff202b18ef
+Create Date: 2026-10-18 11:04:17.902154
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2a9c4e71d05b'
+down_revision: Union[str, None] = '73ff202b18ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ifodalar app.models.patient dagi patient_search_name / patient_phone_digits bilan bir xil bo'lishi shart
+    op.execute(
+        "CREATE INDEX ix_patient_search_name_prefix ON patient "
+        "(lower(translate(last_name || ' ' || first_name || ' ' || coalesce(middle_name, ''), "
+        "'ʻʼ‘’`´', '''''''''''''')) text_pattern_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_patient_phone_digits_prefix ON patient "
+        "(regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_patient_phone_digits_prefix', table_name='patient')
+    op.drop_index('ix_patient_search_name_prefix', table_name='patient')
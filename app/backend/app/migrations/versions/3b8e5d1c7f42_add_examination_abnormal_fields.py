@@ -0,0 +1,36 @@
+"""add examination abnormal fields
+
+Revision ID: 3b8e5d1c7f42
+Revises: e4a7c2b90f13
+Create Date: 2026-10-18 18:42:10.517203
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e5d1c7f42'
+down_revision: Union[str, None] = 'e4a7c2b90f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Mavjud qatorlar uchun bo'sh - tekshiruv keyingi tahrirda qayta hisoblanadi
+    op.add_column(
+        'examination',
+        sa.Column(
+            'abnormal_fields',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('examination', 'abnormal_fields')
@@ -0,0 +1,42 @@
+"""add examination daily stat rollup
+
+Revision ID: 5e0b8d3f6a21
+Revises: 2a9c4e71d05b
+Create Date: 2026-10-18 13:02:55.418230
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b8d3f6a21'
+down_revision: Union[str, None] = '2a9c4e71d05b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('examination_daily_stat',
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('template_type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('doctor_id', sa.Integer(), nullable=False),
+    sa.Column('examination_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['doctor_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('stat_date', 'template_type', 'status', 'doctor_id')
+    )
+    # Mavjud tekshiruvlardan boshlang'ich qiymatlar
+    op.execute(
+        "INSERT INTO examination_daily_stat "
+        "(stat_date, template_type, status, doctor_id, examination_count) "
+        "SELECT examination_date, template_type, status, doctor_id, count(*) "
+        "FROM examination WHERE NOT is_deleted "
+        "GROUP BY examination_date, template_type, status, doctor_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('examination_daily_stat')
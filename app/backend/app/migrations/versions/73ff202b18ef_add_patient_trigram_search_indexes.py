@@ -0,0 +1,36 @@
+"""add patient trigram search indexes
+
+Revision ID: 73ff202b18ef
+Revises: b1443173c749
+Create Date: 2026-10-18 10:12:41.527310
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '73ff202b18ef'
+down_revision: Union[str, None] = 'b1443173c749'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Ifodalar app.models.patient dagi patient_search_name / patient_phone_digits bilan bir xil bo'lishi shart
+    op.execute(
+        "CREATE INDEX ix_patient_search_name_trgm ON patient USING gin "
+        "(lower(translate(last_name || ' ' || first_name || ' ' || coalesce(middle_name, ''), "
+        "'ʻʼ‘’`´', '''''''''''''')) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_patient_phone_digits_trgm ON patient USING gin "
+        "(regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_patient_phone_digits_trgm', table_name='patient')
+    op.drop_index('ix_patient_search_name_trgm', table_name='patient')
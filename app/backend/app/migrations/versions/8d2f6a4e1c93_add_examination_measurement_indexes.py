@@ -0,0 +1,42 @@
+"""add examination measurement expression indexes
+
+Revision ID: 8d2f6a4e1c93
+Revises: 3b8e5d1c7f42
+Create Date: 2026-10-18 20:05:37.902114
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a4e1c93'
+down_revision: Union[str, None] = '3b8e5d1c7f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.models.examination.HOT_MEASUREMENTS bilan bir xil; ifoda examination_measurement() bilan aynan bir xil
+# bo'lishi shart - aks holda PostgreSQL analitika so'rovlarida indeksni ishlatmaydi
+HOT_MEASUREMENTS = ("total_volume", "endometrium_thickness", "cervix_length", "fetal_weight", "fhr")
+
+
+def measurement(key: str) -> str:
+    return (
+        f"CASE WHEN (jsonb_typeof(examination_data #> '{{{key}}}') = 'number') "
+        f"THEN CAST(examination_data #>> '{{{key}}}' AS FLOAT) END"
+    )
+
+
+def upgrade() -> None:
+    for key in HOT_MEASUREMENTS:
+        op.execute(
+            f"CREATE INDEX ix_examination_measure_{key} ON examination "
+            f"(template_type, examination_date, ({measurement(key)})) "
+            f"WHERE is_deleted = false AND {measurement(key)} IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    for key in reversed(HOT_MEASUREMENTS):
+        op.drop_index(f'ix_examination_measure_{key}', table_name='examination')
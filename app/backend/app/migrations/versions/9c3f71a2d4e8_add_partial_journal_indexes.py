@@ -0,0 +1,57 @@
+"""add partial journal indexes, drop is_deleted indexes
+
+Revision ID: 9c3f71a2d4e8
+Revises: 5e0b8d3f6a21
+Create Date: 2026-10-18 14:21:06.733519
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f71a2d4e8'
+down_revision: Union[str, None] = '5e0b8d3f6a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indekslar app.models.examination / app.models.patient dagi ta'riflar bilan bir xil bo'lishi shart
+JOURNAL_ORDER = "examination_date DESC, created_at DESC, id DESC"
+NOT_DELETED = "WHERE is_deleted = false"
+
+IS_DELETED_INDEXES = (
+    ("ix_examination_is_deleted", "examination"),
+    ("ix_patient_is_deleted", "patient"),
+    ("ix_template_is_deleted", "template"),
+    ("ix_user_is_deleted", "user"),
+)
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE INDEX ix_examination_journal ON examination ({JOURNAL_ORDER}) {NOT_DELETED}")
+    op.execute(
+        f"CREATE INDEX ix_examination_patient_journal ON examination (patient_id, {JOURNAL_ORDER}) {NOT_DELETED}"
+    )
+    op.execute(
+        f"CREATE INDEX ix_examination_template_journal ON examination (template_type, {JOURNAL_ORDER}) {NOT_DELETED}"
+    )
+    op.execute(f"CREATE INDEX ix_examination_status_journal ON examination (status, {JOURNAL_ORDER}) {NOT_DELETED}")
+    op.execute(f"CREATE INDEX ix_examination_recent ON examination (created_at DESC) {NOT_DELETED}")
+    op.execute(f"CREATE INDEX ix_patient_recent ON patient (created_at DESC, id DESC) {NOT_DELETED}")
+
+    # is_deleted = false deyarli barcha qatorlarga mos keladi - bunday indeks ishlatilmaydi
+    for index_name, table_name in IS_DELETED_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+
+
+def downgrade() -> None:
+    for index_name, table_name in IS_DELETED_INDEXES:
+        op.create_index(index_name, table_name, ['is_deleted'], unique=False)
+
+    op.drop_index('ix_patient_recent', table_name='patient')
+    op.drop_index('ix_examination_recent', table_name='examination')
+    op.drop_index('ix_examination_status_journal', table_name='examination')
+    op.drop_index('ix_examination_template_journal', table_name='examination')
+    op.drop_index('ix_examination_patient_journal', table_name='examination')
+    op.drop_index('ix_examination_journal', table_name='examination')
@@ -0,0 +1,44 @@
+"""add print job
+
+Revision ID: e4a7c2b90f13
+Revises: 9c3f71a2d4e8
+Create Date: 2026-10-18 16:08:41.215730
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2b90f13'
+down_revision: Union[str, None] = '9c3f71a2d4e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('print_job',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('print_format', sa.String(length=10), nullable=False),
+    sa.Column('output', sa.String(length=10), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('content', sa.LargeBinary(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_print_job_created_at'), 'print_job', ['created_at'], unique=False)
+    op.create_index(op.f('ix_print_job_user_id'), 'print_job', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_print_job_user_id'), table_name='print_job')
+    op.drop_index(op.f('ix_print_job_created_at'), table_name='print_job')
+    op.drop_table('print_job')
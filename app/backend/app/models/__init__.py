@@ -1,6 +1,8 @@
 from .examination import Examination
+from .examination_stat import ExaminationDailyStat
 from .patient import Patient
+from .print_job import PrintJob
 from .template import Template
 from .user import User
 
-__all__ = ["User", "Patient", "Examination", "Template"]
+__all__ = ["User", "Patient", "Examination", "ExaminationDailyStat", "Template", "PrintJob"]
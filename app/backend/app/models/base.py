@@ -18,14 +18,15 @@ class TimestampMixin(MappedAsDataclass):
         DateTime(timezone=True),
         nullable=True,
         default=None,
-        onupdate=datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
         server_default=text("current_timestamp(0)"),
     )
 
 
 class SoftDeleteMixin(MappedAsDataclass):
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
-    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    # Alohida indeks yo'q - so'rovlar uchun qisman indekslar (WHERE is_deleted = false) modellarda
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
 
 
 class BaseModel(Base, IDMixin, TimestampMixin, SoftDeleteMixin):
@@ -2,11 +2,27 @@
 Examination model - UZI tekshiruv ma'lumotlari
 """
 from datetime import date
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Date, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    literal_column,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.elements import ColumnElement, Grouping
 
 from .base import BaseModel
 
@@ -57,6 +73,12 @@ class Examination(BaseModel):
     # Bu yerda har bir shablon turi uchun turli xil ma'lumotlar saqlanadi
     examination_data: Mapped[dict] = mapped_column(JSONB, default=dict, kw_only=True)
 
+    # Shablondagi normal_min / normal_max dan tashqari qiymatlar: {"liver_kvr_right": "high", ...}
+    # Yozishda hisoblanadi (app.core.measurements), o'qishda qayta tekshirilmaydi
+    abnormal_fields: Mapped[dict] = mapped_column(
+        JSONB, default_factory=dict, server_default=text("'{}'"), kw_only=True
+    )
+
     # Xulosa va tavsiyalar - Conclusion
     conclusion: Mapped[str | None] = mapped_column(Text, nullable=True, kw_only=True)  # ЗАКЛЮЧЕНИЕ
     recommendations: Mapped[str | None] = mapped_column(Text, nullable=True, kw_only=True)  # РЕКОМЕНДАЦИИ
@@ -74,3 +96,59 @@ class Examination(BaseModel):
     # Relationships
     patient: Mapped["Patient"] = relationship("Patient", back_populates="examinations", init=False)
     doctor: Mapped["User"] = relationship("User", init=False)
+
+
+# Jurnal indekslari - faqat o'chirilmagan yozuvlar (is_deleted = false) uchun qisman indekslar.
+# Tartib CRUDExamination.SEARCH_KEYSET bilan bir xil (examination_date, created_at, id - hammasi DESC),
+# filtrli variantlarda filtr ustuni birinchi turadi.
+_not_deleted = Examination.is_deleted == false()
+_journal_order = (Examination.examination_date.desc(), Examination.created_at.desc(), Examination.id.desc())
+
+for _name, _prefix in (
+    ("ix_examination_journal", ()),
+    ("ix_examination_patient_journal", (Examination.patient_id,)),
+    ("ix_examination_template_journal", (Examination.template_type,)),
+    ("ix_examination_status_journal", (Examination.status,)),
+):
+    Examination.__table__.append_constraint(  # type: ignore[attr-defined]
+        Index(_name, *_prefix, *_journal_order, postgresql_where=_not_deleted)
+    )
+
+# get_recent - created_at bo'yicha oxirgilari
+Examination.__table__.append_constraint(  # type: ignore[attr-defined]
+    Index("ix_examination_recent", Examination.created_at.desc(), postgresql_where=_not_deleted)
+)
+
+
+def examination_measurement(path: str) -> ColumnElement[float]:
+    """
+    examination_data dagi son qiymat: "total_volume" yoki ichma-ich "fetus.bpd"
+
+    Son bo'lmagan (yoki yo'q) qiymat - NULL, shuning uchun ifoda hech qachon xato
+    bermaydi va indeksda ishlatilishi mumkin. Yo'l literal bo'lib yoziladi (bind
+    parametr emas) - ifoda indeksi so'rovdagi ifoda bilan aynan bir xil bo'lishi
+    kerak. path ni chaqiruvchi tekshiradi (app.schemas.analytics.METRIC_PATTERN).
+    """
+    keys: ColumnElement[Any] = literal_column(f"'{{{path.replace('.', ',')}}}'")
+    return case(
+        (
+            func.jsonb_typeof(Examination.examination_data.op("#>")(keys)) == literal_column("'number'"),
+            cast(Examination.examination_data.op("#>>")(keys), Float),
+        )
+    )
+
+
+# Analitika - eng ko'p so'raladigan o'lchovlar uchun ifoda indekslari (faqat o'lchovi bor yozuvlar)
+HOT_MEASUREMENTS = ("total_volume", "endometrium_thickness", "cervix_length", "fetal_weight", "fhr")
+
+for _key in HOT_MEASUREMENTS:
+    _value = examination_measurement(_key)
+    Examination.__table__.append_constraint(  # type: ignore[attr-defined]
+        Index(
+            f"ix_examination_measure_{_key}",
+            Examination.template_type,
+            Examination.examination_date,
+            Grouping(_value),  # CASE ifodasi indeksda qavs ichida bo'lishi shart
+            postgresql_where=and_(_not_deleted, _value.is_not(None)),
+        )
+    )
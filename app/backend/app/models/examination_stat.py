@@ -0,0 +1,27 @@
+"""
+Examination daily stat model - tekshiruvlar statistikasi uchun kunlik yig'ma jadval
+"""
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class ExaminationDailyStat(Base):
+    """
+    Kunlik yig'ma - Daily rollup of non-deleted examinations
+
+    Har bir (sana, shablon turi, holat, shifokor) uchun bitta qator.
+    CRUDExamination tekshiruv yaratilganda, o'zgartirilganda va o'chirilganda
+    examination_count ni shu tranzaksiyada oshiradi yoki kamaytiradi, shuning
+    uchun statistika so'rovlari tekshiruvlar soniga emas, kunlar soniga bog'liq.
+    """
+    __tablename__ = "examination_daily_stat"
+
+    stat_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    template_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    doctor_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id"), primary_key=True)
+    examination_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -4,9 +4,11 @@ Patient model - Bemor ma'lumotlari
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, String, Text
+from sqlalchemy import Date, Index, String, Text, false, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.search import APOSTROPHE_VARIANTS
+
 from .base import BaseModel
 
 if TYPE_CHECKING:
@@ -38,3 +40,69 @@ class Patient(BaseModel):
         cascade="all, delete-orphan",
         init=False
     )
+
+
+# Qidiruv ifodalari - trigram GIN indekslari va CRUDPatient.search aynan shu
+# ifodalarni ishlatadi (indeks ishlashi uchun so'rovdagi ifoda bir xil bo'lishi kerak).
+# Konstantalar literal_column orqali yoziladi, bind parametr bo'lib qolmasligi uchun.
+# Ism app.core.search.normalize_text kabi: apostrof variantlari "'" ga keltiriladi va kichik harflarga
+patient_search_name = func.lower(
+    func.translate(
+        Patient.last_name
+        + literal_column("' '")
+        + Patient.first_name
+        + literal_column("' '")
+        + func.coalesce(Patient.middle_name, literal_column("''")),
+        literal_column(f"'{APOSTROPHE_VARIANTS}'"),
+        literal_column("'" + "''" * len(APOSTROPHE_VARIANTS) + "'"),
+    )
+)
+patient_phone_digits = func.regexp_replace(
+    func.coalesce(Patient.phone, literal_column("''")),
+    literal_column("'[^0-9]'"),
+    literal_column("''"),
+    literal_column("'g'"),
+)
+
+Patient.__table__.append_constraint(  # type: ignore[attr-defined]
+    Index(
+        "ix_patient_search_name_trgm",
+        patient_search_name.label("search_name"),
+        postgresql_using="gin",
+        postgresql_ops={"search_name": "gin_trgm_ops"},
+    )
+)
+Patient.__table__.append_constraint(  # type: ignore[attr-defined]
+    Index(
+        "ix_patient_phone_digits_trgm",
+        patient_phone_digits.label("phone_digits"),
+        postgresql_using="gin",
+        postgresql_ops={"phone_digits": "gin_trgm_ops"},
+    )
+)
+
+# Typeahead (prefix LIKE 'abc%') uchun - text_pattern_ops collation'dan qat'i nazar ishlaydi
+Patient.__table__.append_constraint(  # type: ignore[attr-defined]
+    Index(
+        "ix_patient_search_name_prefix",
+        patient_search_name.label("search_name"),
+        postgresql_ops={"search_name": "text_pattern_ops"},
+    )
+)
+Patient.__table__.append_constraint(  # type: ignore[attr-defined]
+    Index(
+        "ix_patient_phone_digits_prefix",
+        patient_phone_digits.label("phone_digits"),
+        postgresql_ops={"phone_digits": "text_pattern_ops"},
+    )
+)
+
+# Ro'yxat va get_recent - CRUDPatient.SEARCH_KEYSET tartibida, faqat o'chirilmagan bemorlar
+Patient.__table__.append_constraint(  # type: ignore[attr-defined]
+    Index(
+        "ix_patient_recent",
+        Patient.created_at.desc(),
+        Patient.id.desc(),
+        postgresql_where=Patient.is_deleted == false(),
+    )
+)
@@ -0,0 +1,40 @@
+"""
+Print job model - ommaviy chop etish vazifalari (fon rejimida bajariladi)
+"""
+import uuid as uuid_pkg
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, Text, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid6 import uuid7
+
+from app.core.db import Base
+
+
+class PrintJob(Base):
+    """
+    Chop etish vazifasi - Bulk print job
+
+    Vazifa uni qabul qilgan worker jarayonidagi navbatda bajariladi, holati,
+    progressi va tayyor fayli esa shu jadvalda saqlanadi - gunicorn ning
+    istalgan worker i holatni va faylni qaytara oladi.
+    """
+    __tablename__ = "print_job"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id", ondelete="CASCADE"), index=True)
+    # Hujjat formati: html, pdf; natija: zip yoki bitta birlashtirilgan pdf
+    print_format: Mapped[str] = mapped_column(String(10))
+    output: Mapped[str] = mapped_column(String(10))
+
+    id: Mapped[uuid_pkg.UUID] = mapped_column(Uuid, primary_key=True, default_factory=uuid7)
+    # Holat: queued, running, completed, failed
+    status: Mapped[str] = mapped_column(String(20), default="queued")
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    done: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
+    # Tayyor fayl - holat so'rovlarida yuklanmaydi
+    content: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, default=None, deferred=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default_factory=lambda: datetime.now(UTC), index=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
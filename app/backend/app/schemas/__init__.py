@@ -1,11 +1,16 @@
+from .analytics import AnalyticsMetric, AnalyticsQuery, AnalyticsResult
 from .auth import Token, TokenData
 from .base import PersistentDeletion, TimestampSchema
-from .common import Message
+from .common import CountMode, Message, PaginatedList
 from .examination import (
+    EXAMINATION_DATA_MODELS,
+    EXAMINATION_LIST_ADAPTER,
     AbdominalExamData,
     BreastExamData,
     ExaminationCreate,
+    ExaminationDataBase,
     ExaminationList,
+    ExaminationPage,
     ExaminationRead,
     ExaminationSearch,
     ExaminationUpdate,
@@ -13,14 +18,18 @@ from .examination import (
     ObstetricsExamData,
     ThyroidExamData,
 )
-from .health import HealthCheck, ReadyCheck
+from .health import HealthCheck, MetricsCheck, PoolStats, PoolWaitTime, ReadyCheck
 from .patient import (
     PatientCreate,
+    PatientImportError,
+    PatientImportResult,
     PatientList,
     PatientRead,
     PatientSearch,
+    PatientSuggestion,
     PatientUpdate,
 )
+from .print_job import PrintJobCreate, PrintJobRead
 from .template import (
     TEMPLATE_CATEGORIES,
     TEMPLATE_TYPES,
@@ -0,0 +1,92 @@
+"""
+Analytics schemas - examination_data o'lchovlari bo'yicha analitik so'rovlar uchun Pydantic schemalar
+"""
+from datetime import date
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+# O'lchov yo'li: examination_data kaliti yoki nuqta bilan ichma-ich kalitlar ("fetus.bpd").
+# Yo'l SQL ga literal sifatida yoziladi (app.models.examination.examination_measurement) - faqat shu belgilar
+METRIC_PATTERN = r"^[A-Za-z_][A-Za-z0-9_]{0,63}(\.[A-Za-z_][A-Za-z0-9_]{0,63}){0,3}$"
+
+Aggregation = Literal["count", "avg", "min", "max", "sum", "stddev", "p10", "p25", "median", "p75", "p90"]
+
+# Guruhlash o'lchamlari:
+# - template_type, status, doctor, gender - tegishli ustun
+# - age_band - tekshiruv kunidagi yosh, age_band_years yillik oraliqlar (qiymat - oraliq boshi)
+# - day, week, month, quarter, year - examination_date davri (qiymat - davr boshi)
+# - value - o'lchov qiymati bucket_width kenglikdagi oraliqlarda (taqsimot / gistogramma)
+# - abnormal - abnormal_fields dagi belgi: low, high yoki null
+Dimension = Literal[
+    "template_type", "status", "doctor", "gender", "age_band",
+    "day", "week", "month", "quarter", "year", "value", "abnormal",
+]
+
+DEFAULT_AGGREGATIONS: tuple[Aggregation, ...] = ("count", "avg")
+
+PATIENT_DIMENSIONS = frozenset({"gender", "age_band"})
+
+
+class AnalyticsQuery(BaseModel):
+    """
+    Analitik so'rov - o'lchov, agregatsiyalar, guruhlash va filtrlar
+
+    Masalan, "yosh guruhlari bo'yicha o'rtacha endometriy qalinligi":
+    {"metric": "endometrium_thickness", "aggregations": ["count", "avg"], "group_by": ["age_band"]}
+    """
+    metric: str | None = Field(
+        default=None, pattern=METRIC_PATTERN, description="O'lchov yo'li; berilmasa faqat tekshiruvlar soni (count)"
+    )
+    aggregations: list[Aggregation] = Field(default_factory=lambda: list(DEFAULT_AGGREGATIONS), min_length=1)
+    group_by: list[Dimension] = Field(default_factory=list, max_length=3)
+
+    # Filtrlar
+    template_types: list[str] | None = Field(default=None, min_length=1, description="Shablon turlari")
+    date_from: date | None = None
+    date_to: date | None = None
+    status: str | None = Field(default=None, pattern="^(draft|completed|printed)$")
+    doctor_id: int | None = None
+    gender: str | None = None
+    age_min: int | None = Field(default=None, ge=0, le=150, description="Tekshiruv kunidagi yosh, dan")
+    age_max: int | None = Field(default=None, ge=0, le=150, description="Tekshiruv kunidagi yosh, gacha")
+    abnormal_only: bool = Field(default=False, description="Faqat o'lchovi normadan tashqari tekshiruvlar")
+
+    # Guruhlash parametrlari
+    age_band_years: int = Field(default=10, ge=1, le=50)
+    bucket_width: float | None = Field(
+        default=None, gt=0, allow_inf_nan=False, description="group_by=value uchun oraliq kengligi"
+    )
+    limit: int = Field(default=1000, ge=1, le=10000, description="Ko'pi bilan shuncha guruh")
+
+    @model_validator(mode="after")
+    def check_query(self) -> "AnalyticsQuery":
+        if self.metric is None:
+            if set(self.aggregations) != {"count"}:
+                raise ValueError("metric berilmasa faqat count agregatsiyasi mumkin")
+            if {"value", "abnormal"} & set(self.group_by) or self.abnormal_only:
+                raise ValueError("value, abnormal va abnormal_only uchun metric kerak")
+        if "value" in self.group_by and self.bucket_width is None:
+            raise ValueError("group_by=value uchun bucket_width kerak")
+        if ("abnormal" in self.group_by or self.abnormal_only) and self.metric and "." in self.metric:
+            raise ValueError("abnormal faqat yuqori darajadagi o'lchov uchun (abnormal_fields kaliti)")
+        if len(set(self.group_by)) != len(self.group_by):
+            raise ValueError("group_by takrorlanmasligi kerak")
+        return self
+
+
+class AnalyticsResult(BaseModel):
+    """Analitik so'rov natijasi - har bir guruh uchun bitta qator"""
+    metric: str | None
+    group_by: list[str]
+    aggregations: list[str]
+    indexed: bool = Field(..., description="O'lchov uchun ifoda indeksi bormi (HOT_MEASUREMENTS)")
+    rows: list[dict[str, Any]]
+    truncated: bool = Field(..., description="Guruhlar limit dan ko'p")
+
+
+class AnalyticsMetric(BaseModel):
+    """examination_data dagi son o'lchov"""
+    metric: str
+    examination_count: int
+    indexed: bool
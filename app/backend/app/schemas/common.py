@@ -1,7 +1,41 @@
+from enum import StrEnum
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
 
 class Message(BaseModel):
     """Generic message response schema"""
 
     message: str
+
+
+class CountMode(StrEnum):
+    """How the total of a paginated listing is computed.
+
+    - exact: separate ``COUNT(*)`` over all matching rows
+    - estimated: planner statistics (``pg_class.reltuples``) for unfiltered listings
+    - capped: count at most ``COUNT_CAP + 1`` rows (`app.crud.pagination`); total is a lower bound when hit
+    - window: ``COUNT(*) OVER ()`` returned together with the page in one query
+    - none: total is not computed
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CAPPED = "capped"
+    WINDOW = "window"
+    NONE = "none"
+
+
+class PaginatedList(BaseModel, Generic[T]):
+    """Sahifalangan ro'yxat javobi - typed envelope for paginated listings"""
+
+    items: list[T]
+    total: int | None
+    page: int
+    per_page: int
+    pages: int | None
+    next_cursor: str | None = None
+    count_mode: CountMode
@@ -1,10 +1,15 @@
 """
 Examination schemas - UZI tekshiruv ma'lumotlari uchun Pydantic schemalar
 """
+import re
 from datetime import date, datetime
-from typing import Any
+from typing import Any, get_args
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+
+from app.core.templates import template_registry
+
+from .common import PaginatedList
 
 
 class ExaminationBase(BaseModel):
@@ -42,6 +47,9 @@ class ExaminationRead(ExaminationBase):
     doctor_id: int
     created_at: datetime
     updated_at: datetime | None = None
+    abnormal_fields: dict[str, str] = Field(
+        default_factory=dict, description="Normadan tashqari maydonlar: nom -> low / high"
+    )
 
     # Nested data
     patient_name: str | None = None
@@ -64,6 +72,20 @@ class ExaminationList(BaseModel):
     status: str
     created_at: datetime
 
+    @model_validator(mode="after")
+    def set_template_name(self) -> "ExaminationList":
+        """Shablon nomini template_type dan to'ldirish"""
+        if self.template_name is None:
+            self.template_name = template_registry.name_ru(self.template_type)
+        return self
+
+
+# Tekshiruvlar sahifasi
+ExaminationPage = PaginatedList[ExaminationList]
+
+# CRUD qatorlarini (Row) bitta o'tishda validatsiya qilish uchun
+EXAMINATION_LIST_ADAPTER = TypeAdapter(list[ExaminationList])
+
 
 class ExaminationSearch(BaseModel):
     """Tekshiruv qidirish parametrlari"""
@@ -76,11 +98,67 @@ class ExaminationSearch(BaseModel):
     per_page: int = Field(20, ge=1, le=100)
 
 
+# Ommaviy amallar - bitta so'rovda ko'pi bilan shuncha tekshiruv
+EXAMINATION_BULK_MAX = 1000
+
+
+class ExaminationBulkStatus(BaseModel):
+    """Bir nechta tekshiruv holatini o'zgartirish"""
+    examination_ids: list[int] = Field(..., min_length=1, max_length=EXAMINATION_BULK_MAX)
+    status: str = Field(..., pattern="^(draft|completed|printed)$")
+
+
+class ExaminationBulkDelete(BaseModel):
+    """Bir nechta tekshiruvni o'chirish (soft delete)"""
+    examination_ids: list[int] = Field(..., min_length=1, max_length=EXAMINATION_BULK_MAX)
+
+
+class ExaminationBulkResult(BaseModel):
+    """Ommaviy amal natijasi"""
+    requested: int = Field(..., description="So'ralgan tekshiruvlar soni")
+    affected: int = Field(..., description="Haqiqatan o'zgargan tekshiruvlar soni")
+
+
 # ============================================================================
 # Shablon turlari uchun ma'lumotlar strukturalari
 # ============================================================================
 
-class AbdominalExamData(BaseModel):
+# Matn ko'rinishidagi raqam (o'nli vergul bilan ham: "12,5")
+_NUMBER_TEXT = re.compile(r"^[+-]?\d+(?:[.,]\d+)?$")
+
+
+def _is_numeric(annotation: Any) -> bool:
+    return any(arg in (int, float) for arg in (annotation, *get_args(annotation)))
+
+
+class ExaminationDataBase(BaseModel):
+    """
+    Tekshiruv ma'lumotlari (examination_data) uchun asos
+
+    Shablonda tavsiflangan, lekin modelda yo'q maydonlar saqlanib qoladi
+    (extra="allow"). Matnlar tozalanadi: bo'sh qator - None, raqamli
+    maydonlarda "12,5" - 12.5.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    @model_validator(mode="before")
+    @classmethod
+    def clean_values(cls, data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        cleaned: dict[str, Any] = {}
+        for name, value in data.items():
+            if isinstance(value, str):
+                value = value.strip() or None
+                field = cls.model_fields.get(name)
+                numeric = field is not None and _is_numeric(field.annotation)
+                if value is not None and numeric and _NUMBER_TEXT.match(value):
+                    value = value.replace(",", ".")
+            cleaned[name] = value
+        return cleaned
+
+
+class AbdominalExamData(ExaminationDataBase):
     """Qorin bo'shlig'i UZI ma'lumotlari - Брюшное"""
     # Jigar - Печень
     liver_kvr_right: float | None = Field(None, description="КВР правой доли, мм")
@@ -120,7 +198,7 @@ class AbdominalExamData(BaseModel):
     kidney_left_parenchyma: float | None = Field(None, description="Паренхима левой почки, мм")
 
 
-class GynecologyExamData(BaseModel):
+class GynecologyExamData(ExaminationDataBase):
     """Ginekologiya UZI ma'lumotlari - Матка, Кисты, Миома"""
     # Hayz kuni
     last_menstruation: date | None = Field(None, description="День последней менструации")
@@ -155,7 +233,7 @@ class GynecologyExamData(BaseModel):
     fluid_in_pelvis: str | None = Field(None, description="Жидкость в малом тазу")
 
 
-class ObstetricsExamData(BaseModel):
+class ObstetricsExamData(ExaminationDataBase):
     """Homiladorlik UZI ma'lumotlari - Скрининг"""
     # Homiladorlik
     last_menstruation: date | None = Field(None, description="1-й день последней менструации")
@@ -191,7 +269,7 @@ class ObstetricsExamData(BaseModel):
     internal_os: str | None = Field(None, description="Внутренний зев")
 
 
-class BreastExamData(BaseModel):
+class BreastExamData(ExaminationDataBase):
     """Sut bezlari UZI ma'lumotlari - Молочные железы"""
     # Hayz kuni
     last_menstruation: date | None = Field(None, description="День ПМЦ")
@@ -216,7 +294,7 @@ class BreastExamData(BaseModel):
     birads: int | None = Field(None, ge=0, le=6, description="BI-RADS категория")
 
 
-class ThyroidExamData(BaseModel):
+class ThyroidExamData(ExaminationDataBase):
     """Qalqonsimon bez UZI ma'lumotlari - Щитовидная железа"""
     # O'ng bo'lak - Правая доля
     right_length: float | None = Field(None, description="Длина справа, мм")
@@ -240,3 +318,20 @@ class ThyroidExamData(BaseModel):
 
     # Limfa tugunlari
     lymph_nodes: str | None = Field(None, description="Лимфоузлы шеи")
+
+
+# Shablon turi -> examination_data modeli (ro'yxatda yo'q turlar - ExaminationDataBase)
+EXAMINATION_DATA_MODELS: dict[str, type[ExaminationDataBase]] = {
+    "abdominal": AbdominalExamData,
+    "gynecology_uterus": GynecologyExamData,
+    "gynecology_cyst": GynecologyExamData,
+    "gynecology_myoma": GynecologyExamData,
+    "breast": BreastExamData,
+    "thyroid": ThyroidExamData,
+    "thyroid_child": ThyroidExamData,
+    "obstetrics_1": ObstetricsExamData,
+    "obstetrics_2": ObstetricsExamData,
+    "obstetrics_3": ObstetricsExamData,
+    "obstetrics_multi": ObstetricsExamData,
+    "doppler": ObstetricsExamData,
+}
@@ -15,3 +15,25 @@ class ReadyCheck(BaseModel):
     app: str
     database: str
     timestamp: str
+
+
+class PoolWaitTime(BaseModel):
+    buckets: dict[str, int]
+    sum: float
+    count: int
+
+
+class PoolStats(BaseModel):
+    pool: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    max_overflow: int | None = None
+    wait_time_seconds: PoolWaitTime | None = None
+
+
+class MetricsCheck(BaseModel):
+    database: PoolStats
+    replica: PoolStats | None = None
+    timestamp: str
@@ -60,6 +60,29 @@ class PatientList(BaseModel):
     examination_count: int = 0
 
 
+class PatientSuggestion(BaseModel):
+    """Bemor qidiruvi uchun qisqa taklif (typeahead)"""
+    id: int
+    name: str
+    phone: str | None = None
+
+
+class PatientImportError(BaseModel):
+    """Import qilinmagan qator"""
+    row: int = Field(..., description="Fayldagi qator raqami (sarlavha - 1-qator)")
+    field: str | None = Field(None, description="Xatolik maydoni")
+    message: str
+
+
+class PatientImportResult(BaseModel):
+    """Bemorlarni ommaviy import qilish natijasi"""
+    total_rows: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    error_count: int = Field(default=0, description="Barcha xato qatorlar soni (errors ro'yxati cheklangan)")
+    errors: list[PatientImportError] = Field(default_factory=list)
+
+
 class PatientSearch(BaseModel):
     """Bemor qidirish parametrlari"""
     query: str | None = Field(None, description="Qidiruv so'zi (ism, telefon)")
@@ -0,0 +1,53 @@
+"""
+Print job schemas - ommaviy chop etish vazifalari uchun Pydantic schemalar
+"""
+import uuid as uuid_pkg
+from datetime import date, datetime
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class PrintJobCreate(BaseModel):
+    """
+    Ommaviy chop etish vazifasi
+
+    Tekshiruvlar examination_ids bo'yicha yoki GET /examinations filtrlari
+    bo'yicha tanlanadi (ikkalasi berilsa - ikkala shart ham).
+    """
+    examination_ids: list[int] | None = Field(None, min_length=1, description="Tekshiruvlar ID lari")
+    patient_id: int | None = None
+    template_type: str | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    status: str | None = Field(None, pattern="^(draft|completed|printed)$")
+    print_format: str = Field("pdf", pattern="^(html|pdf)$", description="Hujjat formati: html/pdf")
+    output: str = Field("zip", pattern="^(zip|pdf)$", description="Natija: zip arxiv yoki bitta pdf")
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "PrintJobCreate":
+        if self.output == "pdf" and self.print_format != "pdf":
+            raise ValueError("Birlashtirilgan pdf faqat print_format=pdf bilan")
+        if self.examination_ids is None and not any(
+            (self.patient_id, self.template_type, self.date_from, self.date_to, self.status)
+        ):
+            raise ValueError("examination_ids yoki kamida bitta filtr ko'rsatilishi kerak")
+        return self
+
+    def filters(self) -> dict[str, object]:
+        """CRUDExamination.get_for_print() uchun filtrlar"""
+        return self.model_dump(include={"patient_id", "template_type", "date_from", "date_to", "status"})
+
+
+class PrintJobRead(BaseModel):
+    """Vazifa holati"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid_pkg.UUID
+    status: str = Field(..., description="queued, running, completed, failed")
+    print_format: str
+    output: str
+    total: int
+    done: int
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
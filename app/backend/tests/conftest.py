@@ -0,0 +1,182 @@
+"""
+Test fixtures - ilova xotiradagi SQLite bazasida, bajarilgan SQL statement lar sanaladi
+
+PostgreSQL ga xos DDL (JSONB, current_timestamp(0), ifoda indekslari) SQLite
+uchun moslashtiriladi; so'rovlar o'zgarishsiz qoladi. Statement soni testlari
+har bir endpoint nechta round trip qilishini qotiradi (N+1 va ortiqcha
+SELECT lar regressiyasini ushlash uchun).
+"""
+from collections.abc import AsyncIterator, Iterator
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Column, MetaData, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
+
+from app.api.deps import get_current_user
+from app.core import db as core_db
+from app.crud.patient import suggest_cache
+from app.crud.users import user_cache
+from app.main import app
+from app.models import Examination, Patient, User
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_: Any, compiler: Any, **kw: Any) -> str:
+    return "JSON"
+
+
+@compiles(CreateColumn, "sqlite")
+def _create_column_sqlite(element: CreateColumn, compiler: Any, **kw: Any) -> str:
+    text: str = compiler.visit_create_column(element, **kw)
+    return text.replace("current_timestamp(0)", "CURRENT_TIMESTAMP")
+
+
+def _sqlite_metadata() -> MetaData:
+    # PostgreSQL ifodalari (trigram, JSONB yo'llari) bo'yicha indekslar SQLite da yaratilmaydi
+    metadata = MetaData()
+    for table in core_db.Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for index in list(copy.indexes):
+            if not all(isinstance(expression, Column) for expression in index.expressions):
+                copy.indexes.discard(index)
+    return metadata
+
+
+class StatementLog(list[str]):
+    """SQL statements sent to the database, in order; ``COMMIT`` is logged too."""
+
+    @property
+    def queries(self) -> list[str]:
+        """Statements without the ``COMMIT`` markers."""
+        return [statement for statement in self if statement != "COMMIT"]
+
+    @property
+    def commits(self) -> int:
+        return self.count("COMMIT")
+
+
+@pytest_asyncio.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _functions(dbapi_connection: Any, connection_record: Any) -> None:
+        # SQLite 3.44 dan oldin concat_ws yo'q
+        dbapi_connection.create_function(
+            "concat_ws", -1, lambda sep, *parts: sep.join(str(part) for part in parts if part is not None)
+        )
+        dbapi_connection.create_function(
+            "translate", 3, lambda value, old, new: None if value is None else value.translate(str.maketrans(old, new))
+        )
+
+    async with engine.begin() as connection:
+        await connection.run_sync(_sqlite_metadata().create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine: AsyncEngine) -> StatementLog:
+    log = StatementLog()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _statement(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        log.append(statement)
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _commit(conn: Any) -> None:
+        log.append("COMMIT")
+
+    return log
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> async_sessionmaker[AsyncSession]:
+    # Ilova dependency lari sessiyani shu fabrikalardan oladi
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(core_db, "local_session", factory)
+    monkeypatch.setattr(core_db, "local_read_session", factory)
+    return factory
+
+
+@pytest_asyncio.fixture
+async def doctor(session_factory: async_sessionmaker[AsyncSession]) -> User:
+    async with session_factory() as db:
+        user = User(
+            first_name="Aziz",
+            last_name="Karimov",
+            middle_name="Toshmatovich",
+            username="doctor",
+            phone="+998900000001",
+            hashed_password="!",
+            is_superuser=True,
+        )
+        db.add(user)
+        await db.commit()
+    return user
+
+
+@pytest_asyncio.fixture
+async def patient(session_factory: async_sessionmaker[AsyncSession]) -> Patient:
+    async with session_factory() as db:
+        patient = Patient(
+            last_name="Karimova",
+            first_name="Dilnoza",
+            middle_name=None,
+            birth_date=date(1990, 5, 1),
+            gender="female",
+            phone="+998901234567",
+            address=None,
+            notes=None,
+        )
+        db.add(patient)
+        await db.commit()
+    return patient
+
+
+@pytest_asyncio.fixture
+async def examinations(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, patient: Patient
+) -> list[Examination]:
+    async with session_factory() as db:
+        rows = [
+            Examination(
+                patient_id=patient.id,
+                doctor_id=doctor.id,
+                examination_date=date(2026, 1, 1) + timedelta(days=i),
+                template_type=("thyroid", "abdominal")[i % 2],
+                examination_data={"total_volume": 10 + i},
+                conclusion=None,
+                recommendations=None,
+                notes=None,
+                status="completed",
+            )
+            for i in range(5)
+        ]
+        db.add_all(rows)
+        await db.commit()
+    return rows
+
+
+@pytest.fixture
+def current_user(doctor: User) -> Iterator[User]:
+    # Autentifikatsiya (token va foydalanuvchi keshi) statement soniga kirmasin
+    app.dependency_overrides[get_current_user] = lambda: doctor
+    yield doctor
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest_asyncio.fixture
+async def client(session_factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[AsyncClient]:
+    user_cache.clear()
+    suggest_cache.clear()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test/api/v1") as client:
+        yield client
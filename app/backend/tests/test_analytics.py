@@ -0,0 +1,33 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.crud.analytics import build_query
+from app.models import User
+from app.schemas.analytics import AnalyticsQuery
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("bucket_width", ["Infinity", "1e999", "NaN"])
+async def test_non_finite_bucket_width_is_rejected(
+    client: AsyncClient, current_user: User, bucket_width: str
+) -> None:
+    response = await client.post(
+        "/analytics/query",
+        content=f'{{"metric": "total_volume", "group_by": ["value"], "bucket_width": {bucket_width}}}',
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
+
+
+async def test_bucket_width_is_one_bound_parameter() -> None:
+    query = AnalyticsQuery(metric="total_volume", aggregations=["count"], group_by=["value"], bucket_width=2.5)
+    compiled = build_query(query).compile(dialect=asyncpg.dialect())
+
+    # SELECT va GROUP BY dagi ifoda bitta parametrdan foydalanadi - PostgreSQL ularni bir xil deb biladi
+    assert "2.5" not in str(compiled)
+    assert compiled.params["bucket_width"] == 2.5
+    assert compiled.positiontup is not None
+    assert compiled.positiontup.count("bucket_width") == 1
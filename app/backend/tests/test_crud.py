@@ -0,0 +1,170 @@
+from datetime import date
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.exceptions import UnprocessableEntityException
+from app.crud.examination import crud_examination
+from app.crud.patient import crud_patient
+from app.models import Examination, ExaminationDailyStat, Patient, User
+from app.schemas.examination import ExaminationUpdate
+
+from .conftest import StatementLog
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_create_many_applies_defaults(
+    session_factory: async_sessionmaker[AsyncSession],
+    doctor: User,
+    patient: Patient,
+    statements: StatementLog,
+) -> None:
+    rows = [
+        {
+            "patient_id": patient.id,
+            "doctor_id": doctor.id,
+            "examination_date": date(2026, 2, day),
+            "template_type": "thyroid",
+            "examination_data": {"total_volume": day},
+            "conclusion": None,
+            "recommendations": None,
+            "notes": None,
+        }
+        for day in (1, 2, 3)
+    ]
+    statements.clear()
+    async with session_factory() as db:
+        examinations = await crud_examination.create_many(db, rows, chunk_size=2)
+
+    # SQLite da sort_by_parameter_order har bir qatorni alohida INSERT qiladi (PostgreSQL da bo'lak bitta)
+    assert statements.queries[-1].startswith("INSERT INTO examination_daily_stat")
+    assert statements.commits == 1
+    assert [examination.examination_date.day for examination in examinations] == [1, 2, 3]
+    for examination in examinations:
+        assert examination.id is not None
+        assert examination.status == "draft"
+        assert examination.is_deleted is False
+        assert examination.created_at is not None
+        assert examination.abnormal_fields == {}
+
+
+
+async def _thyroid_examination(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, patient: Patient, data: dict[str, str]
+) -> Examination:
+    async with session_factory() as db:
+        [examination] = await crud_examination.create_many(
+            db,
+            [
+                {
+                    "patient_id": patient.id,
+                    "doctor_id": doctor.id,
+                    "examination_date": date(2026, 2, 1),
+                    "template_type": "thyroid",
+                    "examination_data": data,
+                    "conclusion": None,
+                    "recommendations": None,
+                    "notes": None,
+                }
+            ],
+        )
+    return examination
+
+
+async def test_update_many_revalidates_data_for_new_template(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, patient: Patient
+) -> None:
+    # thyroid shablonida liver_kkr tavsiflanmagan - matn o'zgarishsiz saqlanadi
+    examination = await _thyroid_examination(session_factory, doctor, patient, {"liver_kkr": "12,5"})
+    assert examination.examination_data == {"liver_kkr": "12,5"}
+
+    async with session_factory() as db:
+        updated = await crud_examination.update_many(db, {"template_type": "abdominal"}, id=[examination.id])
+    assert updated == 1
+
+    async with session_factory() as db:
+        stored = await crud_examination.get_by_id(db, examination.id, include_relations=False)
+    assert stored is not None
+    assert stored.template_type == "abdominal"
+    assert stored.examination_data == {"liver_kkr": 12.5}
+
+
+async def test_update_many_rejects_data_invalid_for_new_template(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, patient: Patient
+) -> None:
+    examination = await _thyroid_examination(session_factory, doctor, patient, {"liver_kkr": "keng"})
+
+    async with session_factory() as db:
+        with pytest.raises(UnprocessableEntityException):
+            await crud_examination.update_many(db, {"template_type": "abdominal"}, id=[examination.id])
+
+
+async def _rollup(db: AsyncSession) -> dict[tuple[Any, ...], int]:
+    result = await db.execute(
+        select(
+            ExaminationDailyStat.stat_date,
+            ExaminationDailyStat.template_type,
+            ExaminationDailyStat.status,
+            ExaminationDailyStat.examination_count,
+        ).where(ExaminationDailyStat.examination_count != 0)
+    )
+    return {(stat_date, template_type, status): count for stat_date, template_type, status, count in result}
+
+
+async def test_update_of_stale_examination_moves_current_stat(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, patient: Patient
+) -> None:
+    examination = await _thyroid_examination(session_factory, doctor, patient, {})
+
+    async with session_factory() as db:
+        # Shu sessiyada eskirgan nusxa - boshqa so'rov sanani o'zgartirguncha yuklangan
+        stale = await crud_examination.get_by_id(db, examination.id, include_relations=False)
+        async with session_factory() as other:
+            current = await crud_examination.get_by_id(other, examination.id, include_relations=False, for_update=True)
+            assert current is not None
+            await crud_examination.update(
+                other, current, ExaminationUpdate.model_validate({"examination_date": date(2026, 3, 1)})
+            )
+
+        locked = await crud_examination.get_by_id(db, examination.id, include_relations=False, for_update=True)
+        assert locked is stale and locked is not None
+        assert locked.examination_date == date(2026, 3, 1)
+        await crud_examination.update(db, locked, ExaminationUpdate(status="completed"))
+
+        assert await _rollup(db) == {(date(2026, 3, 1), "thyroid", "completed"): 1}
+
+
+async def test_patient_hard_delete_removes_examinations_from_stat(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, patient: Patient
+) -> None:
+    await _thyroid_examination(session_factory, doctor, patient, {})
+
+    async with session_factory() as db:
+        assert await crud_patient.db_delete(db, id=patient.id)
+
+        assert await _rollup(db) == {}
+        assert await db.scalar(select(func.count()).select_from(Examination)) == 0
+
+
+async def test_suggest_matches_any_apostrophe_variant(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with session_factory() as db:
+        db.add(
+            Patient(
+                last_name="Gʻaniyeva",
+                first_name="Oʻgʻiloy",
+                middle_name=None,
+                birth_date=None,
+                gender="female",
+                phone=None,
+                address=None,
+                notes=None,
+            )
+        )
+        await db.commit()
+
+        suggestions = await crud_patient.suggest(db, "G'aniyeva O'g'il")
+
+    assert [suggestion.name for suggestion in suggestions] == ["Gʻaniyeva Oʻgʻiloy"]
@@ -0,0 +1,110 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.templates import template_registry
+from app.models import Examination, User
+
+from .conftest import StatementLog
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_list_is_one_query_plus_count(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.get("/examinations", params={"per_page": 3})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == len(examinations)
+    assert len(body["items"]) == 3
+    assert body["items"][0]["patient_name"] == "Karimova Dilnoza"
+    # Sahifa (bemor JOIN bilan) va COUNT - bemorlar uchun alohida SELECT yo'q
+    assert len(statements.queries) == 2
+
+
+async def test_list_window_count_is_one_query(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.get("/examinations", params={"per_page": 3, "count_mode": "window"})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == len(examinations)
+    assert len(statements.queries) == 1
+
+
+async def test_recent_is_one_query(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.get("/examinations/recent", params={"limit": 3})
+
+    assert response.status_code == 200
+    assert [item["patient_name"] for item in response.json()] == ["Karimova Dilnoza"] * 3
+    assert len(statements.queries) == 1
+
+
+async def test_detail_loads_patient_and_doctor_in_one_query(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    examination = examinations[0]
+    statements.clear()
+    response = await client.get(f"/examinations/{examination.id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["patient_name"] == "Karimova Dilnoza"
+    assert body["doctor_name"] == "Aziz Karimov"
+    # Shartli GET versiyasi va tekshiruv (bemor, shifokor JOIN bilan)
+    assert len(statements.queries) == 2
+    assert "JOIN patient" in statements.queries[1] and "JOIN user" in statements.queries[1]
+
+
+async def test_detail_not_modified_is_one_query(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    url = f"/examinations/{examinations[0].id}"
+    etag = (await client.get(url)).headers["ETag"]
+
+    statements.clear()
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert len(statements.queries) == 1
+
+
+async def test_detail_etag_changes_with_template_registry(
+    client: AsyncClient,
+    current_user: User,
+    examinations: list[Examination],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = f"/examinations/{examinations[0].id}"
+    etag = (await client.get(url)).headers["ETag"]
+
+    # Shablon nomi o'zgargan (reyestr qayta yuklangan) - keshdagi template_name eskirgan
+    monkeypatch.setattr(template_registry, "version", "renamed")
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize("count_mode", ["exact", "window"])
+async def test_full_last_page_has_no_next_cursor(
+    client: AsyncClient, current_user: User, examinations: list[Examination], count_mode: str
+) -> None:
+    response = await client.get("/examinations", params={"per_page": 3, "count_mode": count_mode})
+    first = response.json()
+    assert len(first["items"]) == 3
+    assert first["next_cursor"] is not None
+
+    response = await client.get(
+        "/examinations", params={"per_page": 2, "count_mode": count_mode, "cursor": first["next_cursor"]}
+    )
+    last = response.json()
+    # Qolgan 2 ta yozuv sahifani aynan to'ldiradi - bo'sh sahifaga kursor berilmaydi
+    assert len(last["items"]) == 2
+    assert last["next_cursor"] is None
@@ -0,0 +1,85 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api import printing
+from app.core.render import PrintFormat, document_cache
+from app.crud import crud_examination, crud_print_job
+from app.models import Examination, User
+from app.models.print_job import PrintJob
+from app.schemas.print_job import PrintJobCreate
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _run_job(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, examinations: list[Examination]
+) -> PrintJob:
+    async with session_factory() as db:
+        job = await crud_print_job.create(db, user_id=doctor.id, print_format="html", output="zip", total=0)
+    job_in = PrintJobCreate(
+        examination_ids=[examination.id for examination in examinations], status=None, print_format="html", output="zip"
+    )
+    await printing.run_print_job(job.id, job_in)
+    return job
+
+
+async def _statuses(session_factory: async_sessionmaker[AsyncSession]) -> set[str]:
+    async with session_factory() as db:
+        return set(await db.scalars(select(Examination.status)))
+
+
+@pytest.fixture(autouse=True)
+def _print_session(session_factory: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(printing, "local_session", session_factory)
+    document_cache.clear()
+
+
+async def test_print_job_marks_printed_with_the_result(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, examinations: list[Examination]
+) -> None:
+    job = await _run_job(session_factory, doctor, examinations)
+
+    async with session_factory() as db:
+        stored = await crud_print_job.get(db, job.id)
+    assert stored is not None and stored.status == "completed"
+    assert await _statuses(session_factory) == {"printed"}
+
+
+async def test_failed_print_job_keeps_examination_status(
+    session_factory: async_sessionmaker[AsyncSession],
+    doctor: User,
+    examinations: list[Examination],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def failing_render(*args: Any) -> bytes:
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(printing, "render", failing_render)
+    with pytest.raises(ExceptionGroup):
+        await _run_job(session_factory, doctor, examinations)
+
+    async with session_factory() as db:
+        job = await db.scalar(select(PrintJob))
+    assert job is not None
+    assert job.status == "failed"
+    # "printed" fayl bilan birga commit qilinadi - xato bo'lsa holat o'zgarmaydi
+    assert await _statuses(session_factory) == {"completed"}
+
+
+async def test_document_cache_follows_doctor_changes(
+    session_factory: async_sessionmaker[AsyncSession], doctor: User, examinations: list[Examination]
+) -> None:
+    async with session_factory() as db:
+        examination = await crud_examination.get_by_id(db, examinations[0].id, joined=True)
+        assert examination is not None
+        before = await printing.render_examination(examination, PrintFormat.HTML)
+
+        examination.doctor.first_name = "Jasur"
+        await db.commit()
+        after = await printing.render_examination(examination, PrintFormat.HTML)
+
+    assert b"Aziz Karimov" in before
+    assert b"Jasur Karimov" in after
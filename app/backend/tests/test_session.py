@@ -0,0 +1,89 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.db import async_get_db
+from app.core.security import create_access_token
+from app.models import Examination, Patient, User
+
+from .conftest import StatementLog
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def checkouts(engine: AsyncEngine) -> list[int]:
+    log: list[int] = []
+
+    @event.listens_for(engine.sync_engine.pool, "checkout")
+    def _checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        log.append(id(connection_record))
+
+    return log
+
+
+async def _auth_headers(doctor: User) -> dict[str, str]:
+    # Haqiqiy autentifikatsiya - get_current_user route bilan bir sessiyani bo'lishadi
+    return {"Authorization": f"Bearer {await create_access_token(data={'sub': doctor.username})}"}
+
+
+async def test_print_is_one_connection_and_one_commit(
+    client: AsyncClient,
+    doctor: User,
+    examinations: list[Examination],
+    statements: StatementLog,
+    checkouts: list[int],
+) -> None:
+    headers = await _auth_headers(doctor)
+    statements.clear()
+    response = await client.get(f"/examinations/{examinations[0].id}/print", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["examination"]["status"] == "printed"
+    assert len(checkouts) == 1
+    # Holat va kunlik yig'ma - so'rov oxirida bitta commit
+    assert statements.commits == 1
+
+
+async def test_read_only_request_does_not_commit(
+    client: AsyncClient,
+    doctor: User,
+    examinations: list[Examination],
+    statements: StatementLog,
+    checkouts: list[int],
+) -> None:
+    headers = await _auth_headers(doctor)
+    statements.clear()
+    response = await client.get(f"/examinations/{examinations[0].id}", headers=headers)
+
+    assert response.status_code == 200
+    assert len(checkouts) == 1
+    assert statements.commits == 0
+
+
+async def test_failed_request_rolls_back_flushed_writes(
+    session_factory: async_sessionmaker[AsyncSession], patient: Patient
+) -> None:
+    sessions = async_get_db()
+    db = await anext(sessions)
+    db.add(
+        Patient(
+            last_name="Rahimov",
+            first_name="Sardor",
+            middle_name=None,
+            birth_date=patient.birth_date,
+            gender="male",
+            phone=None,
+            address=None,
+            notes=None,
+        )
+    )
+    await db.flush()
+    with pytest.raises(RuntimeError):
+        await sessions.athrow(RuntimeError("keyingi qadam xatosi"))
+
+    async with session_factory() as check:
+        assert await check.scalar(select(func.count()).select_from(Patient)) == 1
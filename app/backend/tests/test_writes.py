@@ -0,0 +1,152 @@
+import pytest
+from httpx import AsyncClient
+
+from app.models import Examination, Patient, User
+
+from .conftest import StatementLog
+
+pytestmark = pytest.mark.asyncio
+
+NEW_PATIENT = {"last_name": "Rahimov", "first_name": "Sardor", "birth_date": "1985-03-12", "gender": "male"}
+
+
+def assert_no_reread(statements: StatementLog, write: str) -> None:
+    """Yozuvdan keyin qatorni qayta o'qish (refresh SELECT) yo'q va bitta COMMIT."""
+    queries = statements.queries
+    first_write = next(i for i, statement in enumerate(queries) if statement.startswith(write))
+    assert not [statement for statement in queries[first_write:] if statement.startswith("SELECT")]
+    assert statements.commits == 1
+
+
+async def test_create_patient_is_one_insert(
+    client: AsyncClient, current_user: User, statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.post("/patients", json=NEW_PATIENT)
+
+    assert response.status_code == 200
+    assert response.json()["id"]
+    assert len(statements.queries) == 1
+    assert statements.queries[0].startswith("INSERT INTO patient")
+    assert statements.commits == 1
+
+
+async def test_update_patient_is_one_update_returning(
+    client: AsyncClient, current_user: User, patient: Patient, statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.put(f"/patients/{patient.id}", json={"notes": "Allergiya yo'q"})
+
+    assert response.status_code == 200
+    assert response.json()["notes"] == "Allergiya yo'q"
+    assert len(statements.queries) == 1
+    assert statements.queries[0].startswith("UPDATE patient") and "RETURNING" in statements.queries[0]
+    assert statements.commits == 1
+
+
+async def test_delete_patient_is_one_update_returning(
+    client: AsyncClient, current_user: User, patient: Patient, statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.delete(f"/patients/{patient.id}")
+
+    assert response.status_code == 200
+    assert len(statements.queries) == 1
+    assert statements.queries[0].startswith("UPDATE patient") and "RETURNING" in statements.queries[0]
+    assert statements.commits == 1
+
+    # Ikkinchi marta o'chirish - shu bitta shartli UPDATE hech narsa qaytarmaydi
+    statements.clear()
+    assert (await client.delete(f"/patients/{patient.id}")).status_code == 404
+    assert len(statements.queries) == 1
+
+
+async def test_create_examination_does_not_reread(
+    client: AsyncClient, current_user: User, patient: Patient, statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.post(
+        "/examinations", json={"patient_id": patient.id, "template_type": "thyroid", "examination_data": {}}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["id"]
+    # Bemor tekshiruvi, INSERT va kunlik yig'ma upsert
+    assert len(statements.queries) == 3
+    assert_no_reread(statements, "INSERT INTO examination")
+
+
+async def test_update_examination_does_not_reread(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.put(f"/examinations/{examinations[0].id}", json={"conclusion": "Patologiya yo'q"})
+
+    assert response.status_code == 200
+    assert response.json()["conclusion"] == "Patologiya yo'q"
+    # Tekshiruvni yuklash va UPDATE
+    assert len(statements.queries) == 2
+    assert_no_reread(statements, "UPDATE examination")
+
+
+async def test_update_examination_status_is_one_update_returning(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.patch(f"/examinations/{examinations[0].id}/status", params={"status": "printed"})
+
+    assert response.status_code == 200
+    assert statements.queries[0].startswith("UPDATE examination") and "RETURNING" in statements.queries[0]
+    # UPDATE dan keyin faqat kunlik yig'ma upsert bo'lishi mumkin
+    assert len(statements.queries) <= 2
+    assert_no_reread(statements, "UPDATE examination")
+
+
+async def test_delete_examination_is_one_update_returning(
+    client: AsyncClient, current_user: User, examinations: list[Examination], statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.delete(f"/examinations/{examinations[0].id}")
+
+    assert response.status_code == 200
+    # UPDATE ... RETURNING (yig'ma kaliti bilan) va kunlik yig'ma upsert
+    assert len(statements.queries) == 2
+    assert statements.queries[0].startswith("UPDATE examination") and "RETURNING" in statements.queries[0]
+    assert statements.queries[1].startswith("INSERT INTO examination_daily_stat")
+    assert statements.commits == 1
+
+
+async def test_create_user_does_not_reread(
+    client: AsyncClient, current_user: User, statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.post(
+        "/users/",
+        json={
+            "first_name": "Malika",
+            "last_name": "Yusupova",
+            "middle_name": "Anvarovna",
+            "username": "malika",
+            "phone": "+998907654321",
+            "password": "Str1ngst!",
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json()["username"] == "malika"
+    # Telefon va username tekshiruvlari, keyin bitta INSERT
+    assert len(statements.queries) == 3
+    assert_no_reread(statements, "INSERT INTO user")
+
+
+async def test_update_user_does_not_reread(
+    client: AsyncClient, current_user: User, statements: StatementLog
+) -> None:
+    statements.clear()
+    response = await client.patch(f"/users/{current_user.id}", json={"first_name": "Aziza"})
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Aziza"
+    # Foydalanuvchini yuklash va UPDATE
+    assert len(statements.queries) == 2
+    assert_no_reread(statements, "UPDATE user")